@@ -0,0 +1,25 @@
+from django.contrib import admin
+from jobs.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the Job model.
+
+    Displays the following fields in the admin list view:
+    - id
+    - kind
+    - status
+    - attempts
+    - user
+    - created_time
+    - finished_time
+
+    """
+    list_display = ('id', 'kind', 'status', 'attempts', 'user', 'created_time', 'finished_time')
+    list_filter = ('status', 'kind')
+    list_select_related = ('user',)
+
+
+# Register the Job model with the custom admin configuration
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,44 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.queue import Worker, get_tasks
+
+
+class Command(BaseCommand):
+    """
+    Run the jobs queued by the API: cascade deletes, exports and counter rebuilds.
+
+    Several workers may run against the same database: the jobs are leased, so
+    that each runs once, and run again when the worker running them stopped.
+    SIGINT and SIGTERM stop claiming jobs and let the running ones finish.
+    """
+    help = 'Run the queued background jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help="The number of jobs run at once, settings.JOB_QUEUE['CONCURRENCY'] by default.")
+        parser.add_argument('--lease', type=int, default=None,
+                            help='The seconds a job is leased for, renewed while it runs.')
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help='The seconds between two claims while idle.')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once no job is due.')
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help='Exit after running this many jobs.')
+
+    def handle(self, *args, **options):
+        for name in ('concurrency', 'lease', 'max_jobs'):
+            if options[name] is not None and options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive.")
+        worker = Worker(options['concurrency'], options['lease'], options['poll_interval'])
+        handlers = {signum: signal.signal(signum, lambda signum, frame: worker.stop())
+                    for signum in (signal.SIGINT, signal.SIGTERM)}
+
+        self.stdout.write(f"Running {', '.join(sorted(get_tasks()))} jobs, {worker.concurrency} at once.")
+        try:
+            count = worker.run(burst=options['burst'], max_jobs=options['max_jobs'])
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f'Ran {count} jobs.'))
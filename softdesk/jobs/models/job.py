@@ -0,0 +1,80 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Job(models.Model):
+    """
+    A model representing work queued for the workers of `manage.py run_jobs`, see jobs.queue.
+
+    Attributes:
+        id (UUIDField): The id of the job, in its status URL.
+        kind (CharField): The name of the task running the job, see jobs.queue.register.
+        payload (JSONField): The arguments of the task.
+        key (CharField): Identifies the work the job does: no other job with the same
+            key is queued while one is pending or running.
+        status (CharField): The status of the job, chosen from predefined choices.
+        user (ForeignKey): The user who queued the job, who may read its status.
+        attempts (PositiveIntegerField): The number of times a worker started the job.
+        max_attempts (PositiveIntegerField): The number of attempts after which a failing job is given up.
+        run_after (DateTimeField): The job is not started before, later for retries.
+        leased_by (CharField): The token of the claim of the worker running the job.
+        lease_expires (DateTimeField): Past it, the worker running the job is considered
+            stopped and the job is run again.
+        result (JSONField): What the task returned.
+        error (TextField): The error of the last failed attempt.
+        created_time (DateTimeField): The timestamp when the job was queued.
+        started_time (DateTimeField): The timestamp when the last attempt started.
+        finished_time (DateTimeField): The timestamp when the job succeeded or was given up.
+
+    Methods:
+        is_finished(self): Checks if the job succeeded or was given up.
+    """
+
+    class JobStatus(models.TextChoices):
+        PENDING = "PENDING", _('Pending')
+        RUNNING = "RUNNING", _('Running')
+        SUCCEEDED = "SUCCEEDED", _('Succeeded')
+        FAILED = "FAILED", _('Failed')
+
+    ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=100, verbose_name=_("Kind"))
+    payload = models.JSONField(default=dict, blank=True, verbose_name=_("Payload"))
+    key = models.CharField(max_length=200, null=True, blank=True, verbose_name=_("Key"))
+    status = models.CharField(max_length=10, choices=JobStatus.choices, default=JobStatus.PENDING,
+                              verbose_name=_("Status"))
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name='jobs', verbose_name=_("User"))
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("Attempts"))
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name=_("Max Attempts"))
+    run_after = models.DateTimeField(default=timezone.now, verbose_name=_("Run After"))
+    leased_by = models.CharField(max_length=32, null=True, blank=True, verbose_name=_("Leased By"))
+    lease_expires = models.DateTimeField(null=True, blank=True, verbose_name=_("Lease Expires"))
+    result = models.JSONField(null=True, blank=True, verbose_name=_("Result"))
+    error = models.TextField(blank=True, default='', verbose_name=_("Error"))
+    created_time = models.DateTimeField(auto_now_add=True, verbose_name=_("Created Time"))
+    started_time = models.DateTimeField(null=True, blank=True, verbose_name=_("Started Time"))
+    finished_time = models.DateTimeField(null=True, blank=True, verbose_name=_("Finished Time"))
+
+    class Meta:
+        indexes = [
+            # The due jobs, claimed by the workers.
+            models.Index(fields=['status', 'run_after'], name='jobs_job_due_idx'),
+            models.Index(fields=['leased_by'], name='jobs_job_lease_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['key'], condition=Q(status__in=['PENDING', 'RUNNING']),
+                                    name='jobs_job_active_key'),
+        ]
+
+    def is_finished(self):
+        return self.status in (self.JobStatus.SUCCEEDED, self.JobStatus.FAILED)
+
+    def __str__(self):
+        return f'{self.kind} {self.id} ({self.status})'
@@ -0,0 +1,4 @@
+from .registry import register, get_task, get_tasks
+from .leases import enqueue, schedule_periodic, claim, renew, complete, fail
+from .results import get_results_dir, get_result_path, write_result, purge_finished
+from .worker import Worker
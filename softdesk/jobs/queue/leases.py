@@ -0,0 +1,160 @@
+import uuid
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from jobs.models import Job
+from .options import get_options
+from .registry import get_task, get_tasks
+
+
+PENDING = Job.JobStatus.PENDING
+RUNNING = Job.JobStatus.RUNNING
+SUCCEEDED = Job.JobStatus.SUCCEEDED
+FAILED = Job.JobStatus.FAILED
+
+
+def enqueue(kind, payload=None, user=None, key=None, delay=0):
+    """
+    Queue a job of the given kind.
+
+    When a job with the same key is pending or running, it is returned instead
+    of queuing another one: the unique constraint on the key of the active jobs
+    makes two requests deleting the same project queue a single deletion.
+
+    Args:
+    - kind (str): The name of a registered task.
+    - payload (dict): The JSON-serializable arguments of the task.
+    - user (User): The user queuing the job, who may read its status.
+    - key (str): Identifies the work of the job, None for no deduplication.
+    - delay (float): The seconds before the job may start.
+
+    Returns:
+    - tuple: The job, and whether it was queued by this call.
+    """
+    task = get_task(kind)
+    while True:
+        try:
+            with transaction.atomic():
+                job = Job.objects.create(
+                    kind=kind, payload=payload or {}, user=user, key=key,
+                    max_attempts=task.max_attempts or get_options()['MAX_ATTEMPTS'],
+                    run_after=timezone.now() + timedelta(seconds=delay))
+            return job, True
+        except IntegrityError:
+            job = Job.objects.filter(key=key, status__in=Job.ACTIVE_STATUSES).first()
+            # Unless the active job finished in between.
+            if job is not None:
+                return job, False
+
+
+def schedule_periodic():
+    """
+    Queue the next run of each periodic task, `every` seconds from now, unless
+    one is pending or running.
+
+    The jobs are keyed by the name of their task, so that however many workers
+    schedule them, each periodic task has a single job waiting.
+
+    Returns:
+    - int: The number of jobs queued.
+    """
+    queued = 0
+    for task in get_tasks().values():
+        interval = task.interval()
+        if interval:
+            queued += enqueue(task.name, key=task.name, delay=interval)[1]
+    return queued
+
+
+def claim(limit, lease_seconds=None):
+    """
+    Lease up to `limit` due jobs to the calling worker, oldest first.
+
+    A job is due when it is pending past its run_after, or running with an
+    expired lease: its worker stopped. The jobs are marked running by one
+    conditional UPDATE setting `leased_by` to a token unique to the claim, so
+    that workers claiming at once never run the same job. Jobs whose lease
+    expired on their last attempt are given up first.
+
+    The concurrency of each task is checked against the jobs running when
+    claiming: workers claiming at the same moment may exceed it briefly.
+
+    Returns:
+    - list: The claimed jobs.
+    """
+    lease_seconds = lease_seconds or get_options()['LEASE_SECONDS']
+    now = timezone.now()
+    expired = Q(status=RUNNING, lease_expires__lt=now)
+    Job.objects.filter(expired, attempts__gte=F('max_attempts')).update(
+        status=FAILED, finished_time=now, leased_by=None, lease_expires=None,
+        error='The worker running the job stopped on its last attempt.')
+    if limit < 1:
+        return []
+
+    running = dict(Job.objects.filter(status=RUNNING, lease_expires__gte=now).order_by().values_list(
+        'kind').annotate(count=Count('pk')))
+    capacity = {}
+    for kind, task in get_tasks().items():
+        free = limit if task.concurrency is None else task.concurrency - running.get(kind, 0)
+        if free > 0:
+            capacity[kind] = min(free, limit)
+
+    # Jobs of kinds no task is registered for stay pending.
+    due = Q(status=PENDING, run_after__lte=now) | expired
+    candidates = []
+    for kind, free in capacity.items():
+        candidates += Job.objects.filter(due, kind=kind).order_by('run_after').values_list(
+            'run_after', 'pk')[:free]
+    selected = [pk for _, pk in sorted(candidates)[:limit]]
+    if not selected:
+        return []
+
+    token = uuid.uuid4().hex
+    Job.objects.filter(due, pk__in=selected).update(
+        status=RUNNING, leased_by=token, lease_expires=now + timedelta(seconds=lease_seconds),
+        attempts=F('attempts') + 1, started_time=now)
+    return list(Job.objects.filter(leased_by=token).order_by('run_after'))
+
+
+def renew(tokens, lease_seconds=None):
+    """
+    Extend the leases of the running jobs claimed with the given tokens.
+    """
+    lease_seconds = lease_seconds or get_options()['LEASE_SECONDS']
+    return Job.objects.filter(status=RUNNING, leased_by__in=list(tokens)).update(
+        lease_expires=timezone.now() + timedelta(seconds=lease_seconds))
+
+
+def complete(job, result):
+    """
+    Mark a claimed job as succeeded with the result of its task.
+
+    Returns:
+    - bool: False when the job lost its lease, to another worker or to a retry.
+    """
+    return Job.objects.filter(pk=job.pk, status=RUNNING, leased_by=job.leased_by).update(
+        status=SUCCEEDED, result=result, error='', finished_time=timezone.now(),
+        leased_by=None, lease_expires=None) == 1
+
+
+def fail(job, error):
+    """
+    Record the failure of an attempt of a claimed job.
+
+    The job is retried after settings.JOB_QUEUE['RETRY_DELAY'] seconds, doubled
+    at each attempt, and given up after its last attempt.
+
+    Returns:
+    - bool: False when the job lost its lease, to another worker or to a retry.
+    """
+    now = timezone.now()
+    if job.attempts < job.max_attempts:
+        delay = get_options()['RETRY_DELAY'] * 2 ** (job.attempts - 1)
+        updates = {'status': PENDING, 'run_after': now + timedelta(seconds=delay)}
+    else:
+        updates = {'status': FAILED, 'finished_time': now}
+    return Job.objects.filter(pk=job.pk, status=RUNNING, leased_by=job.leased_by).update(
+        error=error, leased_by=None, lease_expires=None, **updates) == 1
@@ -0,0 +1,19 @@
+from django.conf import settings
+
+
+DEFAULTS = {
+    'CONCURRENCY': 2,
+    'LEASE_SECONDS': 300,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY': 30,
+    'RESULTS_DIR': None,
+    'RETENTION_DAYS': 7,
+}
+
+
+def get_options():
+    """
+    Return settings.JOB_QUEUE, completed with the defaults.
+    """
+    return {**DEFAULTS, **getattr(settings, 'JOB_QUEUE', {})}
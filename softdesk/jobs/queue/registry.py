@@ -0,0 +1,60 @@
+class Task:
+    """
+    The function a worker calls to run the jobs of a kind.
+
+    Attributes:
+    - name (str): The kind of the jobs, e.g. 'projects.delete_project'.
+    - function (callable): Called with the job, returns its JSON-serializable result.
+    - concurrency (int): The most jobs of the kind running at once, None for no limit.
+    - max_attempts (int): The attempts of a failing job, None for settings.JOB_QUEUE['MAX_ATTEMPTS'].
+    - every (float or callable): The seconds between two runs queued by the workers, or a
+      function returning them, e.g. from the settings; None for tasks queued on demand only.
+
+    Methods:
+    - interval(): Return the seconds between two runs of a periodic task, or None.
+    """
+
+    def __init__(self, name, function, concurrency=None, max_attempts=None, every=None):
+        self.name = name
+        self.function = function
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.every = every
+
+    def interval(self):
+        return self.every() if callable(self.every) else self.every
+
+
+_tasks = {}
+
+
+def register(name, concurrency=None, max_attempts=None, every=None):
+    """
+    Register the decorated function as the task running the jobs of kind `name`.
+
+    Tasks are registered when their module is imported, from the ready()
+    method of their app, so that both the views queuing jobs and the
+    workers running them know every task. Periodic tasks, given `every`,
+    are queued by the workers, see schedule_periodic.
+    """
+    def decorator(function):
+        _tasks[name] = Task(name, function, concurrency, max_attempts, every)
+        return function
+    return decorator
+
+
+def get_task(name):
+    """
+    Return the task of the given kind, raising LookupError when none is registered.
+    """
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise LookupError(f'No task is registered for the jobs of kind {name!r}.') from None
+
+
+def get_tasks():
+    """
+    Return the registered tasks, by kind.
+    """
+    return dict(_tasks)
@@ -0,0 +1,68 @@
+import os
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+
+from jobs.models import Job
+from .options import get_options
+
+
+def get_results_dir():
+    """
+    Return the directory of the files written by the jobs, settings.JOB_QUEUE['RESULTS_DIR'].
+    """
+    directory = get_options()['RESULTS_DIR']
+    if not directory:
+        raise ImproperlyConfigured("settings.JOB_QUEUE['RESULTS_DIR'] is not set.")
+    return Path(directory)
+
+
+def get_result_path(job):
+    """
+    Return the path of the file written by a job, None when it wrote none.
+    """
+    name = (job.result or {}).get('file') if isinstance(job.result, dict) else None
+    if not name:
+        return None
+    return get_results_dir() / os.path.basename(name)
+
+
+def write_result(job, extension, chunks):
+    """
+    Write the chunks of text to the result file of a job.
+
+    The file is written under a temporary name and renamed once complete, so
+    that a failed attempt leaves no partial file to download.
+
+    Returns:
+    - str: The name of the file, to return in the result of the job.
+    """
+    directory = get_results_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f'{job.pk}.{extension}'
+    partial = directory / f'{name}.partial'
+    with open(partial, 'w', encoding='utf-8', newline='') as file:
+        file.writelines(chunks)
+    os.replace(partial, directory / name)
+    return name
+
+
+def purge_finished(before, batch_size=1000):
+    """
+    Delete the jobs finished before the given time, and their result files.
+
+    Returns:
+    - int: The number of deleted jobs.
+    """
+    finished = Job.objects.filter(
+        status__in=[Job.JobStatus.SUCCEEDED, Job.JobStatus.FAILED], finished_time__lt=before)
+    deleted = 0
+    while True:
+        jobs = list(finished.order_by('finished_time').only('pk', 'result')[:batch_size])
+        if not jobs:
+            return deleted
+        for job in jobs:
+            path = get_result_path(job)
+            if path is not None and path.exists():
+                path.unlink()
+        deleted += Job.objects.filter(pk__in=[job.pk for job in jobs]).delete()[0]
@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.db import DatabaseError, close_old_connections, connections
+from django.utils import timezone
+
+from .leases import claim, complete, fail, renew, schedule_periodic
+from .options import get_options
+from .registry import get_task
+from .results import purge_finished
+
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Run the queued jobs in a pool of `concurrency` threads, see `manage.py run_jobs`.
+
+    Jobs are claimed as threads free up. The leases of the running jobs are
+    renewed every third of the lease, so that only the jobs of a worker that
+    stopped are run again by another. A task raising an exception is retried,
+    see jobs.queue.fail. Jobs finished more than RETENTION_DAYS ago are purged
+    hourly with their result files, and the next runs of the periodic tasks are
+    queued every minute, except in burst mode.
+
+    Attributes:
+    - concurrency (int): The number of jobs run at once.
+    - lease_seconds (int): The duration of the leases.
+    - poll_interval (float): The seconds between two claims while idle.
+
+    Methods:
+    - run(burst, max_jobs): Run jobs until stopped, returning the number of jobs run.
+    - stop(): Stop claiming jobs: the running ones are finished before run() returns.
+    - execute(job): Run one claimed job and record its result.
+    """
+    purge_interval = 3600
+    schedule_interval = 60
+
+    def __init__(self, concurrency=None, lease_seconds=None, poll_interval=None):
+        options = get_options()
+        self.concurrency = concurrency or options['CONCURRENCY']
+        self.lease_seconds = lease_seconds or options['LEASE_SECONDS']
+        self.poll_interval = options['POLL_INTERVAL'] if poll_interval is None else poll_interval
+        self.retention = timedelta(days=options['RETENTION_DAYS'])
+        self.stopped = threading.Event()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self, burst=False, max_jobs=None):
+        """
+        Run jobs until stopped.
+
+        Args:
+        - burst (bool): Return once no job is due and none is running.
+        - max_jobs (int): Return after running this many jobs.
+
+        Returns:
+        - int: The number of jobs run.
+        """
+        started = 0
+        running = {}
+        renewed = time.monotonic()
+        purged = scheduled = None
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix='job') as executor:
+            while True:
+                free = self.concurrency - len(running)
+                if max_jobs is not None:
+                    free = min(free, max_jobs - started)
+                jobs = []
+                if not self.stopped.is_set():
+                    try:
+                        if purged is None or time.monotonic() - purged >= self.purge_interval:
+                            purged = time.monotonic()
+                            purge_finished(timezone.now() - self.retention)
+                        if not burst and (scheduled is None or time.monotonic() - scheduled >= self.schedule_interval):
+                            scheduled = time.monotonic()
+                            schedule_periodic()
+                        jobs = claim(free, self.lease_seconds)
+                    except DatabaseError:
+                        # e.g. the database stayed locked: claim again at the next poll.
+                        logger.exception('Claiming jobs failed.')
+                        close_old_connections()
+                for job in jobs:
+                    running[executor.submit(self.execute, job)] = job
+                started += len(jobs)
+
+                if not running:
+                    if self.stopped.is_set() or burst or (max_jobs is not None and started >= max_jobs):
+                        return started
+                    self.stopped.wait(self.poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                if running and time.monotonic() - renewed >= self.lease_seconds / 3:
+                    renewed = time.monotonic()
+                    try:
+                        renew([job.leased_by for job in running.values()], self.lease_seconds)
+                    except DatabaseError:
+                        logger.exception('Renewing the leases failed.')
+
+    def execute(self, job):
+        """
+        Run the task of a claimed job, then record its result or its failure.
+
+        Runs in a thread of the pool, whose database connection is closed afterwards.
+        """
+        try:
+            logger.info('Running job %s, attempt %s of %s.', job, job.attempts, job.max_attempts)
+            start = time.perf_counter()
+            try:
+                result = get_task(job.kind).function(job)
+            except Exception as error:
+                logger.exception('Job %s failed.', job)
+                recorded = fail(job, f'{type(error).__name__}: {error}')
+            else:
+                logger.info('Job %s succeeded in %.3fs.', job, time.perf_counter() - start)
+                recorded = complete(job, result)
+            if not recorded:
+                logger.warning('Job %s lost its lease before finishing: its outcome is not recorded.', job)
+        except Exception:
+            logger.exception('Recording the outcome of job %s failed.', job)
+        finally:
+            connections.close_all()
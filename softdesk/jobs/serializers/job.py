@@ -0,0 +1,36 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from jobs.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the Job model, rendering the status of a queued job.
+
+    Fields:
+    - id: The unique identifier for the job.
+    - kind: The task running the job.
+    - status: PENDING, RUNNING, SUCCEEDED or FAILED.
+    - attempts: The number of times a worker started the job.
+    - max_attempts: The number of attempts after which a failing job is given up.
+    - result: What the task returned, once succeeded.
+    - error: The error of the last failed attempt.
+    - created_time, started_time, finished_time: When the job was queued, last started and finished.
+    - url: The status URL of the job.
+    - result_url: The URL downloading the file the job wrote, once succeeded.
+
+    """
+    url = serializers.HyperlinkedIdentityField(view_name='jobs:job-detail')
+    result_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'status', 'attempts', 'max_attempts', 'result', 'error',
+                  'created_time', 'started_time', 'finished_time', 'url', 'result_url']
+        read_only_fields = fields
+
+    def get_result_url(self, job):
+        if job.status != Job.JobStatus.SUCCEEDED or not isinstance(job.result, dict) or 'file' not in job.result:
+            return None
+        return self.context['request'].build_absolute_uri(reverse('jobs:job-result', kwargs={'pk': job.pk}))
@@ -0,0 +1,270 @@
+import logging
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jobs.models import Job
+from jobs.queue import Worker, claim, complete, enqueue, fail, purge_finished, register, renew, write_result
+from jobs.queue.registry import _tasks
+from projects.counters import recount
+from projects.models import Project, Contributor, Issue, Comment
+from users.models import User
+
+
+class JobFixtureMixin:
+    """
+    A project of an author, with issues and comments, and a results directory.
+    """
+
+    def setUp(self):
+        for alias in settings.CACHES:
+            caches[alias].clear()
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(
+            JOB_QUEUE={**settings.JOB_QUEUE, 'RESULTS_DIR': directory, 'RETRY_DELAY': 10},
+            PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']))
+        self.author = self.create_user('author')
+        self.project = Project.objects.create(
+            type=Project.ProjectType.BACK_END, title='Project', description='Description')
+        Contributor.objects.create(user=self.author, project=self.project, role=Contributor.ContributorRole.AUTHOR)
+        for index in range(5):
+            issue = Issue.objects.create(
+                tag=Issue.IssueTag.BUG, priority=Issue.IssuePriority.LOW, title=f'Issue {index}',
+                description='Description', project=self.project, author=self.author, assigned=self.author)
+            Comment.objects.create(description='Comment', issue=issue, author=self.author)
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        # The jobs run, and the failures of the failing ones, are logged.
+        logger = logging.getLogger('jobs')
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.CRITICAL)
+
+    def create_user(self, username):
+        return User.objects.create_user(
+            username=username, password='password', email=f'{username}@softdesk.io',
+            date_of_birth=date(1990, 1, 1))
+
+    def run_due_jobs(self):
+        """
+        Run the due jobs one at a time in this thread, as a worker would.
+        """
+        worker = Worker(concurrency=1)
+        while jobs := claim(1):
+            worker.execute(jobs[0])
+
+
+class QueueTests(JobFixtureMixin, TestCase):
+    """
+    Jobs are deduplicated by key, leased to one worker at a time, retried and given up.
+    """
+
+    def setUp(self):
+        super().setUp()
+        register('tests.fail', concurrency=1, max_attempts=2)(self.failing_task)
+        self.addCleanup(_tasks.pop, 'tests.fail')
+
+    def failing_task(self, job):
+        raise ValueError('failed')
+
+    def test_enqueue_deduplicates_active_jobs(self):
+        job, created = enqueue('projects.recount', key='recount')
+        self.assertTrue(created)
+        self.assertEqual(enqueue('projects.recount', key='recount'), (job, False))
+
+        [claimed] = claim(5)
+        complete(claimed, {})
+        _, created = enqueue('projects.recount', key='recount')
+        self.assertTrue(created)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(LookupError):
+            enqueue('tests.unknown')
+        Job.objects.create(kind='tests.unknown')
+        self.assertEqual(claim(5), [])
+
+    def test_claim_leases_jobs_once(self):
+        first, _ = enqueue('projects.recount', {'project_id': 1})
+        second, _ = enqueue('projects.export_project', {'project_id': 1})
+        enqueue('projects.export_project', {'project_id': 1}, delay=60)
+
+        claimed = claim(5)
+        self.assertEqual({job.pk for job in claimed}, {first.pk, second.pk})
+        self.assertEqual(len({job.leased_by for job in claimed}), 1)
+        self.assertTrue(all(job.status == Job.JobStatus.RUNNING and job.attempts == 1 for job in claimed))
+        self.assertEqual(claim(5), [])
+        self.assertEqual(renew([claimed[0].leased_by]), 2)
+
+    def test_concurrency(self):
+        for project_id in range(3):
+            enqueue('projects.delete_project', {'project_id': project_id})
+        enqueue('projects.export_project', {'project_id': 1})
+
+        claimed = claim(5)
+        self.assertEqual(sorted(job.kind for job in claimed), ['projects.delete_project', 'projects.export_project'])
+        self.assertEqual(claim(5), [])
+        complete(next(job for job in claimed if job.kind == 'projects.delete_project'), {})
+        self.assertEqual([job.kind for job in claim(5)], ['projects.delete_project'])
+
+    def test_retry_then_give_up(self):
+        job, _ = enqueue('tests.fail')
+        self.run_due_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.error), (Job.JobStatus.PENDING, 1, 'ValueError: failed'))
+        self.assertAlmostEqual((job.run_after - timezone.now()).total_seconds(), 10, delta=2)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        self.run_due_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.JobStatus.FAILED, 2))
+        self.assertIsNotNone(job.finished_time)
+
+    def test_expired_lease(self):
+        job, _ = enqueue('tests.fail')
+        [first] = claim(1)
+        Job.objects.filter(pk=job.pk).update(lease_expires=timezone.now() - timedelta(seconds=1))
+
+        [second] = claim(1)
+        self.assertEqual(second.attempts, 2)
+        self.assertNotEqual(second.leased_by, first.leased_by)
+        # The first worker lost the lease: its outcome is not recorded.
+        self.assertFalse(complete(first, {}))
+        self.assertFalse(fail(first, 'error'))
+
+        Job.objects.filter(pk=job.pk).update(lease_expires=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(claim(1), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.JobStatus.FAILED)
+
+    def test_purge_finished(self):
+        job, _ = enqueue('projects.export_project', {'project_id': self.project.pk})
+        name = write_result(job, 'csv', ['line\n'])
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.JobStatus.SUCCEEDED, result={'file': name}, finished_time=timezone.now() - timedelta(days=8))
+        pending, _ = enqueue('projects.recount')
+        path = os.path.join(settings.JOB_QUEUE['RESULTS_DIR'], name)
+        self.assertTrue(os.path.exists(path))
+
+        self.assertEqual(purge_finished(timezone.now() - timedelta(days=7)), 1)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(list(Job.objects.values_list('pk', flat=True)), [pending.pk])
+
+
+class JobEndpointTests(JobFixtureMixin, TestCase):
+    """
+    Deletions, exports and recounts are answered with 202 Accepted and run by the workers.
+    """
+
+    def test_delete_project(self):
+        response = self.client.delete(reverse('projects:project-detail', kwargs={'pk': self.project.pk}))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['data']['status'], 'PENDING')
+        self.assertEqual(response['Location'], response.data['data']['url'])
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+        again = self.client.delete(reverse('projects:project-detail', kwargs={'pk': self.project.pk}))
+        self.assertEqual(again.data['data']['id'], response.data['data']['id'])
+
+        self.run_due_jobs()
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertFalse(Issue.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        job = self.client.get(response['Location']).data['data']
+        self.assertEqual(job['status'], 'SUCCEEDED')
+        self.assertEqual(job['result'], {'projects.Project': 1, 'projects.Contributor': 1,
+                                         'projects.Issue': 5, 'projects.Comment': 5})
+
+    def test_delete_project_in_batches(self):
+        other = Project.objects.create(type=Project.ProjectType.IOS, title='Other', description='Description')
+        Contributor.objects.create(user=self.author, project=other, role=Contributor.ContributorRole.AUTHOR)
+        Issue.objects.create(tag=Issue.IssueTag.BUG, priority=Issue.IssuePriority.LOW, title='Kept',
+                             description='Description', project=other, author=self.author, assigned=self.author)
+        enqueue('projects.delete_project', {'project_id': self.project.pk, 'batch_size': 2})
+        self.run_due_jobs()
+        self.assertEqual(list(Issue.objects.values_list('title', flat=True)), ['Kept'])
+        self.assertEqual(recount(), {'projects.Project': 0, 'projects.Issue': 0})
+
+    def test_only_the_author_deletes(self):
+        contributor = self.create_user('contributor')
+        Contributor.objects.create(user=contributor, project=self.project)
+        self.client.force_authenticate(contributor)
+        response = self.client.delete(reverse('projects:project-detail', kwargs={'pk': self.project.pk}))
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Job.objects.exists())
+
+    def test_job_of_another_user(self):
+        response = self.client.post(reverse('projects:project-recount', kwargs={'pk': self.project.pk}))
+        self.client.force_authenticate(self.create_user('outsider'))
+        self.assertEqual(self.client.get(response['Location']).status_code, 404)
+
+    def test_queued_export(self):
+        url = reverse('projects:project-export', kwargs={'pk': self.project.pk})
+        response = self.client.post(f'{url}?output=csv')
+        self.assertEqual(response.status_code, 202)
+        self.assertIsNone(response.data['data']['result_url'])
+        self.assertEqual(self.client.get(reverse(
+            'jobs:job-result', kwargs={'pk': response.data['data']['id']})).status_code, 409)
+
+        self.run_due_jobs()
+        job = self.client.get(response['Location']).data['data']
+        download = self.client.get(job['result_url'])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download['Content-Disposition'], f'attachment; filename="project-{self.project.pk}.csv"')
+        streamed = self.client.get(f'{url}?output=csv')
+        self.assertEqual(b''.join(download.streaming_content), b''.join(streamed.streaming_content))
+
+    def test_recount(self):
+        Project.objects.filter(pk=self.project.pk).update(issue_count=0)
+        Issue.objects.update(comment_count=0)
+        response = self.client.post(reverse('projects:project-recount', kwargs={'pk': self.project.pk}))
+        self.assertEqual(response.status_code, 202)
+        self.run_due_jobs()
+        self.assertEqual(self.client.get(response['Location']).data['data']['result'],
+                         {'projects.Project': 1, 'projects.Issue': 5})
+
+    def test_delete_user(self):
+        response = self.client.delete(reverse('users:delete-user-profile'))
+        self.assertEqual(response.status_code, 202)
+        self.assertNotIn('Location', response)
+        self.author.refresh_from_db()
+        self.assertFalse(self.author.is_active)
+
+        self.run_due_jobs()
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.user), (Job.JobStatus.SUCCEEDED, None))
+        self.assertEqual(recount(), {'projects.Project': 0, 'projects.Issue': 0})
+
+    def test_reactivated_user_is_kept(self):
+        self.client.delete(reverse('users:delete-user-profile'))
+        User.objects.filter(pk=self.author.pk).update(is_active=True)
+        self.run_due_jobs()
+        self.assertTrue(User.objects.filter(pk=self.author.pk).exists())
+
+
+class WorkerTests(JobFixtureMixin, TransactionTestCase):
+    """
+    The worker runs the jobs in its threads, each with a connection of its own.
+    """
+
+    def test_run_jobs_command(self):
+        enqueue('projects.delete_project', {'project_id': self.project.pk})
+        enqueue('projects.export_project', {'project_id': self.project.pk})
+        output = StringIO()
+        call_command('run_jobs', '--burst', '--concurrency=1', '--poll-interval=0.01', stdout=output)
+        self.assertIn('Ran 2 jobs.', output.getvalue())
+        self.assertEqual(set(Job.objects.values_list('status', flat=True)), {Job.JobStatus.SUCCEEDED})
+        self.assertFalse(Project.objects.exists())
+
+    def test_max_jobs(self):
+        for _ in range(3):
+            enqueue('projects.recount')
+        self.assertEqual(Worker(concurrency=1, poll_interval=0.01).run(max_jobs=2), 2)
+        self.assertEqual(Job.objects.filter(kind='projects.recount', status=Job.JobStatus.PENDING).count(), 1)
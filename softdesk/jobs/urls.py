@@ -0,0 +1,7 @@
+from django.urls import path
+from jobs.views import JobViewSet
+
+urlpatterns = [
+    path('jobs/<uuid:pk>/', JobViewSet.as_view({'get': 'retrieve'}), name='job-detail'),
+    path('jobs/<uuid:pk>/result/', JobViewSet.as_view({'get': 'result'}), name='job-result'),
+]
@@ -0,0 +1 @@
+from .job import JobViewSet, accepted_response
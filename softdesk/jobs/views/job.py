@@ -0,0 +1,89 @@
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from jobs.models import Job
+from jobs.queue import get_result_path
+from jobs.serializers import JobSerializer
+from sofdesk.views import TimedPermissionsMixin
+
+
+def accepted_response(request, job, message):
+    """
+    Answer a request whose work was handed to a job with 202 Accepted.
+
+    The body renders the job, and the Location header is its status URL.
+
+    Args:
+        request: The HTTP request.
+        job (Job): The queued job, or the active one doing the same work.
+        message (str): The message of the response.
+
+    Returns:
+        Response: The HTTP response.
+
+    """
+    data = JobSerializer(job, context={'request': request}).data
+    location = request.build_absolute_uri(reverse('jobs:job-detail', kwargs={'pk': job.pk}))
+    return Response({'message': message, 'data': data}, status=status.HTTP_202_ACCEPTED,
+                    headers={'Location': location})
+
+
+class JobViewSet(TimedPermissionsMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    API endpoint reading the status of the jobs queued by the user.
+
+    - GET /jobs/<id>/: The status of the job, then its result.
+    - GET /jobs/<id>/result/: The file written by the job, e.g. a project export.
+    """
+    serializer_class = JobSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_queryset(self):
+        """
+        Get the jobs queued by the user: the jobs of others are not found.
+        """
+        return Job.objects.filter(user=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve the status of a job.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response with the job.
+
+        """
+        job = self.get_object()
+        data = self.get_serializer(job).data
+        return Response({'message': f'Job {job.status.lower()}.', 'data': data})
+
+    @action(detail=True, methods=['get'])
+    def result(self, request, *args, **kwargs):
+        """
+        Download the file written by a succeeded job.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            FileResponse: The file, streamed from the results directory.
+
+        """
+        job = self.get_object()
+        if job.status != Job.JobStatus.SUCCEEDED:
+            return Response({'message': f'Job {job.status.lower()}: it has no result yet.',
+                             'data': self.get_serializer(job).data}, status=status.HTTP_409_CONFLICT)
+        path = get_result_path(job)
+        if path is None or not path.exists():
+            raise Http404('The job wrote no file, or it was purged.')
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=job.result.get('filename', path.name),
+                            content_type=job.result.get('content_type', 'application/octet-stream'))
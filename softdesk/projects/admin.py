@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Prefetch
 
 from .models.project import Project
 from .models.contributor import Contributor
@@ -12,11 +13,16 @@ class ProjectAdmin(admin.ModelAdmin):
 
     Attributes:
     - list_display: Fields to display in the project list view.
+    - get_queryset(request): Prefetch the contributors of the listed projects along with their users.
     - display_contributors(obj): Custom method to display contributors in the list view.
     """
 
     list_display = ['id', 'type', 'title', 'display_contributors']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related(
+            Prefetch('contributed_project', queryset=Contributor.objects.select_related('user')))
+
     def display_contributors(self, obj):
         """
         Display contributors in a user-friendly format in the list view.
@@ -48,9 +54,11 @@ class ContributorAdmin(admin.ModelAdmin):
 
     Attributes:
     - list_display: Fields to display in the contributor list view.
+    - list_select_related: Related objects joined to the listed rows.
     """
 
     list_display = ['id', 'user', 'role', 'project']
+    list_select_related = ['user', 'project']
 
 
 class IssueAdmin(admin.ModelAdmin):
@@ -59,10 +67,12 @@ class IssueAdmin(admin.ModelAdmin):
 
     Attributes:
     - list_display: Fields to display in the issue list view.
+    - list_select_related: Related objects joined to the listed rows.
     """
 
     list_display = ['id', 'project', 'tag', 'status', 'priority',
                     'title', 'description', 'author', 'assigned', 'created_time']
+    list_select_related = ['project', 'author', 'assigned']
 
 
 class CommentAdmin(admin.ModelAdmin):
@@ -71,10 +81,12 @@ class CommentAdmin(admin.ModelAdmin):
 
     Attributes:
     - list_display: Fields to display in the comment list view.
+    - list_select_related: Related objects joined to the listed rows.
     """
 
     list_display = ['unique_id', 'description',
                     'issue', 'author', 'created_time']
+    list_select_related = ['issue', 'author']
 
 
 admin.site.register(Project, ProjectAdmin)
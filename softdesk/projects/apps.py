@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        from .memberships import signals  # noqa: F401
+        from .responses import signals as response_signals  # noqa: F401
+        from .counters import signals as counter_signals  # noqa: F401
+        from .search import signals as search_signals  # noqa: F401
+        from . import tasks  # noqa: F401
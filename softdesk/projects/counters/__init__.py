@@ -0,0 +1 @@
+from .counts import adjust, recount
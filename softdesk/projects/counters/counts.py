@@ -0,0 +1,81 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.query import QuerySet
+
+from projects.models import Project, Contributor, Issue, Comment
+
+
+def adjust(model, pk, **deltas):
+    """
+    Add the given deltas to the counters of a row, with one atomic UPDATE.
+
+    Example: adjust(Project, 3, issue_count=1, open_issue_count=1)
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if updates and pk is not None:
+        model.objects.filter(pk=pk).update(**updates)
+
+
+def deleted_with(origin, *models):
+    """
+    Checks if a deletion started from instances, or a queryset, of one of the models.
+
+    Rows deleted in cascade from their parent need not update its counters.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in models
+
+
+def count(queryset, field):
+    """
+    Return the number of rows of the queryset referencing the outer row through `field`.
+    """
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts), 0)
+
+
+def get_counters():
+    """
+    Return the expressions computing each counter, by model.
+    """
+    return {
+        Project: {
+            'issue_count': count(Issue.objects.all(), 'project'),
+            'open_issue_count': count(Issue.objects.exclude(status=Issue.IssueStatus.FINISHED), 'project'),
+            'contributor_count': count(Contributor.objects.all(), 'project'),
+        },
+        Issue: {
+            'comment_count': count(Comment.objects.all(), 'issue'),
+        },
+    }
+
+
+def recount(batch_size=1000, project_id=None):
+    """
+    Recompute the counters that drifted from the rows they count.
+
+    The drifted rows are found with one query per model, then updated in
+    batches of `batch_size` rows with one UPDATE computing every counter.
+    Given `project_id`, only the counters of the project and of its issues
+    are checked.
+
+    Returns:
+        dict: The number of repaired rows, by model label.
+    """
+    scopes = {Project: Q(), Issue: Q()}
+    if project_id is not None:
+        scopes = {Project: Q(pk=project_id), Issue: Q(project_id=project_id)}
+    repaired = {}
+    for model, counters in get_counters().items():
+        drifted = Q()
+        for name in counters:
+            drifted |= ~Q(**{name: F(f'actual_{name}')})
+        pks = list(model.objects.annotate(
+            **{f'actual_{name}': expression for name, expression in counters.items()}
+        ).filter(scopes[model], drifted).values_list('pk', flat=True))
+
+        for start in range(0, len(pks), batch_size):
+            model.objects.filter(pk__in=pks[start:start + batch_size]).update(**get_counters()[model])
+        repaired[model._meta.label] = len(pks)
+    return repaired
@@ -0,0 +1,97 @@
+from django.db.models import F, Q
+from django.db.models.query import QuerySet
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from projects.models import Project, Contributor, Issue, Comment
+from users.models import User
+from .counts import adjust, count, deleted_with
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance, created, raw=False, **kwargs):
+    """
+    Count a new issue, or an issue moved to another project or opened/finished.
+
+    The previous state is the one the issue was loaded with: issues saved
+    without being loaded are only counted when created.
+    """
+    if raw:
+        return
+    state = instance.get_state()
+    previous = None if created else getattr(instance, 'loaded_state', None)
+    if created:
+        adjust(Project, instance.project_id, issue_count=1, open_issue_count=int(instance.is_open))
+    elif previous is not None and previous != state:
+        previous_project_id, was_open = previous
+        if previous_project_id != instance.project_id:
+            adjust(Project, previous_project_id, issue_count=-1, open_issue_count=-int(was_open))
+            adjust(Project, instance.project_id, issue_count=1, open_issue_count=int(instance.is_open))
+        else:
+            adjust(Project, instance.project_id, open_issue_count=int(instance.is_open) - int(was_open))
+    instance.loaded_state = state
+
+
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Project, User):
+        adjust(Project, instance.project_id, issue_count=-1, open_issue_count=-int(instance.is_open))
+
+
+@receiver(post_save, sender=Contributor)
+def count_saved_contributor(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust(Project, instance.project_id, contributor_count=1)
+
+
+@receiver(post_delete, sender=Contributor)
+def count_deleted_contributor(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Project, User):
+        adjust(Project, instance.project_id, contributor_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust(Issue, instance.issue_id, comment_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Project, Issue, User):
+        adjust(Issue, instance.issue_id, comment_count=-1)
+
+
+@receiver(pre_delete, sender=User)
+def count_deleted_user(sender, instance, origin=None, **kwargs):
+    """
+    Subtract the rows deleted along with a user from the counters of their
+    projects and issues.
+
+    Deleting a user cascades to its contributions, issues and comments, which
+    may be many rows: rather than adjusting the counters once per deleted row,
+    each counter is decreased by the number of rows referencing the user, with
+    one UPDATE per model, before the rows are deleted. The users of a deleted
+    queryset are counted at once, so that rows referencing several of them
+    are subtracted once.
+    """
+    if isinstance(origin, QuerySet):
+        if getattr(origin, 'counted', False):
+            return
+        origin.counted = True
+        users = origin.values('pk')
+    else:
+        users = [instance.pk]
+    issues = Issue.objects.filter(Q(author__in=users) | Q(assigned__in=users))
+    contributors = Contributor.objects.filter(user__in=users)
+    comments = Comment.objects.filter(author__in=users)
+    Project.objects.filter(
+        Q(pk__in=issues.values('project_id')) | Q(pk__in=contributors.values('project_id'))
+    ).update(
+        issue_count=F('issue_count') - count(issues, 'project'),
+        open_issue_count=F('open_issue_count') - count(
+            issues.exclude(status=Issue.IssueStatus.FINISHED), 'project'),
+        contributor_count=F('contributor_count') - count(contributors, 'project'),
+    )
+    Issue.objects.filter(pk__in=comments.values('issue_id')).update(
+        comment_count=F('comment_count') - count(comments, 'issue'))
@@ -0,0 +1 @@
+from .project import ProjectExport
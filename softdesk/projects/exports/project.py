@@ -0,0 +1,80 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from projects.models import Issue, Comment
+
+
+class Echo:
+    """
+    A file-like object returning what is written to it, used to stream csv rows.
+    """
+
+    def write(self, value):
+        return value
+
+
+class ProjectExport:
+    """
+    Stream every issue and comment of a project as CSV or NDJSON.
+
+    Rows are read with QuerySet.values().iterator(), the author and assignee
+    usernames being joined in the same query, so that only `chunk_size` rows
+    are held in memory at any time whatever the size of the project.
+
+    Attributes:
+    - formats (dict): The content type of each supported format.
+    - columns (list): The CSV columns, shared by issues and comments.
+
+    Methods:
+    - rows(): Yield one dict per issue, then one per comment.
+    - lines(export_format): Yield the encoded lines of the export.
+    """
+    formats = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+    columns = ['type', 'id', 'issue_id', 'tag', 'status', 'priority', 'title',
+               'description', 'author', 'assigned', 'created_time']
+
+    def __init__(self, project_id, chunk_size=2000):
+        self.project_id = project_id
+        self.chunk_size = chunk_size
+
+    def issues(self):
+        return Issue.objects.filter(project_id=self.project_id).order_by('id').values(
+            'id', 'tag', 'status', 'priority', 'title', 'description', 'created_time',
+            author_name=F('author__username'), assigned_name=F('assigned__username'),
+        ).iterator(chunk_size=self.chunk_size)
+
+    def comments(self):
+        return Comment.objects.filter(issue__project_id=self.project_id).order_by('issue_id', 'created_time').values(
+            'unique_id', 'issue_id', 'description', 'created_time', author_name=F('author__username'),
+        ).iterator(chunk_size=self.chunk_size)
+
+    def rows(self):
+        for issue in self.issues():
+            yield {
+                'type': 'issue', 'id': issue['id'], 'tag': issue['tag'], 'status': issue['status'],
+                'priority': issue['priority'], 'title': issue['title'], 'description': issue['description'],
+                'author': issue['author_name'], 'assigned': issue['assigned_name'],
+                'created_time': issue['created_time'],
+            }
+        for comment in self.comments():
+            yield {
+                'type': 'comment', 'id': comment['unique_id'], 'issue_id': comment['issue_id'],
+                'description': comment['description'], 'author': comment['author_name'],
+                'created_time': comment['created_time'],
+            }
+
+    def lines(self, export_format='ndjson'):
+        if export_format == 'csv':
+            writer = csv.DictWriter(Echo(), fieldnames=self.columns)
+            yield writer.writeheader()
+            for row in self.rows():
+                yield writer.writerow(row)
+        else:
+            for row in self.rows():
+                yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
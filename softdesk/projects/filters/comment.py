@@ -1,5 +1,6 @@
 import django_filters
 from projects.models import Comment
+from projects.search import comment_index
 
 
 class CommentFilter(django_filters.FilterSet):
@@ -12,7 +13,7 @@ class CommentFilter(django_filters.FilterSet):
 
     Attributes:
         unique_id (CharFilter): Filter for the unique_id field using 'icontains'.
-        description (CharFilter): Filter for the description field using 'icontains'.
+        description (CharFilter): Filter for the words of the description field using the full-text index.
         issue (CharFilter): Filter for the issue's title field using 'icontains'.
         author (CharFilter): Filter for the author's username field using 'icontains'.
 
@@ -22,7 +23,7 @@ class CommentFilter(django_filters.FilterSet):
     """
     unique_id = django_filters.CharFilter(lookup_expr='icontains', label='ID')
     description = django_filters.CharFilter(
-        lookup_expr='icontains', label='Description')
+        method='filter_full_text', label='Description')
     issue = django_filters.CharFilter(
         field_name='issue__title', lookup_expr='icontains', label='Issue Title')
     author = django_filters.CharFilter(
@@ -31,3 +32,6 @@ class CommentFilter(django_filters.FilterSet):
     class Meta:
         model = Comment
         fields = ['unique_id', 'description', 'issue', 'author']
+
+    def filter_full_text(self, queryset, name, value):
+        return comment_index.filter_column(queryset, name, value)
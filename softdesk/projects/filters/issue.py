@@ -1,5 +1,6 @@
 import django_filters
 from projects.models import Issue
+from projects.search import issue_index
 
 
 class IssueFilter(django_filters.FilterSet):
@@ -12,9 +13,10 @@ class IssueFilter(django_filters.FilterSet):
 
     Attributes:
         tag (CharFilter): Filter for the tag field using 'icontains'.
-        status (CharFilter): Filter for the status field using 'icontains'.
-        priority (CharFilter): Filter for the priority field using 'icontains'.
-        title (CharFilter): Filter for the title field using 'icontains'.
+        status (ChoiceFilter): Filter for one of the statuses, served by the
+            (project, status, priority) index.
+        priority (ChoiceFilter): Filter for one of the priorities, served by the same index.
+        title (CharFilter): Filter for the words of the title field using the full-text index.
         project (CharFilter): Filter for the project's title using 'icontains'.
         author (CharFilter): Filter for the author's username using 'icontains'.
         assigned (CharFilter): Filter for the assigned user's username using 'icontains'.
@@ -24,10 +26,9 @@ class IssueFilter(django_filters.FilterSet):
         fields (List): List of fields to create filters for.
     """
     tag = django_filters.CharFilter(lookup_expr='icontains', label='Tag')
-    status = django_filters.CharFilter(lookup_expr='icontains', label='Status')
-    priority = django_filters.CharFilter(
-        lookup_expr='icontains', label='Priority')
-    title = django_filters.CharFilter(lookup_expr='icontains', label='Title')
+    status = django_filters.ChoiceFilter(choices=Issue.IssueStatus.choices, label='Status')
+    priority = django_filters.ChoiceFilter(choices=Issue.IssuePriority.choices, label='Priority')
+    title = django_filters.CharFilter(method='filter_full_text', label='Title')
     project = django_filters.CharFilter(
         field_name='project__title', lookup_expr='icontains', label='Project')
     author = django_filters.CharFilter(
@@ -39,3 +40,6 @@ class IssueFilter(django_filters.FilterSet):
         model = Issue
         fields = ['tag', 'status', 'priority',
                   'title', 'project', 'author', 'assigned']
+
+    def filter_full_text(self, queryset, name, value):
+        return issue_index.filter_column(queryset, name, value)
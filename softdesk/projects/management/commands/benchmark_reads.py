@@ -0,0 +1,159 @@
+import asyncio
+import json
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.urls import reverse
+
+from sofdesk.benchmark import ASGIClient, WSGIClient, change, percentile
+from projects.counters import adjust
+from projects.models import Project, Contributor, Issue, Comment
+from users.models import User
+from users.tokens import FilteredRefreshToken
+
+
+class Command(BaseCommand):
+    """
+    Compare the throughput and memory of the read endpoints served by the
+    WSGI handler, one thread per concurrent request, and by the ASGI handler,
+    one event loop.
+
+    The results can be saved as JSON with --output and compared to a previous
+    run with --compare, failing when the WSGI throughput or median latency got
+    worse than the baseline by more than --tolerance percent: only the ASGI
+    deployment dispatches on an event loop, see sofdesk.views.AsyncDispatchMixin.
+    """
+    help = 'Benchmark the project, issue, contributor and comment read endpoints under WSGI and ASGI.'
+
+    username = 'benchmark-reads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='The number of requests per deployment.')
+        parser.add_argument('--concurrency', type=int, default=20, help='The number of concurrent requests.')
+        parser.add_argument('--issues', type=int, default=100, help='The number of issues of the project.')
+        parser.add_argument('--output', help='The file to save the results to, as JSON.')
+        parser.add_argument('--compare', help='The JSON results of a previous run to compare with.')
+        parser.add_argument('--tolerance', type=float, default=10,
+                            help='The percentage by which the WSGI numbers may be worse than those compared with.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+
+        user, project = self.create_fixture(options['issues'])
+        results = {}
+        try:
+            authorization = ('authorization', f'Bearer {FilteredRefreshToken.for_user(user).access_token}')
+            kwargs = {'project_pk': project.pk}
+            issue_id = Issue.objects.filter(project=project).values_list('pk', flat=True).first()
+            self.urls = [
+                reverse('projects:project-list'),
+                reverse('projects:project-detail', kwargs={'pk': project.pk}),
+                reverse('projects:project-issues', kwargs=kwargs),
+                reverse('projects:project-issue-detail', kwargs={**kwargs, 'pk': issue_id}),
+                reverse('projects:project-contributors', kwargs=kwargs),
+                reverse('projects:comments-list', kwargs=kwargs),
+            ]
+            self.headers = [authorization]
+
+            for name, run in (('WSGI', self.run_wsgi), ('ASGI', self.run_asgi)):
+                tracemalloc.start()
+                start = time.perf_counter()
+                statuses, latencies = run(options['requests'], options['concurrency'])
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results[name] = self.summarize(statuses, latencies, elapsed, peak)
+                self.report(name, results[name], baseline)
+        finally:
+            project.delete()
+            user.delete()
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved the results to {options['output']}."))
+        if baseline:
+            self.check_regression(results['WSGI'], baseline.get('WSGI'), options['tolerance'])
+
+    def create_fixture(self, issues):
+        user = User.objects.create_user(
+            username=self.username, password=None, email='benchmark@softdesk.io', date_of_birth=date(1990, 1, 1))
+        project = Project.objects.create(
+            type=Project.ProjectType.BACK_END, title='Benchmark', description='Benchmark project')
+        Contributor.objects.create(user=user, project=project, role=Contributor.ContributorRole.AUTHOR)
+        Issue.objects.bulk_create(
+            Issue(tag=Issue.IssueTag.TASK, priority=Issue.IssuePriority.LOW, title=f'Issue {index}',
+                  description='Benchmark issue', project=project, author=user, assigned=user)
+            for index in range(issues))
+        adjust(Project, project.pk, issue_count=issues, open_issue_count=issues)
+        Comment.objects.bulk_create(
+            Comment(description='Benchmark comment', issue=issue, author=user)
+            for issue in Issue.objects.filter(project=project))
+        Issue.objects.filter(project=project).update(comment_count=1)
+        return user, project
+
+    def run_wsgi(self, requests, concurrency):
+        client = WSGIClient(get_wsgi_application())
+
+        def send(index):
+            start = time.perf_counter()
+            status, body = client.request('GET', self.urls[index % len(self.urls)], headers=self.headers)
+            return status, time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(send, range(requests)))
+        return [status for status, _ in results], [latency for _, latency in results]
+
+    def run_asgi(self, requests, concurrency):
+        client = ASGIClient(get_asgi_application())
+
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def send(index):
+                async with semaphore:
+                    start = time.perf_counter()
+                    status, body = await client.request('GET', self.urls[index % len(self.urls)], headers=self.headers)
+                    return status, time.perf_counter() - start
+
+            return await asyncio.gather(*(send(index) for index in range(requests)))
+
+        results = asyncio.run(run())
+        return [status for status, _ in results], [latency for _, latency in results]
+
+    def summarize(self, statuses, latencies, elapsed, peak):
+        return {
+            'requests_per_second': round(len(statuses) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'peak_mib': round(peak / 2 ** 20, 1),
+            'failed': sum(1 for status in statuses if status != 200),
+        }
+
+    def report(self, name, result, baseline):
+        line = (f"{name}: {result['requests_per_second']:.1f} requests/s, p50 {result['p50_ms']:.1f}ms, "
+                f"p99 {result['p99_ms']:.1f}ms, peak memory {result['peak_mib']:.1f} MiB, {result['failed']} failed")
+        previous = (baseline or {}).get(name)
+        if previous:
+            line += (f" (requests/s {change(result['requests_per_second'], previous['requests_per_second']):+.0f}%, "
+                     f"p50 {change(result['p50_ms'], previous['p50_ms']):+.0f}%)")
+        self.stdout.write(line)
+
+    def check_regression(self, result, previous, tolerance):
+        """
+        Fail when the WSGI throughput or median latency got worse than the baseline by more than `tolerance` percent.
+        """
+        if not previous:
+            raise CommandError('The results compared with have no WSGI numbers.')
+        if (change(result['requests_per_second'], previous['requests_per_second']) < -tolerance
+                or change(result['p50_ms'], previous['p50_ms']) > tolerance):
+            raise CommandError(f'The WSGI numbers got worse than the baseline by more than {tolerance:g}%.')
+        self.stdout.write(self.style.SUCCESS('The WSGI numbers are within the tolerance of the baseline.'))
@@ -0,0 +1,214 @@
+import json
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from sofdesk.benchmark import summarize
+from projects.models import Project, Contributor, Issue, Comment
+from users.models import User
+from users.tokens import FilteredRefreshToken
+
+
+class Command(BaseCommand):
+    """
+    Send requests to every route of projects/urls.py and users/urls.py through
+    the test client, on the dataset of generate_dataset, and report the latency
+    percentiles, queries per request and response size of each route.
+
+    Read routes run first, on warm caches unless --cold is given. Each write
+    request runs in a transaction which is rolled back, after which the caches
+    are cleared, so that the dataset and the results of the next runs stay the
+    same. The results can be saved as JSON with --output and compared to a
+    previous run with --compare.
+    """
+    help = 'Benchmark every route of the API on the dataset of generate_dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='The number of requests per route.')
+        parser.add_argument('--username', default='bench-user-0', help='The user sending the requests.')
+        parser.add_argument('--password', default='benchmark-password', help='The password of the user.')
+        parser.add_argument('--routes', default='', help='Only benchmark the routes whose name contains this.')
+        parser.add_argument('--cold', action='store_true',
+                            help='Clear the caches before each read request, not only after the writes.')
+        parser.add_argument('--output', help='The file to save the results to, as JSON.')
+        parser.add_argument('--compare', help='The JSON results of a previous run to compare with.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('At least one request per route is required.')
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+
+        self.user = User.objects.filter(username=options['username']).first()
+        if self.user is None:
+            raise CommandError(f"No user '{options['username']}', run generate_dataset first.")
+        self.password = options['password']
+        self.load_fixture()
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {FilteredRefreshToken.for_user(self.user).access_token}')
+
+        results = {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'requests': options['requests'],
+            'cold': options['cold'],
+            'dataset': {model._meta.label: model.objects.count()
+                        for model in (User, Project, Contributor, Issue, Comment)},
+            'routes': {},
+        }
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name, write, prepare in self.get_routes():
+                if options['routes'] in name:
+                    results['routes'][name] = self.benchmark(write or options['cold'], prepare, options['requests'])
+                    self.report(name, results['routes'][name], baseline)
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved the results to {options['output']}."))
+
+    def load_fixture(self):
+        """
+        Pick the largest project authored by the user, one of its issues and
+        comments written by the user, a contributor and a user outside of it.
+        """
+        self.project = Project.objects.filter(
+            contributed_project__user=self.user, contributed_project__role=Contributor.ContributorRole.AUTHOR,
+        ).order_by('-issue_count').first()
+        if self.project is None:
+            raise CommandError(f'{self.user} authors no project, run generate_dataset first.')
+        self.issue = Issue.objects.filter(project=self.project, author=self.user).first()
+        self.comment = Comment.objects.filter(issue__project=self.project, author=self.user).first()
+        self.contributor = Contributor.objects.filter(project=self.project).exclude(user=self.user).first()
+        self.outsiders = list(User.objects.exclude(contributor_projects__project=self.project)[:10])
+        if None in (self.issue, self.comment, self.contributor) or not self.outsiders:
+            raise CommandError(f'The project {self.project.pk} is too small, generate a larger dataset.')
+
+    def get_routes(self):
+        """
+        Return the routes as (name, is a write, prepare) tuples, prepare()
+        returning the method, path and JSON payload of a request.
+        """
+        project = {'project_pk': self.project.pk}
+        issue = {**project, 'pk': self.issue.pk}
+        comments = {**project, 'issue_pk': self.comment.issue_id}
+        comment = {**comments, 'pk': self.comment.pk}
+        issue_data = {'tag': 'BUG', 'priority': 'HIGH', 'title': 'Benchmark issue', 'description': 'Description',
+                      'assigned': self.user.pk}
+        issue_update = {**issue_data, 'project': self.project.pk, 'author': self.user.pk}
+        comment_update = {'description': 'Updated', 'issue': self.comment.issue_id, 'author': self.user.pk}
+        project_data = {'type': 'BACK-END', 'title': 'Benchmark project', 'description': 'Description'}
+        outsider_ids = [user.pk for user in self.outsiders]
+
+        def route(method, viewname, kwargs=None, data=None):
+            path = reverse(viewname, kwargs=kwargs)
+            return lambda: (method, path, data() if callable(data) else data)
+
+        reads = [
+            ('GET users:user-profile', route('GET', 'users:user-profile')),
+            ('GET projects:api-root', route('GET', 'projects:api-root')),
+            ('GET projects:project-list', route('GET', 'projects:project-list')),
+            ('GET projects:project-detail', route('GET', 'projects:project-detail', {'pk': self.project.pk})),
+            ('GET projects:project-export', route('GET', 'projects:project-export', {'pk': self.project.pk})),
+            ('GET projects:project-stats', route('GET', 'projects:project-stats', {'pk': self.project.pk})),
+            ('GET projects:project-all-stats', route('GET', 'projects:project-all-stats')),
+            ('GET projects:project-contributors', route('GET', 'projects:project-contributors', project)),
+            ('GET projects:project-issues', route('GET', 'projects:project-issues', project)),
+            ('GET projects:project-issue-detail', route('GET', 'projects:project-issue-detail', issue)),
+            ('GET projects:comment-list-create', route('GET', 'projects:comment-list-create', comments)),
+            ('GET projects:comment-get-update-destroy',
+             route('GET', 'projects:comment-get-update-destroy', comment)),
+            ('GET projects:comments-list', route('GET', 'projects:comments-list', project)),
+        ]
+        writes = [
+            ('POST users:register', route('POST', 'users:register', data={
+                'username': 'benchmark-registered', 'password': self.password, 'email': 'registered@softdesk.io',
+                'date_of_birth': '1990-01-01'})),
+            ('POST users:login', route('POST', 'users:login', data={
+                'username': self.user.username, 'password': self.password})),
+            ('PATCH users:update-user-profile', route('PATCH', 'users:update-user-profile', data={
+                'can_be_contacted': True})),
+            ('POST users:logout', route('POST', 'users:logout', data=lambda: {
+                'token': str(FilteredRefreshToken.for_user(self.user))})),
+            ('DELETE users:delete-user-profile', route('DELETE', 'users:delete-user-profile')),
+            ('POST projects:project-list', route('POST', 'projects:project-list', data=project_data)),
+            ('PUT projects:project-detail', route('PUT', 'projects:project-detail', {'pk': self.project.pk},
+                                                  {**project_data, 'user_id': self.user.pk})),
+            ('PATCH projects:project-detail', route('PATCH', 'projects:project-detail', {'pk': self.project.pk},
+                                                    {'description': 'Updated'})),
+            ('DELETE projects:project-detail', route('DELETE', 'projects:project-detail', {'pk': self.project.pk})),
+            ('POST projects:project-export', route('POST', 'projects:project-export', {'pk': self.project.pk})),
+            ('POST projects:project-recount', route('POST', 'projects:project-recount', {'pk': self.project.pk})),
+            ('POST projects:project-contributors', route('POST', 'projects:project-contributors', project,
+                                                         {'users': outsider_ids})),
+            ('DELETE projects:project-contributors', route('DELETE', 'projects:project-contributors', project,
+                                                           {'users': [self.contributor.user_id]})),
+            ('POST projects:project-contributor-detail', route(
+                'POST', 'projects:project-contributor-detail', {**project, 'pk': outsider_ids[0]})),
+            ('DELETE projects:project-contributor-detail', route(
+                'DELETE', 'projects:project-contributor-detail', {**project, 'pk': self.contributor.pk})),
+            ('POST projects:project-issues', route('POST', 'projects:project-issues', project, issue_data)),
+            ('POST projects:project-issues-import', route('POST', 'projects:project-issues-import', project,
+                                                          [issue_data] * 20)),
+            ('PUT projects:project-issue-detail', route('PUT', 'projects:project-issue-detail', issue,
+                                                        issue_update)),
+            ('PATCH projects:project-issue-detail', route('PATCH', 'projects:project-issue-detail', issue,
+                                                          {'status': 'INPROGRESS'})),
+            ('DELETE projects:project-issue-detail', route('DELETE', 'projects:project-issue-detail', issue)),
+            ('POST projects:comment-list-create', route('POST', 'projects:comment-list-create', comments,
+                                                        {'description': 'Benchmark comment'})),
+            ('PUT projects:comment-get-update-destroy', route('PUT', 'projects:comment-get-update-destroy', comment,
+                                                              comment_update)),
+            ('PATCH projects:comment-get-update-destroy', route(
+                'PATCH', 'projects:comment-get-update-destroy', comment, {'description': 'Updated'})),
+            ('DELETE projects:comment-get-update-destroy', route(
+                'DELETE', 'projects:comment-get-update-destroy', comment)),
+        ]
+        return ([(name, False, prepare) for name, prepare in reads]
+                + [(name, True, prepare) for name, prepare in writes])
+
+    def send(self, method, path, data):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            if data is None:
+                response = self.client.generic(method, path)
+            else:
+                response = self.client.generic(method, path, json.dumps(data), content_type='application/json')
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            latency = time.perf_counter() - start
+        return response.status_code, latency, len(context), len(content)
+
+    def benchmark(self, isolated, prepare, requests):
+        """
+        Send one warm-up request, then `requests` measured ones, each one rolled
+        back and followed by clearing the caches when `isolated`.
+        """
+        samples = []
+        for _ in range(requests + 1):
+            if isolated:
+                with transaction.atomic():
+                    samples.append(self.send(*prepare()))
+                    transaction.set_rollback(True)
+                for alias in settings.CACHES:
+                    caches[alias].clear()
+            else:
+                samples.append(self.send(*prepare()))
+        statuses, latencies, queries, sizes = zip(*samples[1:])
+        return summarize(latencies, queries, sizes, statuses)
+
+    def report(self, name, result, baseline):
+        line = (f"{name}: p50 {result['p50_ms']:.1f}ms, p95 {result['p95_ms']:.1f}ms, "
+                f"p99 {result['p99_ms']:.1f}ms, {result['queries']} queries, {result['bytes']} bytes, "
+                f"status {'/'.join(map(str, result['statuses']))}")
+        previous = (baseline or {}).get('routes', {}).get(name)
+        if previous:
+            change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100 if previous['p50_ms'] else 0
+            line += f" (p50 {change:+.0f}%, queries {result['queries'] - previous['queries']:+d})"
+        self.stdout.write(line)
@@ -0,0 +1,84 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from projects.models import Project, Contributor, Issue, Comment
+from projects.serializers import IssueSerializer, ContributorSerializer, CommentSerializer
+from projects.views import CommentViewSet
+from users.models import User
+from users.serializers import UserListSerializer
+
+
+class Command(BaseCommand):
+    """
+    Compare the time the DRF serializers and their compiled representations
+    (see ValuesRepresentation) take to render the same rows, fetched once.
+
+    The fixture is created in a transaction which is rolled back.
+    """
+    help = 'Benchmark the serialization of issues, contributors, comments and users, per 1,000 rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='The number of rows of each model.')
+        parser.add_argument('--repeat', type=int, default=5, help='The number of runs, the best one is kept.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            project = self.create_fixture(options['rows'])
+            context = self.get_context(project)
+            cases = (
+                ('Issue', IssueSerializer, Issue.objects.filter(project=project).select_related('author', 'assigned')),
+                ('Contributor', ContributorSerializer,
+                 Contributor.objects.filter(project=project).select_related('user')),
+                ('Comment', CommentSerializer,
+                 Comment.objects.filter(issue__project=project).select_related('author')),
+                ('User', UserListSerializer, User.objects.filter(contributor_projects__project=project)),
+            )
+            for name, serializer_class, queryset in cases:
+                self.compare(name, serializer_class, queryset, context, options['repeat'])
+            transaction.set_rollback(True)
+
+    def create_fixture(self, rows):
+        users = User.objects.bulk_create(
+            User(username=f'benchmark-serializers-{index}', email=f'user{index}@softdesk.io',
+                 date_of_birth=date(1990, 1, 1))
+            for index in range(rows))
+        project = Project.objects.create(
+            type=Project.ProjectType.BACK_END, title='Benchmark', description='Benchmark project')
+        Contributor.objects.bulk_create(Contributor(user=user, project=project) for user in users)
+        issues = Issue.objects.bulk_create(
+            Issue(tag=Issue.IssueTag.TASK, priority=Issue.IssuePriority.LOW, title=f'Issue {index}',
+                  description='Benchmark issue', project=project, author=user, assigned=user)
+            for index, user in enumerate(users))
+        Comment.objects.bulk_create(
+            Comment(description='Benchmark comment', issue=issue, author=issue.author) for issue in issues)
+        return project
+
+    def get_context(self, project):
+        request = Request(RequestFactory(SERVER_NAME='localhost').get('/'))
+        view = CommentViewSet(kwargs={'project_pk': project.pk}, request=request)
+        return {'request': request, 'view': view}
+
+    def best(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def compare(self, name, serializer_class, queryset, context, repeat):
+        instances = list(queryset)
+        representation = serializer_class(context=context).values_representation()
+        rows = list(queryset.values(*representation.lookups))
+
+        serializer = self.best(lambda: serializer_class(instances, many=True, context=context).data, repeat)
+        compiled = self.best(lambda: representation.represent(rows), repeat)
+        per_thousand = 1000 / max(len(rows), 1) * 1000
+        self.stdout.write(
+            f'{name}: {len(rows)} rows, serializer {serializer * per_thousand:.2f}ms, '
+            f'compiled {compiled * per_thousand:.2f}ms per 1,000 rows ({serializer / compiled:.1f}x)')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.exports import ProjectExport
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Export every issue and comment of a project as CSV or NDJSON.
+    """
+    help = 'Export the issues and comments of a project.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_id', type=int, help='The id of the project to export.')
+        parser.add_argument('--format', dest='export_format', choices=sorted(ProjectExport.formats),
+                            default='ndjson', help='The output format.')
+        parser.add_argument('--output', help='The file to write to, standard output by default.')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='The number of rows fetched from the database at a time.')
+
+    def handle(self, *args, **options):
+        if not Project.objects.filter(pk=options['project_id']).exists():
+            raise CommandError(f"Project {options['project_id']} does not exist.")
+
+        export = ProjectExport(options['project_id'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', newline='') as output:
+                output.writelines(export.lines(options['export_format']))
+        else:
+            for line in export.lines(options['export_format']):
+                self.stdout.write(line, ending='')
@@ -0,0 +1,125 @@
+import random
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from projects.models import Project, Contributor, Issue, Comment
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Generate a synthetic dataset with bulk_create: users, projects whose
+    contributor counts follow a power law, issues per project and comments per
+    issue drawn from exponential distributions around the requested means.
+
+    Users are named `<prefix>-user-<n>` and share the same password; user 0
+    authors the largest project, and each project author writes the first
+    issue of the project and the first comment of each issue. The counters of projects and issues are set
+    as the rows are created, since bulk_create bypasses the signals
+    maintaining them.
+    """
+    help = 'Generate a synthetic dataset of users, projects, contributors, issues and comments.'
+
+    password = 'benchmark-password'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='The number of users.')
+        parser.add_argument('--projects', type=int, default=100, help='The number of projects.')
+        parser.add_argument('--max-contributors', type=int, default=200,
+                            help='The number of contributors of the largest project.')
+        parser.add_argument('--skew', type=float, default=1.0,
+                            help='The exponent of the power law of the contributor counts.')
+        parser.add_argument('--issues', type=float, default=50, help='The mean number of issues per project.')
+        parser.add_argument('--comments', type=float, default=5, help='The mean number of comments per issue.')
+        parser.add_argument('--prefix', default='bench', help='The prefix of the usernames and project titles.')
+        parser.add_argument('--seed', type=int, default=0, help='The seed of the random generator.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='The number of rows per INSERT.')
+        parser.add_argument('--clear', action='store_true', help='Delete the dataset with the same prefix first.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('At least one user is required.')
+        self.random = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.batch_size = options['batch_size']
+
+        with transaction.atomic():
+            if options['clear']:
+                self.clear()
+            elif User.objects.filter(username__startswith=f'{self.prefix}-user-').exists():
+                raise CommandError(f"A dataset prefixed '{self.prefix}' exists, use --clear to replace it.")
+
+            users = self.create_users(options['users'])
+            counts = {'users': len(users), 'projects': 0, 'contributors': 0, 'issues': 0, 'comments': 0}
+            for index in range(options['projects']):
+                size = max(1, min(len(users), round(options['max_contributors'] / (index + 1) ** options['skew'])))
+                created = self.create_project(index, users, size, options['issues'], options['comments'])
+                for name, count in created.items():
+                    counts[name] += count
+
+        self.stdout.write(self.style.SUCCESS(', '.join(f'{count} {name}' for name, count in counts.items())))
+
+    def clear(self):
+        Project.objects.filter(title__startswith=f'{self.prefix} project ').delete()
+        User.objects.filter(username__startswith=f'{self.prefix}-user-').delete()
+
+    def create_users(self, count):
+        password = make_password(self.password)
+        return User.objects.bulk_create(
+            (User(username=f'{self.prefix}-user-{index}', email=f'{self.prefix}-user-{index}@softdesk.io',
+                  password=password, date_of_birth=date(1970 + index % 40, 1 + index % 12, 1))
+             for index in range(count)),
+            batch_size=self.batch_size)
+
+    def draw(self, mean):
+        return round(self.random.expovariate(1 / mean)) if mean > 0 else 0
+
+    def create_project(self, index, users, size, issues_mean, comments_mean):
+        """
+        Create a project with `size` contributors, its issues and their comments.
+        """
+        author = users[index % len(users)]
+        others = self.random.sample([user for user in users if user.pk != author.pk], size - 1)
+        members = [author] + others
+
+        issues = []
+        for number in range(self.draw(issues_mean)):
+            issues.append(Issue(
+                tag=self.random.choice(Issue.IssueTag.values),
+                priority=self.random.choice(Issue.IssuePriority.values),
+                status=self.random.choices(Issue.IssueStatus.values, weights=(5, 3, 2))[0],
+                title=f'Issue {number} of project {index}',
+                description=f'Synthetic issue {number} of project {index}.',
+                author=author if number == 0 else self.random.choice(members),
+                assigned=self.random.choice(members),
+                comment_count=self.draw(comments_mean),
+            ))
+
+        project = Project.objects.create(
+            type=self.random.choice(Project.ProjectType.values),
+            title=f'{self.prefix} project {index}',
+            description=f'Synthetic project {index}.',
+            issue_count=len(issues),
+            open_issue_count=sum(1 for issue in issues if issue.is_open),
+            contributor_count=len(members),
+        )
+        Contributor.objects.bulk_create(
+            (Contributor(user=user, project=project,
+                         role=Contributor.ContributorRole.AUTHOR if user is author
+                         else Contributor.ContributorRole.CONTRIBUTOR)
+             for user in members),
+            batch_size=self.batch_size)
+
+        for issue in issues:
+            issue.project = project
+        issues = Issue.objects.bulk_create(issues, batch_size=self.batch_size)
+        comments = Comment.objects.bulk_create(
+            (Comment(description=f'Synthetic comment {number} on {issue.title}.', issue=issue,
+                     author=author if number == 0 else self.random.choice(members))
+             for issue in issues for number in range(issue.comment_count)),
+            batch_size=self.batch_size)
+
+        return {'projects': 1, 'contributors': len(members), 'issues': len(issues), 'comments': len(comments)}
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.search import issue_index, comment_index
+
+
+class Command(BaseCommand):
+    """
+    Repopulate the full-text search indexes of issues and comments from the
+    existing rows.
+    """
+    help = 'Rebuild the full-text search indexes of issues and comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default',
+                            help='The database to rebuild the indexes on.')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        for name, index in (('issues', issue_index), ('comments', comment_index)):
+            if not index.is_available(using):
+                raise CommandError('Full-text search requires an SQLite database.')
+            count = index.rebuild(using)
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} {name}.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.queue import enqueue
+from projects.counters import recount
+
+
+class Command(BaseCommand):
+    """
+    Recompute the issue, open issue, contributor and comment counters that
+    drifted from the rows they count, e.g. after queryset updates or raw SQL
+    that bypass the signals maintaining them.
+
+    With --queue, the rebuild is left to a worker of `manage.py run_jobs`.
+    """
+    help = 'Repair the denormalized counters of projects and issues.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='The number of rows updated per query.')
+        parser.add_argument('--queue', action='store_true',
+                            help='Queue the rebuild as a background job instead of running it.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('The batch size must be positive.')
+        if options['queue']:
+            job, created = enqueue('projects.recount', {'batch_size': options['batch_size']}, key='projects.recount')
+            self.stdout.write(self.style.SUCCESS(
+                f"{'Queued' if created else 'Already queued:'} job {job.pk}."))
+            return
+        for label, count in recount(options['batch_size']).items():
+            self.stdout.write(self.style.SUCCESS(f'Repaired {count} {label} rows.'))
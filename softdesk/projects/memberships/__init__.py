@@ -0,0 +1,3 @@
+from .resolver import MembershipResolver, get_resolver, invalidate_membership, activate, deactivate
+from .middleware import MembershipMiddleware
+from .cache import MembershipCache, get_membership_cache
@@ -0,0 +1,87 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+MISSING = object()
+
+
+class MembershipCache:
+    """
+    Process-wide cache of memberships keyed by (user, project).
+
+    Entries are stored in one of the Django caches declared in settings.CACHES,
+    so the storage is pluggable: a locmem cache gives LRU eviction bounded by
+    its MAX_ENTRIES option, while the file-based and database caches share the
+    entries between worker processes. Every entry expires after the cache
+    TIMEOUT and is dropped as soon as the membership changes (see signals.py).
+
+    A user who is not a contributor to a project is cached as an empty role so
+    that refusals are cached as well.
+
+    Entries record the generation of their user, a random token stored under
+    its own key, as in projects.responses. The generation is read before the
+    memberships are, and a change of membership deletes it, again once the
+    change is committed: an entry read from the database before a change and
+    written after it no longer matches, and is not served.
+
+    Methods:
+        get_generation(user_id): Return the current generation of the user.
+        get(user_id, project_id): Return the cached role, '' for no role, or MISSING.
+        set_many(user_id, roles, generation): Cache a {project_id: role} map of a user read at a generation.
+        delete(user_id, project_id): Drop the entry of a membership and the generation of its user.
+    """
+
+    key_prefix = 'membership'
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def make_key(self, user_id, project_id):
+        return f'{self.key_prefix}:{user_id}:{project_id}'
+
+    def make_generation_key(self, user_id):
+        return f'{self.key_prefix}-user:{user_id}'
+
+    def get_generation(self, user_id):
+        key = self.make_generation_key(user_id)
+        generation = self.cache.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not self.cache.add(key, generation, timeout=None):
+                generation = self.cache.get(key)
+        return generation
+
+    def get(self, user_id, project_id):
+        generation_key, key = self.make_generation_key(user_id), self.make_key(user_id, project_id)
+        values = self.cache.get_many([generation_key, key])
+        if key not in values or generation_key not in values:
+            return MISSING
+        generation, role = values[key]
+        return role if generation == values[generation_key] else MISSING
+
+    def set_many(self, user_id, roles, generation):
+        self.cache.set_many({
+            self.make_key(user_id, project_id): (generation, role or '')
+            for project_id, role in roles.items()
+        })
+
+    def delete(self, user_id, project_id):
+        keys = [self.make_generation_key(user_id), self.make_key(user_id, project_id)]
+        self.cache.delete_many(keys)
+        # Memberships read before the change committed may have been cached
+        # meanwhile: drop the generation again once the change is visible.
+        transaction.on_commit(lambda: self.cache.delete_many(keys))
+
+
+def get_membership_cache():
+    """
+    Return the membership cache configured by settings.MEMBERSHIP_CACHE, or None
+    when the cross-request cache is disabled.
+    """
+    alias = getattr(settings, 'MEMBERSHIP_CACHE', None)
+    if alias is None:
+        return None
+    return MembershipCache(alias)
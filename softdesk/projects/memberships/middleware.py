@@ -0,0 +1,38 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .resolver import MembershipResolver, activate, deactivate
+
+
+class MembershipMiddleware:
+    """
+    Activate a fresh MembershipResolver for each request.
+
+    Every membership check performed while handling the request, in permission
+    classes as well as in model validators, shares the same resolver. Under ASGI
+    the resolver is activated on the event loop, and the context is copied to the
+    threads running the synchronous code of the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = activate(MembershipResolver())
+        try:
+            return self.get_response(request)
+        finally:
+            deactivate(token)
+
+    async def __acall__(self, request):
+        token = activate(MembershipResolver())
+        try:
+            return await self.get_response(request)
+        finally:
+            deactivate(token)
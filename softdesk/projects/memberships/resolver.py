@@ -0,0 +1,117 @@
+from contextvars import ContextVar
+
+from django.apps import apps
+
+from .cache import MISSING, get_membership_cache
+
+
+_current_resolver = ContextVar('membership_resolver', default=None)
+
+
+class MembershipResolver:
+    """
+    Resolve the role of users in projects with one query per user.
+
+    The first lookup for a user loads its whole {project_id: role} map; every
+    later lookup for the same user is answered from memory. A resolver lives
+    for the duration of a request (see MembershipMiddleware) and is shared by
+    the permission classes and the model validators.
+
+    Single lookups are first looked up in the cross-request MembershipCache, so
+    that a user polling the same projects does not hit the database at all.
+
+    Methods:
+        role(user, project_id): Return the role of the user in the project, or None.
+        is_contributor(user, project_id): Checks if the user is a contributor to the project.
+        is_author(user, project_id): Checks if the user is the author of the project.
+        project_ids(user): Return the ids of the projects the user contributes to.
+        forget(user_id): Drop the loaded map of a user.
+    """
+
+    def __init__(self, cache=MISSING):
+        self._roles = {}
+        self._generations = {}
+        self.cache = get_membership_cache() if cache is MISSING else cache
+
+    def _load(self, user_id):
+        Contributor = apps.get_model('projects', 'Contributor')
+        if self.cache is not None:
+            self._generations[user_id] = self.cache.get_generation(user_id)
+        roles = dict(Contributor.objects.filter(
+            user_id=user_id).values_list('project_id', 'role'))
+        if self.cache is not None:
+            self.cache.set_many(user_id, roles, self._generations[user_id])
+        return roles
+
+    def roles(self, user):
+        """
+        Return the {project_id: role} map of the user.
+        """
+        user_id = getattr(user, 'pk', None)
+        if user_id is None:
+            return {}
+        if user_id not in self._roles:
+            self._roles[user_id] = self._load(user_id)
+        return self._roles[user_id]
+
+    def role(self, user, project_id):
+        user_id = getattr(user, 'pk', None)
+        if user_id is None:
+            return None
+        if user_id not in self._roles and self.cache is not None:
+            role = self.cache.get(user_id, project_id)
+            if role is not MISSING:
+                return role or None
+
+        role = self.roles(user).get(project_id)
+        if role is None and self.cache is not None:
+            self.cache.set_many(user_id, {project_id: None}, self._generations[user_id])
+        return role
+
+    def is_contributor(self, user, project_id):
+        return self.role(user, project_id) is not None
+
+    def is_author(self, user, project_id):
+        Contributor = apps.get_model('projects', 'Contributor')
+        return self.role(user, project_id) == Contributor.ContributorRole.AUTHOR
+
+    def project_ids(self, user):
+        return list(self.roles(user))
+
+    def forget(self, user_id):
+        self._roles.pop(user_id, None)
+        self._generations.pop(user_id, None)
+
+
+def get_resolver():
+    """
+    Return the resolver of the current request, or a short-lived one when
+    called outside of a request (shell, admin actions, management commands).
+    """
+    resolver = _current_resolver.get()
+    if resolver is None:
+        resolver = MembershipResolver()
+    return resolver
+
+
+def invalidate_membership(user_id, project_id):
+    """
+    Drop a membership from the current resolver and from the cross-request
+    cache. Called by the Contributor signals, and explicitly after bulk
+    operations that bypass them.
+    """
+    get_resolver().forget(user_id)
+    cache = get_membership_cache()
+    if cache is not None:
+        cache.delete(user_id, project_id)
+
+
+def activate(resolver):
+    """
+    Make the resolver the current one and return a token for deactivate().
+    """
+    return _current_resolver.set(resolver)
+
+
+def deactivate(token):
+    _current_resolver.reset(token)
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from projects.models import Contributor
+from .resolver import invalidate_membership
+
+
+@receiver([post_save, post_delete], sender=Contributor)
+def forget_contributor(sender, instance, **kwargs):
+    """
+    Drop a membership from the caches when it is created, updated or deleted.
+
+    Deleting a Project or a User cascades to its Contributor rows, and Django
+    sends post_delete for each of them, so cascades are covered as well.
+    """
+    invalidate_membership(instance.user_id, instance.project_id)
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+
+# Frozen copy of the SQL of projects.search.index when the indexes were added.
+CREATE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_issue_search USING fts5(key UNINDEXED, title, description, "
+    "tokenize='unicode61 remove_diacritics 2');",
+    'CREATE TRIGGER IF NOT EXISTS projects_issue_search_ai AFTER INSERT ON projects_issue BEGIN INSERT OR '
+    'REPLACE INTO projects_issue_search(rowid, key, title, description) VALUES (NEW.rowid, NEW.id, NEW.title,'
+    ' NEW.description); END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_issue_search_ad AFTER DELETE ON projects_issue BEGIN DELETE FROM '
+    'projects_issue_search WHERE rowid = OLD.rowid; END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_issue_search_au AFTER UPDATE OF title, description ON '
+    'projects_issue BEGIN DELETE FROM projects_issue_search WHERE rowid = OLD.rowid; INSERT OR REPLACE INTO '
+    'projects_issue_search(rowid, key, title, description) VALUES (NEW.rowid, NEW.id, NEW.title, '
+    'NEW.description); END;',
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_comment_search USING fts5(key UNINDEXED, description, "
+    "tokenize='unicode61 remove_diacritics 2');",
+    'CREATE TRIGGER IF NOT EXISTS projects_comment_search_ai AFTER INSERT ON projects_comment BEGIN INSERT OR'
+    ' REPLACE INTO projects_comment_search(rowid, key, description) VALUES (NEW.rowid, NEW.unique_id, '
+    'NEW.description); END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_comment_search_ad AFTER DELETE ON projects_comment BEGIN DELETE '
+    'FROM projects_comment_search WHERE rowid = OLD.rowid; END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_comment_search_au AFTER UPDATE OF description ON projects_comment '
+    'BEGIN DELETE FROM projects_comment_search WHERE rowid = OLD.rowid; INSERT OR REPLACE INTO '
+    'projects_comment_search(rowid, key, description) VALUES (NEW.rowid, NEW.unique_id, NEW.description); '
+    'END;',
+]
+
+REBUILD_INDEX_SQL = [
+    'DELETE FROM projects_issue_search;',
+    'INSERT INTO projects_issue_search(rowid, key, title, description) SELECT rowid, id, title, description '
+    'FROM projects_issue;',
+    'DELETE FROM projects_comment_search;',
+    'INSERT INTO projects_comment_search(rowid, key, description) SELECT rowid, unique_id, description FROM '
+    'projects_comment;',
+]
+
+DROP_INDEX_SQL = [
+    'DROP TRIGGER IF EXISTS projects_issue_search_ai;',
+    'DROP TRIGGER IF EXISTS projects_issue_search_ad;',
+    'DROP TRIGGER IF EXISTS projects_issue_search_au;',
+    'DROP TABLE IF EXISTS projects_issue_search;',
+    'DROP TRIGGER IF EXISTS projects_comment_search_ai;',
+    'DROP TRIGGER IF EXISTS projects_comment_search_ad;',
+    'DROP TRIGGER IF EXISTS projects_comment_search_au;',
+    'DROP TABLE IF EXISTS projects_comment_search;',
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_INDEX_SQL + REBUILD_INDEX_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_INDEX_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,134 @@
+# Generated by Django 4.2.4 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+# Frozen copy of the SQL of projects.search.index and projects.versions.triggers
+# when the versions were added.
+CREATE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_issue_search USING fts5(key UNINDEXED, title, description, "
+    "tokenize='unicode61 remove_diacritics 2');",
+    'CREATE TRIGGER IF NOT EXISTS projects_issue_search_ai AFTER INSERT ON projects_issue BEGIN INSERT OR '
+    'REPLACE INTO projects_issue_search(rowid, key, title, description) VALUES (NEW.rowid, NEW.id, NEW.title,'
+    ' NEW.description); END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_issue_search_ad AFTER DELETE ON projects_issue BEGIN DELETE FROM '
+    'projects_issue_search WHERE rowid = OLD.rowid; END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_issue_search_au AFTER UPDATE OF title, description ON '
+    'projects_issue BEGIN DELETE FROM projects_issue_search WHERE rowid = OLD.rowid; INSERT OR REPLACE INTO '
+    'projects_issue_search(rowid, key, title, description) VALUES (NEW.rowid, NEW.id, NEW.title, '
+    'NEW.description); END;',
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_comment_search USING fts5(key UNINDEXED, description, "
+    "tokenize='unicode61 remove_diacritics 2');",
+    'CREATE TRIGGER IF NOT EXISTS projects_comment_search_ai AFTER INSERT ON projects_comment BEGIN INSERT OR'
+    ' REPLACE INTO projects_comment_search(rowid, key, description) VALUES (NEW.rowid, NEW.unique_id, '
+    'NEW.description); END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_comment_search_ad AFTER DELETE ON projects_comment BEGIN DELETE '
+    'FROM projects_comment_search WHERE rowid = OLD.rowid; END;',
+    'CREATE TRIGGER IF NOT EXISTS projects_comment_search_au AFTER UPDATE OF description ON projects_comment '
+    'BEGIN DELETE FROM projects_comment_search WHERE rowid = OLD.rowid; INSERT OR REPLACE INTO '
+    'projects_comment_search(rowid, key, description) VALUES (NEW.rowid, NEW.unique_id, NEW.description); '
+    'END;',
+]
+
+REBUILD_INDEX_SQL = [
+    'DELETE FROM projects_issue_search;',
+    'INSERT INTO projects_issue_search(rowid, key, title, description) SELECT rowid, id, title, description '
+    'FROM projects_issue;',
+    'DELETE FROM projects_comment_search;',
+    'INSERT INTO projects_comment_search(rowid, key, description) SELECT rowid, unique_id, description FROM '
+    'projects_comment;',
+]
+
+CREATE_VERSION_SQL = [
+    "CREATE TRIGGER IF NOT EXISTS projects_project_version_au AFTER UPDATE ON projects_project WHEN "
+    "NEW.version <= OLD.version BEGIN UPDATE projects_project SET version = OLD.version + 1, updated_time = "
+    "strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = NEW.id; END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_contributor_version_ai AFTER INSERT ON projects_contributor BEGIN "
+    "UPDATE projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') "
+    "WHERE id IN (NEW.project_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_contributor_version_ad AFTER DELETE ON projects_contributor BEGIN "
+    "UPDATE projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') "
+    "WHERE id IN (OLD.project_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_contributor_version_au AFTER UPDATE ON projects_contributor BEGIN "
+    "UPDATE projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') "
+    "WHERE id IN (NEW.project_id) OR id IN (OLD.project_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_issue_version_ai AFTER INSERT ON projects_issue BEGIN UPDATE "
+    "projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id"
+    " IN (NEW.project_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_issue_version_ad AFTER DELETE ON projects_issue BEGIN UPDATE "
+    "projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id"
+    " IN (OLD.project_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_issue_version_au AFTER UPDATE ON projects_issue BEGIN UPDATE "
+    "projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id"
+    " IN (NEW.project_id) OR id IN (OLD.project_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_comment_version_ai AFTER INSERT ON projects_comment BEGIN UPDATE "
+    "projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id"
+    " IN (SELECT project_id FROM projects_issue WHERE id = NEW.issue_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_comment_version_ad AFTER DELETE ON projects_comment BEGIN UPDATE "
+    "projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id"
+    " IN (SELECT project_id FROM projects_issue WHERE id = OLD.issue_id); END;",
+    "CREATE TRIGGER IF NOT EXISTS projects_comment_version_au AFTER UPDATE ON projects_comment BEGIN UPDATE "
+    "projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id"
+    " IN (SELECT project_id FROM projects_issue WHERE id = NEW.issue_id) OR id IN (SELECT project_id FROM "
+    "projects_issue WHERE id = OLD.issue_id); END;",
+]
+
+DROP_VERSION_SQL = [
+    'DROP TRIGGER IF EXISTS projects_project_version_au;',
+    'DROP TRIGGER IF EXISTS projects_contributor_version_ai;',
+    'DROP TRIGGER IF EXISTS projects_contributor_version_ad;',
+    'DROP TRIGGER IF EXISTS projects_contributor_version_au;',
+    'DROP TRIGGER IF EXISTS projects_issue_version_ai;',
+    'DROP TRIGGER IF EXISTS projects_issue_version_ad;',
+    'DROP TRIGGER IF EXISTS projects_issue_version_au;',
+    'DROP TRIGGER IF EXISTS projects_comment_version_ai;',
+    'DROP TRIGGER IF EXISTS projects_comment_version_ad;',
+    'DROP TRIGGER IF EXISTS projects_comment_version_au;',
+]
+
+
+def create_version_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    # Adding the columns rebuilt the tables, dropping the triggers of the search
+    # indexes and renumbering the implicit rowids of the comments.
+    for statement in CREATE_INDEX_SQL + REBUILD_INDEX_SQL + CREATE_VERSION_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_version_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_VERSION_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated Time'),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated Time'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='updated_time',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated Time'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.RunPython(create_version_triggers, drop_version_triggers),
+    ]
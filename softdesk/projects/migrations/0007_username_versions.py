@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+# Frozen copy of the users_user trigger of projects.versions.triggers.
+CREATE_SQL = (
+    "CREATE TRIGGER IF NOT EXISTS users_user_version_au AFTER UPDATE OF username ON users_user "
+    "WHEN NEW.username IS NOT OLD.username BEGIN "
+    "UPDATE projects_project SET version = version + 1, updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') "
+    "WHERE id IN ("
+    "SELECT project_id FROM projects_contributor WHERE user_id = NEW.id "
+    "UNION SELECT project_id FROM projects_issue WHERE author_id = NEW.id OR assigned_id = NEW.id "
+    "UNION SELECT projects_issue.project_id FROM projects_comment "
+    "JOIN projects_issue ON projects_issue.id = projects_comment.issue_id "
+    "WHERE projects_comment.author_id = NEW.id); END;"
+)
+
+DROP_SQL = 'DROP TRIGGER IF EXISTS users_user_version_au;'
+
+
+def create_username_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_username_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_counters'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_username_trigger, drop_username_trigger),
+    ]
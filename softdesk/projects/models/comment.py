@@ -1,6 +1,8 @@
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.db import models
+
+from projects.memberships.resolver import get_resolver
 import uuid
 
 
@@ -17,6 +19,7 @@ class Comment(models.Model):
         issue (ForeignKey): The associated issue where the comment is made.
         author (ForeignKey): The author of the comment, related to the User model.
         created_time (DateTimeField): The timestamp when the comment was created.
+        updated_time (DateTimeField): The timestamp when the comment was last modified.
 
     Methods:
         is_author(self, user): Checks if the provided user is the author of the comment.
@@ -33,18 +36,25 @@ class Comment(models.Model):
         "Author"), related_name="authored_comments", null=True, on_delete=models.CASCADE)
     created_time = models.DateTimeField(
         auto_now_add=True, verbose_name=_("Created Time"))
+    updated_time = models.DateTimeField(
+        auto_now=True, verbose_name=_("Updated Time"))
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['issue', 'created_time'], name='comment_issue_created_idx'),
+        ]
 
     def is_author(self, user):
         return self.author == user
 
     def is_contributor(self, user):
-        return self.issue.is_contributor(user)
+        return get_resolver().is_contributor(user, self.issue.project_id)
 
     def __str__(self):
         return f"Comment {self.unique_id}"
 
     def clean(self):
-        if not self.issue.is_contributor(self.author):
+        if not get_resolver().is_contributor(self.author, self.issue.project_id):
             raise ValidationError(
                 _("The author must be a contributor on the project."))
 
@@ -2,6 +2,8 @@ from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.db import models
 
+from projects.memberships.resolver import get_resolver
+
 
 class Contributor(models.Model):
     """
@@ -35,10 +37,10 @@ class Contributor(models.Model):
         auto_now_add=True, verbose_name=_("Created Time"))
 
     def is_author(self, user):
-        return self.project.is_author(user)
+        return get_resolver().is_author(user, self.project_id)
 
     def is_contributor(self, user):
-        return self.project.is_contributor(user)
+        return get_resolver().is_contributor(user, self.project_id)
 
     def __str__(self):
         return f'{self.user}'
@@ -49,6 +51,9 @@ class Contributor(models.Model):
 
     class Meta:
         unique_together = ('user', 'project',)
+        indexes = [
+            models.Index(fields=['project', 'role'], name='contributor_project_role_idx'),
+        ]
 
     def clean(self):
         """
@@ -2,6 +2,8 @@ from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.db import models
 
+from projects.memberships.resolver import get_resolver
+
 
 class Issue(models.Model):
     """
@@ -20,10 +22,15 @@ class Issue(models.Model):
         author (ForeignKey): The author of the issue, related to the User model.
         assigned (ForeignKey): The user assigned to the issue, related to the User model.
         created_time (DateTimeField): The timestamp when the issue was created.
+        updated_time (DateTimeField): The timestamp when the issue was last modified.
+        comment_count (IntegerField): The number of comments on the issue, see projects.counters.
 
     Methods:
         is_author(self, user): Checks if the provided user is the author of the issue.
         is_contributor(self, user): Checks if the provided user is a contributor to the project.
+        is_open: Whether the issue is not finished.
+        get_state(self): Return the (project_id, is_open) the project counters depend on, as
+            kept in `loaded_state` when the issue is loaded from the database.
     """
     class IssueTag(models.TextChoices):
         BUG = "BUG", _("Bug")
@@ -58,20 +65,49 @@ class Issue(models.Model):
         "Assigned"), related_name="assigned_issues", null=True, on_delete=models.CASCADE)
     created_time = models.DateTimeField(
         auto_now_add=True, verbose_name=_("Created Time"))
+    updated_time = models.DateTimeField(
+        auto_now=True, verbose_name=_("Updated Time"))
+    comment_count = models.IntegerField(
+        default=0, editable=False, verbose_name=_("Comment Count"))
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'priority'], name='issue_project_status_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_state = instance.get_state()
+        return instance
+
+    @property
+    def is_open(self):
+        return self.status != Issue.IssueStatus.FINISHED
+
+    def get_state(self):
+        """
+        Return the (project_id, is_open) the issue counters depend on, or None
+        when they were not loaded.
+        """
+        if 'project_id' not in self.__dict__ or 'status' not in self.__dict__:
+            return None
+        return self.project_id, self.is_open
 
     def is_author(self, user):
         return self.author == user
 
     def is_contributor(self, user):
-        return self.project.is_contributor(user)
+        return get_resolver().is_contributor(user, self.project_id)
 
     def __str__(self):
         return f"(ID:{self.id} - {self.title})"
 
     def clean(self):
-        if not self.project.is_contributor(self.assigned):
+        resolver = get_resolver()
+        if not resolver.is_contributor(self.assigned, self.project_id):
             raise ValidationError(_(" 'Assigned' must be a contributor in the project."))
-        if not self.project.is_contributor(self.author):
+        if not resolver.is_contributor(self.author, self.project_id):
             raise ValidationError(_(" 'Author' must be a contributor in the project."))
 
     def save(self, *args, **kwargs):
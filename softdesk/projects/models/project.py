@@ -1,6 +1,8 @@
 from django.utils.translation import gettext_lazy as _
 from django.db import models
 
+from projects.memberships.resolver import get_resolver
+
 
 class Project(models.Model):
     """
@@ -14,6 +16,13 @@ class Project(models.Model):
         title (CharField): The title of the project.
         description (TextField): A description of the project.
         created_time (DateTimeField): The timestamp when the project was created.
+        updated_time (DateTimeField): The timestamp of the last change to the project or to its
+            contributors, issues and comments.
+        version (PositiveBigIntegerField): Incremented on every change to the project or to its
+            contributors, issues and comments, see projects.versions.
+        issue_count (IntegerField): The number of issues of the project, see projects.counters.
+        open_issue_count (IntegerField): The number of issues of the project that are not finished.
+        contributor_count (IntegerField): The number of contributors of the project, author included.
 
     Methods:
         is_author(self, user): Checks if the provided user is the author of the project.
@@ -34,12 +43,22 @@ class Project(models.Model):
         max_length=500, verbose_name=_("Description"))
     created_time = models.DateTimeField(
         auto_now_add=True, verbose_name=_("Created Time"))
+    updated_time = models.DateTimeField(
+        auto_now=True, verbose_name=_("Updated Time"))
+    version = models.PositiveBigIntegerField(
+        default=0, editable=False, verbose_name=_("Version"))
+    issue_count = models.IntegerField(
+        default=0, editable=False, verbose_name=_("Issue Count"))
+    open_issue_count = models.IntegerField(
+        default=0, editable=False, verbose_name=_("Open Issue Count"))
+    contributor_count = models.IntegerField(
+        default=0, editable=False, verbose_name=_("Contributor Count"))
 
     def is_author(self, user):
-        return self.contributed_project.filter(user=user, role='AUTHOR').exists()
+        return get_resolver().is_author(user, self.pk)
 
     def is_contributor(self, user):
-        return self.contributed_project.filter(user=user).exists()
+        return get_resolver().is_contributor(user, self.pk)
 
     def __str__(self):
         return f"(ID:{self.id} - {self.title})"
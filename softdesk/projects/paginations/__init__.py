@@ -1 +1,3 @@
 from .base import BasePagination
+from .cursor import BaseCursorPagination
+from .asynchronous import afetch
@@ -0,0 +1,10 @@
+async def afetch(queryset):
+    """
+    Evaluate a queryset with the async ORM.
+
+    QuerySet.aiterator() streams the rows in chunks but cannot prefetch
+    related objects, so prefetching querysets are evaluated in one go.
+    """
+    if queryset._prefetch_related_lookups:
+        return [obj async for obj in queryset]
+    return [obj async for obj in queryset.aiterator()]
@@ -1,6 +1,10 @@
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from .asynchronous import afetch
+
 
 class BasePagination(PageNumberPagination):
     """
@@ -11,12 +15,48 @@ class BasePagination(PageNumberPagination):
     - message (str): The default message for the paginated response.
 
     Methods:
+    - apaginate_queryset(queryset, request, view): Like paginate_queryset, with the async ORM.
+    - get_position_fields(request, queryset, view): Return the fields the objects of a page must hold.
     - get_paginated_response(data): Generate a paginated response with a custom message.
 
     """
     page_size = 10
     message = 'list'
 
+    def get_position_fields(self, request, queryset, view=None):
+        """
+        Pages are located by number: the objects need not hold any field.
+        """
+        return []
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Return the objects of the requested page, counted and fetched with the async ORM.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        bottom = (number - 1) * page_size
+        object_list = await afetch(queryset[bottom:bottom + page_size])
+        self.page = paginator._get_page(object_list, number, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.request = request
+        return list(self.page)
+
     def get_paginated_response(self, data):
         """
         Generate a paginated response with a custom message.
@@ -0,0 +1,168 @@
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+from rest_framework.response import Response
+
+from .asynchronous import afetch
+
+
+class BaseCursorPagination(CursorPagination):
+    """
+    Keyset pagination class sharing the response structure of BasePagination.
+
+    Pages are fetched with a `WHERE <ordering column> > <position>` predicate
+    instead of an OFFSET scan, and no COUNT(*) is run unless the client asks
+    for it with `?count=true`, so deep pages cost the same as the first one.
+
+    Views opt in by setting `pagination_class = BaseCursorPagination`, and may
+    set `cursor_ordering` to the stable columns to paginate on (`id` by default).
+    Querysets ranked by the full-text search are paginated by rank first.
+
+    Attributes:
+    - page_size (int): The number of items to include per page.
+    - message (str): The default message for the paginated response.
+    - ordering (tuple): The default ordering columns.
+    - count_query_param (str): The query parameter requesting the total count.
+
+    Methods:
+    - paginate_queryset(queryset, request, view): Return the objects of the requested page.
+    - apaginate_queryset(queryset, request, view): Same as paginate_queryset, with the async ORM.
+    - get_position_fields(request, queryset, view): Return the fields the objects of a page must hold.
+    - get_paginated_response(data): Generate a paginated response with a custom message.
+
+    """
+    page_size = 10
+    message = 'list'
+    ordering = ('id',)
+    count_query_param = 'count'
+    rank_field = 'search_rank'
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Use the `cursor_ordering` of the view when it defines one, after the
+        search rank when the queryset is ranked.
+        """
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering:
+            ordering = (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        else:
+            ordering = super().get_ordering(request, queryset, view)
+        if self.rank_field in queryset.query.annotations:
+            ordering = (self.rank_field,) + ordering
+        return ordering
+
+    def get_position_fields(self, request, queryset, view=None):
+        """
+        Return the field the cursors are built from, which the objects of a page,
+        be they rows of QuerySet.values(), must hold.
+        """
+        return [self.get_ordering(request, queryset, view)[0].lstrip('-')]
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the slice of the queryset holding the requested page, plus one
+        object telling whether a page follows, or None when pagination is off.
+
+        This is the first half of CursorPagination.paginate_queryset(), the
+        second half being set_page(), so that the page can be fetched either way.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (self.offset, self.reverse, self.current_position) = (0, False, None)
+        else:
+            (self.offset, self.reverse, self.current_position) = self.cursor
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            order = self.ordering[0]
+            is_reversed = order.startswith('-')
+            order_attr = order.lstrip('-')
+
+            if self.cursor.reverse != is_reversed:
+                queryset = queryset.filter(**{order_attr + '__lt': self.current_position})
+            else:
+                queryset = queryset.filter(**{order_attr + '__gt': self.current_position})
+
+        return queryset[self.offset:self.offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """
+        Keep the fetched page and work out the positions of the next and previous pages.
+        """
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if self.reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (self.current_position is not None) or (self.offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = self.current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (self.current_position is not None) or (self.offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = self.current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = queryset.count() if self.wants_count(request) else None
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.count = await queryset.acount() if self.wants_count(request) else None
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(await afetch(page_queryset))
+
+    def get_paginated_response(self, data):
+        """
+        Generate a paginated response with a custom message.
+
+        Args:
+        - data (list): The paginated data.
+
+        Returns:
+        - Response: Paginated response object containing the message, next, previous, and results,
+          plus the count when it was requested.
+
+        """
+        response = {"message": self.message}
+        if self.count is not None:
+            response["count"] = self.count
+        response.update({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data
+        })
+        return Response(response)
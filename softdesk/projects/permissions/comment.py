@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 from django.shortcuts import get_object_or_404
 from projects.models import Project, Issue, Comment
+from projects.memberships import get_resolver
 
 
 class CommentPermissions(BasePermission):
@@ -19,7 +20,10 @@ class CommentPermissions(BasePermission):
         if not request.user.is_authenticated:
             return False
 
-        project = get_object_or_404(Project, id=view.kwargs['project_pk'])
+        project_id = view.kwargs['project_pk']
+        resolver = get_resolver()
+        if not resolver.is_contributor(request.user, project_id):
+            get_object_or_404(Project, id=project_id)
         issue = None
 
         if 'issue_pk' in view.kwargs:
@@ -27,8 +31,9 @@ class CommentPermissions(BasePermission):
 
         if request.method in ['GET', 'POST']:
             if issue:
-                return project.is_contributor(request.user) and issue.is_contributor(request.user)
-            return project.is_contributor(request.user)
+                return (resolver.is_contributor(request.user, project_id)
+                        and resolver.is_contributor(request.user, issue.project_id))
+            return resolver.is_contributor(request.user, project_id)
 
         if 'pk' in view.kwargs:
             comment = get_object_or_404(Comment, unique_id=view.kwargs['pk'])
@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.generics import get_object_or_404
 from projects.models import Project
+from projects.memberships import get_resolver
 
 
 class ContributorPermissions(BasePermission):
@@ -15,7 +16,14 @@ class ContributorPermissions(BasePermission):
     """
 
     def has_permission(self, request, view):
-        project = get_object_or_404(Project, id=view.kwargs['project_pk'])
+        project_id = view.kwargs['project_pk']
+        resolver = get_resolver()
         if request.method in SAFE_METHODS:
-            return project.is_contributor(request.user)
-        return project.is_author(request.user)
+            allowed = resolver.is_contributor(request.user, project_id)
+        else:
+            allowed = resolver.is_author(request.user, project_id)
+
+        # A membership implies the project exists: only look it up on refusal.
+        if not allowed:
+            get_object_or_404(Project, id=project_id)
+        return allowed
@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.generics import get_object_or_404
 from projects.models import Project, Issue
+from projects.memberships import get_resolver
 
 
 class IssuePermissions(BasePermission):
@@ -15,15 +16,24 @@ class IssuePermissions(BasePermission):
     """
 
     def has_permission(self, request, view):
-        project = get_object_or_404(Project, id=view.kwargs['project_pk'])
+        project_id = view.kwargs['project_pk']
+        resolver = get_resolver()
+        allowed = False
 
         if request.user and request.user.is_authenticated:
 
             if request.method in SAFE_METHODS:
-                return project.is_contributor(request.user)
+                allowed = resolver.is_contributor(request.user, project_id)
 
-            if request.method == 'POST':
-                return project.is_author(request.user)
+            elif request.method == 'POST':
+                allowed = resolver.is_author(request.user, project_id)
 
-            issue = get_object_or_404(Issue, id=view.kwargs['pk'])
-            return issue.is_author(request.user)
+            else:
+                get_object_or_404(Project, id=project_id)
+                issue = get_object_or_404(Issue, id=view.kwargs['pk'])
+                return issue.is_author(request.user)
+
+        # A membership implies the project exists: only look it up on refusal.
+        if not allowed:
+            get_object_or_404(Project, id=project_id)
+        return allowed
@@ -0,0 +1 @@
+from .cache import ResponseCache, get_response_cache, invalidate_responses
@@ -0,0 +1,95 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+class ResponseCache:
+    """
+    Process-wide cache of serialized responses, keyed by user and URL.
+
+    Each entry records the dependencies it was built from, projects and users,
+    along with the generation of each dependency at that time. A generation is
+    a random token stored under its own key; invalidating a dependency deletes
+    its token, so every entry built from it stops matching and is recomputed
+    on its next read, while the other entries are kept. Generations are read
+    before the response is built, so a change made meanwhile invalidates the
+    entry right away.
+
+    Only get_many(), set(), add() and delete_many() are used, which every Django
+    cache backend implements, locmem and database included.
+
+    Methods:
+        make_key(user_id, url): Return the key of the entry of a user for a URL.
+        aget_generations(dependencies): Return the current generation of each dependency.
+        aget(key): Return the cached data, or None when missing or outdated.
+        aset(key, data, generations): Cache data built from dependencies at the given generations.
+        invalidate(projects, users): Drop the generations of the given dependencies.
+    """
+
+    key_prefix = 'response'
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def make_key(self, user_id, url):
+        digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+        return f'{self.key_prefix}:{user_id}:{digest}'
+
+    def dependency_keys(self, projects=(), users=()):
+        return ([f'{self.key_prefix}-project:{pk}' for pk in projects]
+                + [f'{self.key_prefix}-user:{pk}' for pk in users])
+
+    async def aget_generations(self, keys):
+        generations = await self.cache.aget_many(keys)
+        for key in keys:
+            if key not in generations:
+                token = uuid.uuid4().hex
+                if not await self.cache.aadd(key, token, timeout=None):
+                    token = await self.cache.aget(key)
+                generations[key] = token
+        return generations
+
+    async def aget(self, key):
+        entry = await self.cache.aget(key)
+        if entry is None:
+            return None
+        generations = await self.cache.aget_many(list(entry['generations']))
+        if generations != entry['generations']:
+            return None
+        return entry['data']
+
+    async def aset(self, key, data, generations):
+        await self.cache.aset(key, {'generations': generations, 'data': data})
+
+    def invalidate(self, projects=(), users=()):
+        keys = self.dependency_keys(projects, users)
+        if not keys:
+            return
+        self.cache.delete_many(keys)
+        # A response built from the data of an uncommitted change may have been
+        # cached meanwhile: drop the generations again once the change is visible.
+        transaction.on_commit(lambda: self.cache.delete_many(keys))
+
+
+def get_response_cache():
+    """
+    Return the response cache configured by settings.RESPONSE_CACHE, or None
+    when responses are not cached.
+    """
+    alias = getattr(settings, 'RESPONSE_CACHE', None)
+    if alias is None:
+        return None
+    return ResponseCache(alias)
+
+
+def invalidate_responses(projects=(), users=()):
+    """
+    Drop the cached responses built from the given projects and users. Called
+    by the signals, and explicitly after bulk operations that bypass them.
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(projects, users)
@@ -0,0 +1,71 @@
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from projects.counters.counts import deleted_with
+from projects.models import Project, Contributor, Issue, Comment
+from users.models import User
+from .cache import invalidate_responses
+
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_project(sender, instance, **kwargs):
+    invalidate_responses(projects=[instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Contributor)
+def invalidate_contributor(sender, instance, **kwargs):
+    """
+    A membership change alters the project and the project list of the user.
+    """
+    invalidate_responses(projects=[instance.project_id], users=[instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=Issue)
+def invalidate_issue(sender, instance, **kwargs):
+    invalidate_responses(projects=[instance.project_id])
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_comment(sender, instance, origin=None, **kwargs):
+    """
+    Projects show the comment count of their issues. Comments deleted along
+    with their issue, project or author are covered by the signals of these.
+    """
+    if origin is not None and deleted_with(origin, Project, Issue, User):
+        return
+    if Comment.issue.is_cached(instance):
+        project_id = instance.issue.project_id
+    else:
+        project_id = Issue.objects.filter(pk=instance.issue_id).values_list('project_id', flat=True).first()
+    invalidate_responses(projects=[project_id])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user(sender, instance, created, **kwargs):
+    """
+    Projects show the usernames of their contributors, who are the only users
+    their issues may reference.
+    """
+    projects = []
+    if not created:
+        projects = list(Contributor.objects.filter(user_id=instance.pk).values_list('project_id', flat=True))
+    invalidate_responses(projects=projects, users=[instance.pk])
+
+
+@receiver(pre_delete, sender=User)
+def collect_commented_projects(sender, instance, **kwargs):
+    """
+    Find the projects the comments of a user are deleted from, which the
+    comment signals skip when the user is deleted.
+    """
+    instance.commented_projects = list(Issue.objects.filter(
+        commented_issue__author=instance).values_list('project_id', flat=True).distinct())
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    """
+    Deleting a user cascades to its Contributor rows, which invalidate the
+    projects, and to its comments, whose projects are invalidated here.
+    """
+    invalidate_responses(projects=getattr(instance, 'commented_projects', []), users=[instance.pk])
@@ -0,0 +1,2 @@
+from .index import SearchIndex, issue_index, comment_index
+from .backends import FullTextSearchFilter
@@ -0,0 +1,66 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import filters
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Search filter backed by the FTS5 index declared as `search_index` on the view.
+
+    Each term must match either the index, as a token prefix, or one of the
+    `search_fields` the index does not hold, e.g. the tag or the author
+    username of an issue. Those are matched by lookups an index can answer,
+    never by a LIKE scan: a field with choices matches the values whose value
+    or label starts with the term, any other field matches the term exactly.
+    Matches are ranked by relevance through the `search_rank` annotation. When
+    the view has no index, or the database has no FTS5 table, it falls back to
+    the `icontains` lookups of every field.
+    """
+
+    def get_field(self, model, path):
+        """
+        Return the model field at the end of a search field path, e.g. author__username.
+        """
+        field = None
+        for part in path.split(LOOKUP_SEP):
+            field = model._meta.get_field(part)
+            if field.is_relation:
+                model = field.related_model
+        return field
+
+    def get_condition(self, field_name, field, term):
+        """
+        Return the condition matching the term on a field outside the index, or
+        None when no value of the field can match it.
+        """
+        if field.choices:
+            term = term.lower()
+            values = [value for value, label in field.flatchoices
+                      if str(value).lower().startswith(term) or str(label).lower().startswith(term)]
+            return Q(**{f'{field_name}__in': values}) if values else None
+        try:
+            value = field.to_python(term)
+        except ValidationError:
+            return None
+        return Q(**{field_name: value})
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'search_index', None)
+        terms = self.get_search_terms(request)
+        if not terms or index is None or not index.is_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        search_fields = self.get_search_fields(view, request) or []
+        fields = [(str(field), self.get_field(queryset.model, str(field))) for field in search_fields
+                  if str(field) not in index.columns]
+        for term in terms:
+            condition = index.match([term])
+            for field_name, field in fields:
+                lookup = self.get_condition(field_name, field, term)
+                if lookup is not None:
+                    condition |= lookup
+            queryset = queryset.filter(condition)
+        if self.must_call_distinct(queryset, search_fields):
+            queryset = queryset.distinct()
+        return index.rank(queryset, terms)
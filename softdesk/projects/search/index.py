@@ -0,0 +1,183 @@
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+
+# The tables of each SQLite database, by database name, see projects.search.signals.
+_tables = {}
+
+
+def read_tables(connection, cursor):
+    """
+    Record the tables of the database of an SQLite connection, read with the given cursor.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    _tables[str(connection.settings_dict['NAME'])] = frozenset(row[0] for row in cursor.fetchall())
+
+
+def get_tables(connection):
+    """
+    Return the tables of the database of a connection, as last recorded.
+    """
+    return _tables.get(str(connection.settings_dict['NAME']), frozenset())
+
+
+def to_match_expression(terms, column=None):
+    """
+    Build an FTS5 MATCH expression requiring every term as a token prefix.
+
+    Args:
+        terms (list): The search terms typed by the client.
+        column (str): Restrict the match to this indexed column.
+
+    Returns:
+        str: The MATCH expression, or an empty string when there is nothing to match.
+    """
+    phrases = []
+    for term in terms:
+        term = term.replace('"', '').strip()
+        if term:
+            phrases.append(f'"{term}"*')
+    if not phrases:
+        return ''
+    expression = ' '.join(phrases)
+    if column:
+        expression = f'{column} : ({expression})'
+    return expression
+
+
+class SearchIndex:
+    """
+    An SQLite FTS5 full-text index over some text columns of a model.
+
+    The index table is kept in sync with the model table by SQL triggers, so
+    bulk inserts and cascade deletes are indexed without going through
+    Model.save(). Each index row shares the rowid of the indexed row and stores
+    its primary key in an unindexed `key` column.
+
+    Tables without an INTEGER primary key (e.g. Comment, keyed by UUID) use an
+    implicit rowid that VACUUM may renumber: run `manage.py rebuild_search_index`
+    after a VACUUM.
+
+    Attributes:
+        table (str): The name of the FTS5 table.
+        model_table (str): The name of the indexed model table.
+        key (str): The primary key column of the indexed model table.
+        columns (tuple): The indexed text columns.
+        rank_field (str): The name of the annotation holding the match rank.
+
+    Methods:
+        is_available(using): Checks if the index exists on the database.
+        create_sql(): Return the statements creating the table and its triggers.
+        drop_sql(): Return the statements dropping the table and its triggers.
+        rebuild(using): Repopulate the index from the model table.
+        match(terms, column=None): Return the condition matching rows by the index.
+        rank(queryset, terms): Annotate a queryset with the rank of its matches.
+        search(queryset, terms, column=None): Filter and rank a queryset by the index.
+        filter_column(queryset, column, value): Filter a queryset on one indexed column.
+    """
+    rank_field = 'search_rank'
+
+    def __init__(self, table, model_table, key, columns):
+        self.table = table
+        self.model_table = model_table
+        self.key = key
+        self.columns = tuple(columns)
+
+    def is_available(self, using='default'):
+        # Checked on the event loop by the async views, where no query may run.
+        connection = connections[using]
+        return connection.vendor == 'sqlite' and self.table in get_tables(connection)
+
+    def _insert_sql(self, row):
+        columns = ', '.join(self.columns)
+        values = ', '.join(f'{row}.{column}' for column in self.columns)
+        return (f'INSERT OR REPLACE INTO {self.table}(rowid, key, {columns}) '
+                f'VALUES ({row}.rowid, {row}.{self.key}, {values});')
+
+    def create_sql(self):
+        columns = ', '.join(self.columns)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            f"key UNINDEXED, {columns}, tokenize='unicode61 remove_diacritics 2');",
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_ai AFTER INSERT ON {self.model_table} BEGIN '
+            f'{self._insert_sql("NEW")} END;',
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_ad AFTER DELETE ON {self.model_table} BEGIN '
+            f'DELETE FROM {self.table} WHERE rowid = OLD.rowid; END;',
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_au AFTER UPDATE OF {columns} ON {self.model_table} BEGIN '
+            f'DELETE FROM {self.table} WHERE rowid = OLD.rowid; {self._insert_sql("NEW")} END;',
+        ]
+
+    def drop_sql(self):
+        return [f'DROP TRIGGER IF EXISTS {self.table}_{suffix};' for suffix in ('ai', 'ad', 'au')] + [
+            f'DROP TABLE IF EXISTS {self.table};'
+        ]
+
+    def rebuild(self, using='default'):
+        """
+        Repopulate the index from the model table.
+
+        Returns:
+            int: The number of indexed rows.
+        """
+        columns = ', '.join(self.columns)
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table}(rowid, key, {columns}) '
+                f'SELECT rowid, {self.key}, {columns} FROM {self.model_table}')
+            cursor.execute(f'SELECT COUNT(*) FROM {self.table}')
+            return cursor.fetchone()[0]
+
+    def match(self, terms, column=None):
+        """
+        Return the condition on the primary key matching the rows whose indexed
+        columns hold every term, or an empty condition when there is nothing to match.
+        """
+        expression = to_match_expression(terms, column)
+        if not expression:
+            return Q()
+        return Q(pk__in=RawSQL(f'SELECT key FROM {self.table} WHERE {self.table} MATCH %s', [expression]))
+
+    def rank(self, queryset, terms, column=None):
+        """
+        Annotate the queryset with the BM25 rank (lower is better) of the rows
+        matching every term under `rank_field`, the other rows ranking last.
+        """
+        expression = to_match_expression(terms, column)
+        if not expression:
+            return queryset
+        alias = queryset.query.get_initial_alias()
+        rank = RawSQL(
+            f'SELECT rank FROM {self.table} WHERE {self.table} MATCH %s '
+            f'AND rowid = "{alias}".rowid', [expression], output_field=FloatField())
+        # BM25 ranks are negative.
+        return queryset.annotate(**{self.rank_field: Coalesce(rank, Value(0.0))})
+
+    def search(self, queryset, terms, column=None):
+        """
+        Restrict the queryset to the rows matching every term, annotated with
+        their rank under `rank_field`.
+        """
+        if not to_match_expression(terms, column):
+            return queryset
+        return self.rank(queryset.filter(self.match(terms, column)), terms, column)
+
+    def filter_column(self, queryset, column, value):
+        """
+        django-filter method matching the words of `value` in a single indexed
+        column, falling back to `icontains` when the index is not available.
+        """
+        if not self.is_available(queryset.db):
+            return queryset.filter(**{f'{column}__icontains': value})
+        return self.search(queryset, value.split(), column=column)
+
+
+issue_index = SearchIndex(
+    table='projects_issue_search', model_table='projects_issue', key='id',
+    columns=('title', 'description'))
+
+comment_index = SearchIndex(
+    table='projects_comment_search', model_table='projects_comment', key='unique_id',
+    columns=('description',))
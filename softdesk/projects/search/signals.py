@@ -0,0 +1,35 @@
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .index import read_tables
+
+
+@receiver(connection_created)
+def record_tables(sender, connection, **kwargs):
+    """
+    Record the tables of an SQLite database when a connection opens, so that
+    the indexes know whether their FTS5 table exists without querying.
+
+    The query runs on the raw connection, so that it is neither logged nor
+    counted as a query of the request opening the connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    cursor = connection.connection.cursor()
+    try:
+        read_tables(connection, cursor)
+    finally:
+        cursor.close()
+
+
+@receiver(post_migrate)
+def record_migrated_tables(sender, using='default', **kwargs):
+    """
+    Record the tables again once migrations created or dropped some.
+    """
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            read_tables(connection, cursor)
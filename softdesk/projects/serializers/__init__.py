@@ -1,4 +1,6 @@
 from .project import ProjectSerializer
 from .contributor import ContributorSerializer
+from .bulk_contributor import ContributorBulkSerializer
 from .issue import IssueSerializer
+from .issue_import import IssueImportSerializer
 from .comment import CommentSerializer
@@ -0,0 +1,133 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from projects.counters import adjust
+from projects.models import Project, Contributor
+from projects.memberships import invalidate_membership
+from projects.responses import invalidate_responses
+from users.models import User
+
+
+class UserReferenceField(serializers.Field):
+    """
+    A user given either by id (JSON integer) or by username (JSON string).
+    """
+    default_error_messages = {
+        'invalid': 'Expected a user id or a username.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, int) and not isinstance(data, bool):
+            return data
+        if isinstance(data, str) and data:
+            return data
+        self.fail('invalid')
+
+    def to_representation(self, value):
+        return value
+
+
+class ContributorBulkSerializer(serializers.Serializer):
+    """
+    Serializer adding or removing many contributors of a project at once.
+
+    Fields:
+    - users: The users to add or remove, by id or by username.
+
+    Methods:
+    - add(project_id): Add the users as contributors and return the per-user results.
+    - remove(project_id): Remove the users from the contributors and return the per-user results.
+
+    Each result holds the user reference as sent, the resolved user id and a status:
+    'created', 'deleted', 'already_contributor', 'not_contributor', 'author',
+    'not_found' or 'duplicate'.
+    """
+    max_users = 1000
+    max_attempts = 3
+
+    users = serializers.ListField(child=UserReferenceField(), allow_empty=False, max_length=max_users)
+
+    def resolve_users(self, references):
+        """
+        Map each user reference to a user id with a single query.
+        """
+        ids = [reference for reference in references if isinstance(reference, int)]
+        usernames = [reference for reference in references if isinstance(reference, str)]
+        users = User.objects.filter(Q(id__in=ids) | Q(username__in=usernames)).values_list('id', 'username')
+        by_id, by_username = {}, {}
+        for user_id, username in users:
+            by_id[user_id] = user_id
+            by_username[username] = user_id
+        return {reference: (by_id if isinstance(reference, int) else by_username).get(reference)
+                for reference in references}
+
+    def get_results(self, project_id, decide):
+        """
+        Resolve the users and their current membership, then let `decide(user_id, role)`
+        return the status of each new user.
+        """
+        references = self.validated_data['users']
+        user_ids = self.resolve_users(references)
+        roles = dict(Contributor.objects.filter(
+            project_id=project_id, user_id__in=[user_id for user_id in user_ids.values() if user_id]
+        ).values_list('user_id', 'role'))
+
+        results, seen = [], set()
+        for reference in references:
+            user_id = user_ids[reference]
+            if user_id is None:
+                status = 'not_found'
+            elif user_id in seen:
+                status = 'duplicate'
+            else:
+                status = decide(user_id, roles.get(user_id))
+                seen.add(user_id)
+            results.append({'user': reference, 'user_id': user_id, 'status': status})
+        return results
+
+    def add(self, project_id):
+        def decide(user_id, role):
+            return 'already_contributor' if role else 'created'
+
+        with transaction.atomic():
+            for attempt in range(1, self.max_attempts + 1):
+                results = self.get_results(project_id, decide)
+                created = [result['user_id'] for result in results if result['status'] == 'created']
+                try:
+                    with transaction.atomic():
+                        Contributor.objects.bulk_create([
+                            Contributor(project_id=project_id, user_id=user_id,
+                                        role=Contributor.ContributorRole.CONTRIBUTOR)
+                            for user_id in created
+                        ])
+                    break
+                except IntegrityError:
+                    # Another request added some of the users since their memberships
+                    # were read: read them again, so that only the rows inserted here
+                    # are reported as created and counted.
+                    if attempt == self.max_attempts:
+                        raise
+            adjust(Project, project_id, contributor_count=len(created))
+        # bulk_create does not send post_save: drop the cached refusals and responses ourselves.
+        for user_id in created:
+            invalidate_membership(user_id, project_id)
+        if created:
+            invalidate_responses(projects=[project_id], users=created)
+        return results
+
+    def remove(self, project_id):
+        def decide(user_id, role):
+            if role is None:
+                return 'not_contributor'
+            if role == Contributor.ContributorRole.AUTHOR:
+                return 'author'
+            return 'deleted'
+
+        with transaction.atomic():
+            results = self.get_results(project_id, decide)
+            Contributor.objects.filter(
+                project_id=project_id,
+                user_id__in=[result['user_id'] for result in results if result['status'] == 'deleted']
+            ).delete()
+        return results
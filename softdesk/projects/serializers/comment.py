@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from sofdesk.serializers import SparseFieldsMixin, ValuesSerializerMixin, TimedListSerializer, TimedSerializerMixin
 from projects.models import Comment
 from users.serializers import UserListSerializer
-from django.urls import reverse
+from projects.serializers.fields import NestedHyperlinkField
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, ValuesSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing comments.
 
@@ -17,22 +18,16 @@ class CommentSerializer(serializers.ModelSerializer):
 
     """
     author_details = UserListSerializer(source='author', read_only=True)
-    issue_url = serializers.SerializerMethodField()
+    issue_url = NestedHyperlinkField(
+        'projects:project-issue-detail', attributes={'pk': 'issue_id'}, view_kwargs=('project_pk',))
 
     class Meta:
         model = Comment
+        list_serializer_class = TimedListSerializer
         fields = ("unique_id", "description", 'author',
                   'author_details', 'issue', 'issue_url')
+        expandable_fields = ('author_details', 'issue_url')
         extra_kwargs = {
             'issue': {'write_only': True},
             'author': {'write_only': True}
         }
-
-    def get_issue_url(self, obj):
-        request = self.context.get('request')
-        project_pk = self.context.get('view').kwargs.get('project_pk')
-
-        # Construct the URL based on the view name and parameters
-        url = request.build_absolute_uri(reverse(
-            'projects:project-issue-detail', kwargs={'project_pk': project_pk, 'pk': obj.issue.id}))
-        return url
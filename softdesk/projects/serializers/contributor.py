@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from sofdesk.serializers import SparseFieldsMixin, ValuesSerializerMixin, TimedListSerializer, TimedSerializerMixin
 from projects.models import Contributor
 from users.serializers import UserListSerializer
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(SparseFieldsMixin, ValuesSerializerMixin, TimedSerializerMixin,
+                            serializers.ModelSerializer):
     """
     Serializer for the Contributor model.
 
@@ -19,7 +21,9 @@ class ContributorSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Contributor
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'role', 'user', 'user_details', 'project']
+        expandable_fields = ['user_details']
 
         extra_kwargs = {
             'project': {'write_only': True},
@@ -0,0 +1,122 @@
+import uuid
+from functools import lru_cache
+
+from django.urls import reverse, get_script_prefix, get_urlconf
+from rest_framework import serializers
+
+
+class RouteTemplate:
+    """
+    A named route resolved once and filled with ids by plain string formatting.
+
+    The route is reversed a single time with sentinel values, which are then
+    replaced by `{kwarg}` placeholders. Filling the template afterwards costs
+    a str.format() call instead of a URL resolution.
+
+    Args:
+    - viewname (str): The namespaced name of the route.
+    - converters: The type of the route kwargs that are not integers (e.g. pk=uuid.UUID).
+
+    Methods:
+    - path(): Return the template of the route path.
+    - format(**kwargs): Return the path of the route for the given kwargs.
+    """
+    sentinel_base = 987654000
+
+    def __init__(self, viewname, kwargs, **converters):
+        self.viewname = viewname
+        self.kwargs = tuple(kwargs)
+        self.converters = converters
+        self._paths = {}
+
+    def sentinel(self, index, kwarg):
+        if self.converters.get(kwarg) is uuid.UUID:
+            return uuid.UUID(int=self.sentinel_base + index)
+        return self.sentinel_base + index
+
+    def path(self):
+        key = (get_script_prefix(), get_urlconf())
+        if key not in self._paths:
+            sentinels = {kwarg: self.sentinel(index, kwarg) for index, kwarg in enumerate(self.kwargs)}
+            path = reverse(self.viewname, kwargs=sentinels).replace('{', '{{').replace('}', '}}')
+            for kwarg, sentinel in sentinels.items():
+                path = path.replace(str(sentinel), f'{{{kwarg}}}')
+            self._paths[key] = path
+        return self._paths[key]
+
+    def format(self, **kwargs):
+        return self.path().format(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_route_template(viewname, kwargs, converters=()):
+    """
+    Return the RouteTemplate shared by every field pointing to the same route.
+
+    Serializer fields are re-instantiated for every serializer, so templates are
+    kept here to be resolved once per process.
+    """
+    return RouteTemplate(viewname, kwargs, **dict(converters))
+
+
+class NestedHyperlinkField(serializers.Field):
+    """
+    Read-only field rendering the absolute URL of a nested route.
+
+    The ids are read from attributes of the serialized object, typically
+    foreign-key columns such as `issue_id` that do not load the related row,
+    or from the kwargs of the current view. The request origin is computed once
+    per serialization and shared by every row.
+
+    Args:
+    - viewname (str): The namespaced name of the route.
+    - attributes (dict): Route kwargs filled from attributes of the object.
+    - view_kwargs (tuple): Route kwargs filled from the kwargs of the view.
+    - converters: The type of the route kwargs that are not integers.
+
+    Methods:
+    - represent_values(values): Return the URL for the given attribute values, see ValuesRepresentation.
+    """
+
+    def __init__(self, viewname, attributes=None, view_kwargs=(), converters=None, **kwargs):
+        kwargs['read_only'] = True
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+        self.attributes = attributes or {}
+        self.view_kwargs = tuple(view_kwargs)
+        self.route = get_route_template(
+            viewname, (*self.view_kwargs, *self.attributes), tuple(sorted((converters or {}).items())))
+        self._template = None
+
+    def get_origin(self):
+        request = self.context.get('request')
+        if request is None:
+            return ''
+        if '_request_origin' not in self.context:
+            self.context['_request_origin'] = request.build_absolute_uri('/')[:-1]
+        return self.context['_request_origin']
+
+    def get_template(self):
+        """
+        Return the URL template, origin included, resolved once per serialization
+        since the field is shared by every row of a list.
+        """
+        if self._template is None:
+            self._template = self.get_origin().replace('{', '{{').replace('}', '}}') + self.route.path()
+        return self._template
+
+    @property
+    def values_attributes(self):
+        return tuple(self.attributes.values())
+
+    def represent_values(self, values):
+        """
+        Return the URL for the values of the attributes of the object, by attribute name.
+        """
+        view = self.context.get('view')
+        kwargs = {kwarg: view.kwargs.get(kwarg) for kwarg in self.view_kwargs}
+        kwargs.update({kwarg: values[attribute] for kwarg, attribute in self.attributes.items()})
+        return self.get_template().format(**kwargs)
+
+    def to_representation(self, obj):
+        return self.represent_values({attribute: getattr(obj, attribute) for attribute in self.values_attributes})
@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from sofdesk.serializers import SparseFieldsMixin, ValuesSerializerMixin, TimedListSerializer, TimedSerializerMixin
 from projects.models import Issue
 from users.serializers import UserListSerializer
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(SparseFieldsMixin, ValuesSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Issue model.
 
@@ -19,6 +20,7 @@ class IssueSerializer(serializers.ModelSerializer):
     - assigned: The user assigned to the issue.
     - author_details: Serialized author details (read-only).
     - assigned_details: Serialized details of the assigned user (read-only).
+    - comment_count: The number of comments on the issue (read-only).
 
     """
     author_details = UserListSerializer(source='author', read_only=True)
@@ -26,9 +28,11 @@ class IssueSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Issue
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'tag', 'status', 'priority', 'title', 'description',
-                  'project', 'author', 'assigned', 'author_details', 'assigned_details'
-                  ]
+                  'project', 'author', 'assigned', 'author_details', 'assigned_details',
+                  'comment_count']
+        expandable_fields = ['author_details', 'assigned_details']
 
         extra_kwargs = {
             'project': {'write_only': True},
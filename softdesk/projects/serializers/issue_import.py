@@ -0,0 +1,95 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from projects.counters import adjust
+from projects.models import Project, Contributor, Issue
+from projects.responses import invalidate_responses
+
+
+class IssueRowSerializer(serializers.Serializer):
+    """
+    Serializer validating one imported issue without touching the database.
+
+    Fields:
+    - tag, status, priority, title, description: As on the Issue model.
+    - author: The id of the author, defaults to the importing user.
+    - assigned: The id of the assigned user, defaults to the author.
+
+    """
+    tag = serializers.ChoiceField(choices=Issue.IssueTag.choices)
+    status = serializers.ChoiceField(choices=Issue.IssueStatus.choices, default=Issue.IssueStatus.TODO)
+    priority = serializers.ChoiceField(choices=Issue.IssuePriority.choices)
+    title = serializers.CharField(max_length=50)
+    description = serializers.CharField(max_length=500, allow_blank=True, default='')
+    author = serializers.IntegerField(required=False)
+    assigned = serializers.IntegerField(required=False)
+
+
+class IssueImportSerializer(serializers.Serializer):
+    """
+    Serializer importing a batch of issues into a project.
+
+    The project's contributors are loaded once; every row is then validated in
+    memory and the valid rows are inserted with bulk_create in chunks, so that
+    an invalid row never prevents the others from being imported.
+
+    Fields:
+    - issues: The rows to import, as sent in a JSON array or an NDJSON body.
+
+    Methods:
+    - import_rows(project_id, default_author_id): Insert the valid rows and return the per-row results.
+
+    Each result holds the index of the row and either the id of the created
+    issue or the validation errors of the row.
+    """
+    max_rows = 10000
+    batch_size = 500
+
+    issues = serializers.ListField(
+        child=serializers.JSONField(allow_null=True), allow_empty=False, max_length=max_rows)
+
+    def validate_rows(self, contributors, default_author_id):
+        """
+        Split the rows into issues to create and errors, keyed by row index.
+        """
+        issues, errors = {}, {}
+        for index, row in enumerate(self.validated_data['issues']):
+            if not isinstance(row, dict):
+                errors[index] = {'non_field_errors': ['Expected a JSON object.']}
+                continue
+            serializer = IssueRowSerializer(data=row)
+            if not serializer.is_valid():
+                errors[index] = serializer.errors
+                continue
+            data = dict(serializer.validated_data)
+            data.setdefault('author', default_author_id)
+            data.setdefault('assigned', data['author'])
+            row_errors = {
+                field: ["'{}' must be a contributor in the project.".format(field.capitalize())]
+                for field in ('author', 'assigned') if data[field] not in contributors
+            }
+            if row_errors:
+                errors[index] = row_errors
+                continue
+            issues[index] = Issue(
+                tag=data['tag'], status=data['status'], priority=data['priority'], title=data['title'],
+                description=data['description'], author_id=data['author'], assigned_id=data['assigned'])
+        return issues, errors
+
+    def import_rows(self, project_id, default_author_id):
+        contributors = set(Contributor.objects.filter(project_id=project_id).values_list('user_id', flat=True))
+        issues, errors = self.validate_rows(contributors, default_author_id)
+        for issue in issues.values():
+            issue.project_id = project_id
+
+        with transaction.atomic():
+            Issue.objects.bulk_create(issues.values(), batch_size=self.batch_size)
+            # bulk_create does not send post_save.
+            adjust(Project, project_id, issue_count=len(issues),
+                   open_issue_count=sum(1 for issue in issues.values() if issue.is_open))
+        if issues:
+            invalidate_responses(projects=[project_id])
+
+        results = [{'row': index, 'id': issue.id} for index, issue in issues.items()]
+        results += [{'row': index, 'errors': row_errors} for index, row_errors in errors.items()]
+        return sorted(results, key=lambda result: result['row'])
@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from sofdesk.serializers import SparseFieldsMixin, TimedListSerializer, TimedSerializerMixin
 from projects.models import Project, Contributor
 from projects.serializers.issue import IssueSerializer
 from projects.serializers.contributor import ContributorSerializer
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing projects.
 
@@ -14,8 +15,12 @@ class ProjectSerializer(serializers.ModelSerializer):
     - description: The description of the project.
     - contributors: Serialized contributors associated with the project (read-only, many).
     - issues: Serialized issues associated with the project (read-only, many).
+    - issue_count, open_issue_count, contributor_count: The counters of the project (read-only).
     - user_id: The user ID associated with the project (write-only).
 
+    The issues and contributors are only rendered on demand once `fields` or
+    `expand` is given, see SparseFieldsMixin.
+
     """
     issues = IssueSerializer(source='project_issues',
                              read_only=True, many=True)
@@ -25,8 +30,11 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'type', 'title', 'description',
-                  'created_time', 'contributors', 'issues', 'user_id']
+                  'created_time', 'issue_count', 'open_issue_count', 'contributor_count',
+                  'contributors', 'issues', 'user_id']
+        expandable_fields = ['contributors', 'issues']
 
     def create(self, validated_data):
         """
@@ -37,4 +45,5 @@ class ProjectSerializer(serializers.ModelSerializer):
         contributor_data = {"role": "AUTHOR",
                             "project": project, "user_id": user_id}
         Contributor.objects.create(**contributor_data)
+        project.refresh_from_db(fields=['contributor_count'])
         return project
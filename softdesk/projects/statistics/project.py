@@ -0,0 +1,62 @@
+from django.db.models import Count, F
+
+from projects.models import Issue
+
+
+class ProjectStatistics:
+    """
+    Count the issues of projects by status, priority, tag and assignee.
+
+    Every count comes from a single GROUP BY query over the issues, grouped by
+    project, status, priority, tag and assignee; the few resulting rows are
+    summed up per dimension in Python. Every status, priority and tag appears
+    in the statistics, with a zero count when no issue has it.
+
+    Methods:
+    - rows(): Return the grouped counts queryset.
+    - collect(): Return the statistics of each project, in the order of project_ids.
+    - acollect(): Same as collect(), with the async ORM.
+    """
+
+    dimensions = {
+        'status': Issue.IssueStatus,
+        'priority': Issue.IssuePriority,
+        'tag': Issue.IssueTag,
+    }
+
+    def __init__(self, project_ids):
+        self.project_ids = list(project_ids)
+
+    def rows(self):
+        return Issue.objects.filter(project_id__in=self.project_ids).order_by().values(
+            'project_id', *self.dimensions, 'assigned_id', assigned_username=F('assigned__username'),
+        ).annotate(count=Count('id'))
+
+    def empty(self, project_id):
+        statistics = {'project': project_id, 'issues': 0}
+        for name, choices in self.dimensions.items():
+            statistics[name] = dict.fromkeys(choices.values, 0)
+        statistics['assignees'] = {}
+        return statistics
+
+    def fold(self, rows):
+        projects = {project_id: self.empty(project_id) for project_id in self.project_ids}
+        for row in rows:
+            statistics = projects[row['project_id']]
+            statistics['issues'] += row['count']
+            for name in self.dimensions:
+                statistics[name][row[name]] = statistics[name].get(row[name], 0) + row['count']
+            assignee = statistics['assignees'].setdefault(
+                row['assigned_id'], {'id': row['assigned_id'], 'username': row['assigned_username'], 'issues': 0})
+            assignee['issues'] += row['count']
+
+        for statistics in projects.values():
+            statistics['assignees'] = sorted(
+                statistics['assignees'].values(), key=lambda assignee: (-assignee['issues'], assignee['id'] or 0))
+        return list(projects.values())
+
+    def collect(self):
+        return self.fold(self.rows())
+
+    async def acollect(self):
+        return self.fold([row async for row in self.rows()])
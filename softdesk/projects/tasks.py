@@ -0,0 +1,66 @@
+from collections import Counter
+
+from django.db import transaction
+
+from jobs.queue import register, write_result
+from projects.counters import recount
+from projects.exports import ProjectExport
+from projects.models import Project, Issue
+
+
+@register('projects.delete_project', concurrency=1)
+def delete_project(job):
+    """
+    Delete a project: its issues and their comments by batches, then its contributors and itself.
+
+    Each batch deletes `batch_size` issues and their comments in a transaction
+    of its own, so that the write lock is released between batches and the
+    collector holds a bounded number of rows in memory. The transactions take
+    the write lock first, see settings.DATABASES. An attempt failing halfway is
+    resumed by the next one.
+
+    Returns:
+        dict: The number of deleted rows, by model label.
+    """
+    project_id = job.payload['project_id']
+    batch_size = job.payload.get('batch_size', 100)
+    deleted = Counter()
+    while True:
+        with transaction.atomic():
+            ids = list(Issue.objects.filter(project_id=project_id).order_by('pk').values_list(
+                'pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted.update(Issue.objects.filter(pk__in=ids).delete()[1])
+    with transaction.atomic():
+        deleted.update(Project.objects.filter(pk=project_id).delete()[1])
+    return dict(deleted)
+
+
+@register('projects.export_project', concurrency=2)
+def export_project(job):
+    """
+    Write the export of a project to the results directory, see ProjectExport.
+
+    Returns:
+        dict: The name of the file, the name to download it as and its content type.
+    """
+    project_id = job.payload['project_id']
+    export_format = job.payload.get('format', 'ndjson')
+    name = write_result(job, export_format, ProjectExport(project_id).lines(export_format))
+    return {
+        'file': name,
+        'filename': f'project-{project_id}.{export_format}',
+        'content_type': ProjectExport.formats[export_format],
+    }
+
+
+@register('projects.recount', concurrency=1)
+def recount_counters(job):
+    """
+    Recompute the drifted counters, of one project when the payload has a `project_id`.
+
+    Returns:
+        dict: The number of repaired rows, by model label.
+    """
+    return recount(job.payload.get('batch_size', 1000), project_id=job.payload.get('project_id'))
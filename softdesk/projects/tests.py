@@ -1,3 +1,1546 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import tempfile
+import uuid
+from datetime import date
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jobs.models import Job
+from jobs.queue import enqueue
+from users.models import User
+from users.tokens import FilteredRefreshToken, get_blacklist_filter
+from projects.models import Project, Contributor, Issue, Comment
+from projects.counters import recount
+from projects.memberships import MembershipCache, MembershipMiddleware, MembershipResolver, get_resolver
+from projects.memberships.cache import MISSING
+from projects.serializers import ContributorBulkSerializer, ProjectSerializer
+from projects.search import issue_index
+from projects.serializers.fields import RouteTemplate
+from projects.tasks import export_project
+from projects.views.mixins import AsyncReadMixin
+from sofdesk.checks import DESCRIBED_PRAGMAS, check_profile
+from sofdesk.database import apply_pragmas, read_pragmas
+from sofdesk.environment import Environment, cache_settings
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SoftDeskTestCase(TestCase):
+    """
+    Base test case providing an authenticated author and fixture helpers.
+    """
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['memberships'].clear()
+        caches['responses'].clear()
+        self.author = self.create_user('author')
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        self.project = self.create_project(self.author)
+
+    def create_user(self, username):
+        return User.objects.create_user(
+            username=username, password='password', email=f'{username}@softdesk.io',
+            date_of_birth=date(1990, 1, 1))
+
+    def create_project(self, author):
+        project = Project.objects.create(
+            type=Project.ProjectType.BACK_END, title='Project', description='Description')
+        Contributor.objects.create(
+            user=author, project=project, role=Contributor.ContributorRole.AUTHOR)
+        return project
+
+    def grow(self, project, size):
+        """
+        Add `size` contributors to the project, each one authoring an issue.
+        """
+        offset = Contributor.objects.count()
+        for index in range(size):
+            user = self.create_user(f'user{offset + index}')
+            Contributor.objects.create(user=user, project=project)
+            Issue.objects.create(
+                tag=Issue.IssueTag.BUG, priority=Issue.IssuePriority.LOW, title='Issue',
+                description='Description', project=project, author=user, assigned=self.author)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def membership_queries(self, context):
+        prefix = 'SELECT "projects_contributor"."project_id", "projects_contributor"."role"'
+        return [query['sql'] for query in context.captured_queries if query['sql'].startswith(prefix)]
+
+
+class ProjectQueryCountTests(SoftDeskTestCase):
+    """
+    Query budget of the project list and detail endpoints.
+
+    The number of queries must not depend on how many issues, contributors and
+    users are attached to the projects of a page.
+    """
+
+    def test_list_query_count_is_constant(self):
+        url = reverse('projects:project-list')
+        self.grow(self.project, 1)
+        baseline = self.count_queries(url)
+
+        for _ in range(3):
+            self.grow(self.create_project(self.author), 5)
+        self.grow(self.project, 10)
+        self.assertEqual(self.count_queries(url), baseline)
+
+    def test_list_query_budget(self):
+        self.grow(self.project, 5)
+        with self.assertNumQueries(6):
+            # versions, memberships, count, projects page, issues with users, contributors with users
+            response = self.client.get(reverse('projects:project-list'))
+        self.assertEqual(len(response.data['results'][0]['issues']), 5)
+        self.assertEqual(len(response.data['results'][0]['contributors']), 6)
+
+    def test_retrieve_query_count_is_constant(self):
+        url = reverse('projects:project-detail', kwargs={'pk': self.project.pk})
+        self.grow(self.project, 1)
+        baseline = self.count_queries(url)
+
+        self.grow(self.project, 10)
+        self.assertEqual(self.count_queries(url), baseline)
+
+
+class MembershipResolverTests(SoftDeskTestCase):
+    """
+    Membership checks load the requesting user's roles once per request.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 2)
+        self.issue = Issue.objects.filter(project=self.project).first()
+
+    def test_issue_list_runs_one_membership_query(self):
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        self.assertLessEqual(len(self.membership_queries(context)), 1)
+
+    def test_comment_create_runs_one_membership_query(self):
+        url = reverse('projects:comment-list-create', kwargs={
+            'project_pk': self.project.pk, 'issue_pk': self.issue.pk})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, {'description': 'Comment'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertLessEqual(len(self.membership_queries(context)), 1)
+
+    def test_refused_membership_keeps_not_found(self):
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk + 100})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_outsider_is_refused(self):
+        outsider = self.create_user('outsider')
+        self.client.force_authenticate(outsider)
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    async def test_async_request_shares_one_resolver(self):
+        resolvers = []
+
+        async def get_response(request):
+            resolvers.extend([get_resolver(), get_resolver()])
+            return HttpResponse()
+
+        middleware = MembershipMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(RequestFactory().get('/'))
+        self.assertIs(resolvers[0], resolvers[1])
+        self.assertIsNot(get_resolver(), resolvers[0])
+
+
+class MembershipCacheTests(SoftDeskTestCase):
+    """
+    Memberships are cached across requests and invalidated by signals.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+
+    def membership_queries_of(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, self.membership_queries(context)
+
+    def test_polling_hits_the_cache(self):
+        self.client.get(self.url)
+        response, queries = self.membership_queries_of(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+    def test_removed_contributor_is_refused(self):
+        user = self.create_user('member')
+        contributor = Contributor.objects.create(user=user, project=self.project)
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        contributor.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_added_contributor_is_accepted(self):
+        user = self.create_user('member')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        Contributor.objects.create(user=user, project=self.project)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_contributor_added_while_refusal_is_read(self):
+        user = self.create_user('member')
+        resolver = MembershipResolver()
+        set_many = resolver.cache.set_many
+
+        def add_then_set_many(user_id, roles, generation):
+            # The contributor is added after the memberships were read, before they are cached.
+            if not Contributor.objects.filter(user=user).exists():
+                Contributor.objects.create(user=user, project=self.project)
+            set_many(user_id, roles, generation)
+
+        with mock.patch.object(resolver.cache, 'set_many', add_then_set_many):
+            self.assertFalse(resolver.is_contributor(user, self.project.pk))
+        self.assertIs(resolver.cache.get(user.pk, self.project.pk), MISSING)
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_project_cascade_invalidates(self):
+        self.client.get(self.url)
+        cache = MembershipCache('memberships')
+        project_id = self.project.pk
+        self.assertEqual(cache.get(self.author.pk, project_id), 'AUTHOR')
+
+        self.project.delete()
+        self.assertIs(cache.get(self.author.pk, project_id), MISSING)
+
+    def test_user_cascade_invalidates(self):
+        self.client.get(self.url)
+        cache = MembershipCache('memberships')
+        author_id = self.author.pk
+
+        self.author.delete()
+        self.assertIs(cache.get(author_id, self.project.pk), MISSING)
+
+
+class CursorPaginationTests(SoftDeskTestCase):
+    """
+    Issue lists are paginated with a cursor and count only on request.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 25)
+        self.url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+
+    def test_walks_every_issue_once(self):
+        ids, url = [], self.url
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(set(response.data), {'message', 'next', 'previous', 'results'})
+            ids += [issue['id'] for issue in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(ids, sorted(Issue.objects.values_list('id', flat=True)))
+
+    def test_count_only_on_request(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+        self.assertFalse([query for query in context.captured_queries if 'COUNT(' in query['sql']])
+
+        response = self.client.get(self.url, {'count': 'true'})
+        self.assertEqual(response.data['count'], 25)
+
+
+class FullTextSearchTests(SoftDeskTestCase):
+    """
+    Issue and comment search go through the FTS5 index.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        self.login = self.create_issue('Login button', 'The login button is broken on login page')
+        self.logout = self.create_issue('Logout', 'Clicking logout keeps the session, login again')
+        self.other = self.create_issue('Dashboard', 'Charts are slow')
+
+    def create_issue(self, title, description):
+        return Issue.objects.create(
+            tag=Issue.IssueTag.BUG, priority=Issue.IssuePriority.LOW, title=title,
+            description=description, project=self.project, author=self.author, assigned=self.author)
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [issue['id'] for issue in response.data['results']]
+
+    def test_search_is_ranked(self):
+        self.assertEqual(self.search(search='login'), [self.login.id, self.logout.id])
+
+    def test_search_matches_prefixes_of_every_term(self):
+        self.assertEqual(self.search(search='dash slo'), [self.other.id])
+        self.assertEqual(self.search(search='dash login'), [])
+
+    def test_title_filter_ignores_description(self):
+        self.assertEqual(self.search(title='login'), [self.login.id])
+        self.assertEqual(self.search(title='login', search='page'), [self.login.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other.title = 'Login stats'
+        self.other.save()
+        self.assertIn(self.other.id, self.search(title='login'))
+
+        self.login.delete()
+        self.assertNotIn(self.login.id, self.search(search='login'))
+
+    def test_search_fields_outside_the_index(self):
+        Issue.objects.filter(pk=self.other.pk).update(tag=Issue.IssueTag.FEATURE)
+        self.assertEqual(self.search(search='feature'), [self.other.id])
+        self.assertEqual(self.search(search='feat'), [self.other.id])
+        self.assertEqual(self.search(search='bug'), [self.login.id, self.logout.id])
+
+        member = self.create_user('reviewer')
+        Contributor.objects.create(user=member, project=self.project)
+        Issue.objects.filter(pk=self.logout.pk).update(author=member)
+        self.assertEqual(self.search(search='reviewer'), [self.logout.id])
+        # Usernames match exactly.
+        self.assertEqual(self.search(search='review'), [])
+        # Terms may match the index and the other fields together, ranked matches first.
+        self.assertEqual(self.search(search='reviewer login'), [self.logout.id])
+        self.assertEqual(self.search(search='login'), [self.login.id, self.logout.id])
+
+    def test_missing_index_falls_back_to_lookups(self):
+        with mock.patch.object(issue_index, 'table', 'projects_missing_search'):
+            self.assertFalse(issue_index.is_available())
+            # The fallback searches the titles only.
+            self.assertEqual(self.search(search='login'), [self.login.id])
+
+    def test_comment_search(self):
+        comment = Comment.objects.create(
+            description='Reproduced on Firefox', issue=self.login, author=self.author)
+        Comment.objects.create(description='Works for me', issue=self.login, author=self.author)
+        url = reverse('projects:comments-list', kwargs={'project_pk': self.project.pk})
+        response = self.client.get(url, {'search': 'firefox'})
+        self.assertEqual([item['unique_id'] for item in response.data['results']], [str(comment.unique_id)])
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM projects_issue_search')
+        self.assertEqual(self.search(search='login'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search(search='login'), [self.login.id, self.logout.id])
+
+
+class QueryPlanTests(SoftDeskTestCase):
+    """
+    Every query run by the read endpoints must be answered from an index.
+
+    The plan of each query is captured with EXPLAIN QUERY PLAN; a `SCAN` of a
+    regular table (as opposed to a `SEARCH` or a scan of a full-text virtual
+    table) means the query degraded to reading the whole table.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 3)
+        self.issue = Issue.objects.filter(project=self.project).first()
+        self.comment = Comment.objects.create(
+            description='Comment', issue=self.issue, author=self.author)
+
+    def endpoints(self):
+        project = {'project_pk': self.project.pk}
+        issue = {'project_pk': self.project.pk, 'issue_pk': self.issue.pk}
+        return [
+            (reverse('projects:project-list'), {}),
+            (reverse('projects:project-list'), {'title': 'Project', 'search': 'Back'}),
+            (reverse('projects:project-detail', kwargs={'pk': self.project.pk}), {}),
+            (reverse('projects:project-contributors', kwargs=project), {}),
+            (reverse('projects:project-issues', kwargs=project), {}),
+            (reverse('projects:project-issues', kwargs=project), {'status': 'TODO', 'priority': 'LOW'}),
+            (reverse('projects:project-issues', kwargs=project), {'search': 'issue', 'title': 'issue'}),
+            (reverse('projects:project-issue-detail', kwargs={**project, 'pk': self.issue.pk}), {}),
+            (reverse('projects:comment-list-create', kwargs=issue), {}),
+            (reverse('projects:comment-list-create', kwargs=issue), {'search': 'comment'}),
+            (reverse('projects:comment-get-update-destroy', kwargs={**issue, 'pk': self.comment.pk}), {}),
+            (reverse('projects:comments-list', kwargs=project), {}),
+            (reverse('users:user-profile'), {}),
+        ]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def is_table_scan(self, step):
+        return (step.startswith('SCAN ') and 'VIRTUAL TABLE' not in step
+                and step != 'SCAN CONSTANT ROW')
+
+    def test_no_table_scan(self):
+        for url, params in self.endpoints():
+            with self.subTest(url=url, params=params):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                for query in context.captured_queries:
+                    plan = self.explain(query['sql'])
+                    scans = [step for step in plan if self.is_table_scan(step)]
+                    self.assertFalse(scans, f"{query['sql']}\n{plan}")
+
+    def test_issue_filters_use_composite_index(self):
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'status': 'TODO', 'priority': 'LOW'})
+        self.assertEqual(response.status_code, 200)
+        [sql] = [query['sql'] for query in context.captured_queries
+                 if query['sql'].startswith('SELECT') and '"projects_issue"."priority" =' in query['sql']]
+        plan = ' '.join(self.explain(sql))
+        self.assertIn('issue_project_status_idx (project_id=? AND status=? AND priority=?)', plan)
+
+        self.assertEqual(self.client.get(url, {'status': 'todo'}).status_code, 400)
+
+    def test_search_runs_no_like_scan(self):
+        Issue.objects.filter(pk=self.issue.pk).update(tag=Issue.IssueTag.FEATURE)
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'search': f'feat {self.author.username}'})
+        self.assertEqual([issue['id'] for issue in response.data['results']], [self.issue.id])
+        [sql] = [query['sql'] for query in context.captured_queries
+                 if query['sql'].startswith('SELECT') and 'MATCH' in query['sql']]
+        self.assertNotIn(' LIKE ', sql)
+        plan = self.explain(sql)
+        self.assertFalse([step for step in plan if self.is_table_scan(step)], plan)
+        self.assertFalse([step for step in plan if 'users_user' in step and 'PRIMARY KEY' not in step], plan)
+
+    def test_predicates_use_composite_indexes(self):
+        plans = {
+            'comment_issue_created_idx': Comment.objects.filter(
+                issue=self.issue).order_by('created_time'),
+            'contributor_project_role_idx': Contributor.objects.filter(
+                project=self.project).order_by('role'),
+        }
+        for index, queryset in plans.items():
+            with self.subTest(index=index):
+                sql, params = queryset.query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                    plan = ' '.join(row[-1] for row in cursor.fetchall())
+                self.assertIn(index, plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+
+class BulkContributorTests(SoftDeskTestCase):
+    """
+    Contributors can be added and removed in bulk by id or username.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('projects:project-contributors', kwargs={'project_pk': self.project.pk})
+        self.users = [self.create_user(f'member{index}') for index in range(20)]
+
+    def test_bulk_add(self):
+        Contributor.objects.create(user=self.users[0], project=self.project)
+        payload = {'users': [user.id for user in self.users[:10]] + ['member10', 'ghost', self.users[1].id]}
+        with self.assertNumQueries(9):
+            # permission, savepoint, users, memberships, savepoint, insert, release, counter, release
+            response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        statuses = [result['status'] for result in response.data['data']]
+        self.assertEqual(statuses, ['already_contributor'] + ['created'] * 10 + ['not_found', 'duplicate'])
+        self.assertEqual(Contributor.objects.filter(project=self.project).count(), 12)
+
+    def test_bulk_add_concurrent_contributor(self):
+        get_results = ContributorBulkSerializer.get_results
+
+        def add_concurrently(serializer, project_id, decide):
+            results = get_results(serializer, project_id, decide)
+            if not Contributor.objects.filter(user=self.users[1]).exists():
+                Contributor.objects.create(user=self.users[1], project=self.project)
+            return results
+
+        with mock.patch.object(ContributorBulkSerializer, 'get_results', add_concurrently):
+            response = self.client.post(self.url, {'users': ['member0', 'member1']}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        statuses = [result['status'] for result in response.data['data']]
+        self.assertEqual(statuses, ['created', 'already_contributor'])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.contributor_count, 3)
+
+    def test_added_users_can_read(self):
+        self.client.force_authenticate(self.users[0])
+        issues = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        self.assertEqual(self.client.get(issues).status_code, 403)
+
+        self.client.force_authenticate(self.author)
+        self.client.post(self.url, {'users': ['member0']}, format='json')
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(self.client.get(issues).status_code, 200)
+
+    def test_bulk_remove(self):
+        Contributor.objects.create(user=self.users[0], project=self.project)
+        payload = {'users': [self.users[0].id, self.users[1].id, 'author']}
+        response = self.client.delete(self.url, payload, format='json')
+
+        statuses = [result['status'] for result in response.data['data']]
+        self.assertEqual(statuses, ['deleted', 'not_contributor', 'author'])
+        self.assertFalse(Contributor.objects.filter(project=self.project, user=self.users[0]).exists())
+
+    def test_only_author_can_manage(self):
+        Contributor.objects.create(user=self.users[0], project=self.project)
+        self.client.force_authenticate(self.users[0])
+        response = self.client.post(self.url, {'users': ['member1']}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_payload(self):
+        response = self.client.post(self.url, {'users': [True]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_add_and_remove_one_by_user_id(self):
+        url = reverse('projects:project-contributor-detail', kwargs={
+            'project_pk': self.project.pk, 'pk': self.users[5].pk})
+        self.assertEqual(self.client.post(url).status_code, 201)
+        contributor = Contributor.objects.get(project=self.project, user=self.users[5])
+        self.assertNotEqual(contributor.pk, self.users[5].pk)
+
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(Contributor.objects.filter(pk=contributor.pk).exists())
+
+
+class IssueImportTests(SoftDeskTestCase):
+    """
+    Issues are imported in batches with per-row errors.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('projects:project-issues-import', kwargs={'project_pk': self.project.pk})
+        self.member = self.create_user('member')
+        Contributor.objects.create(user=self.member, project=self.project)
+        self.outsider = self.create_user('outsider')
+
+    def row(self, **fields):
+        return {'tag': 'BUG', 'priority': 'LOW', 'title': 'Imported', 'description': 'Description', **fields}
+
+    def test_json_array(self):
+        rows = [self.row(assigned=self.member.id) for _ in range(50)]
+        rows += [self.row(tag='UNKNOWN'), self.row(assigned=self.outsider.id), 'not an object']
+        with self.assertNumQueries(6):
+            # permission, contributors, savepoint, insert, counters, release
+            response = self.client.post(self.url, rows, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        results = response.data['data']
+        self.assertEqual(len([result for result in results if 'id' in result]), 50)
+        self.assertEqual([result['row'] for result in results if 'errors' in result], [50, 51, 52])
+        self.assertIn('assigned', results[51]['errors'])
+        self.assertEqual(Issue.objects.filter(project=self.project, assigned=self.member).count(), 50)
+
+    def test_ndjson(self):
+        body = '\n'.join([json.dumps(self.row()), '{broken', '', json.dumps(self.row(status='FINISHED'))])
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(['id' in result for result in response.data['data']], [True, False, True])
+        self.assertEqual(Issue.objects.filter(status='FINISHED', author=self.author).count(), 1)
+
+    def test_all_rows_invalid(self):
+        response = self.client.post(self.url, [self.row(author=self.outsider.id)], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Issue.objects.exists())
+
+    def test_only_author_can_import(self):
+        self.client.force_authenticate(self.member)
+        response = self.client.post(self.url, [self.row()], format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ProjectExportTests(SoftDeskTestCase):
+    """
+    A project's issues and comments are streamed as NDJSON or CSV.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 3)
+        self.issue = Issue.objects.filter(project=self.project).first()
+        Comment.objects.create(description='Comment', issue=self.issue, author=self.author)
+        self.url = reverse('projects:project-export', kwargs={'pk': self.project.pk})
+
+    def test_ndjson(self):
+        with self.assertNumQueries(3):
+            # project, issues, comments: the membership is cached
+            response = self.client.get(self.url)
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+        self.assertEqual([row['type'] for row in rows], ['issue'] * 3 + ['comment'])
+        self.assertEqual(rows[0]['assigned'], 'author')
+        self.assertEqual(rows[-1]['issue_id'], self.issue.id)
+
+    def test_csv(self):
+        response = self.client.get(self.url, {'output': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['title'], 'Issue')
+
+    def test_outsider_is_refused(self):
+        self.client.force_authenticate(self.create_user('outsider'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_command(self):
+        output = StringIO()
+        call_command('export_project', self.project.pk, stdout=output)
+        self.assertEqual(len(output.getvalue().splitlines()), 4)
+
+
+class CommentIssueUrlTests(SoftDeskTestCase):
+    """
+    Comment lists render issue URLs without loading the issues.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 1)
+        self.issue = Issue.objects.filter(project=self.project).first()
+        for _ in range(5):
+            Comment.objects.create(description='Comment', issue=self.issue, author=self.author)
+
+    def test_issue_url(self):
+        url = reverse('projects:comments-list', kwargs={'project_pk': self.project.pk})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        expected = 'http://testserver' + reverse(
+            'projects:project-issue-detail', kwargs={'project_pk': self.project.pk, 'pk': self.issue.pk})
+        self.assertEqual({comment['issue_url'] for comment in response.data['results']}, {expected})
+        issue_queries = [query for query in context.captured_queries
+                         if query['sql'].startswith('SELECT "projects_issue"')]
+        self.assertEqual(issue_queries, [])
+
+    def test_route_template(self):
+        route = RouteTemplate('projects:comment-get-update-destroy', ('project_pk', 'issue_pk', 'pk'), pk=uuid.UUID)
+        comment = Comment.objects.first()
+        self.assertEqual(
+            route.format(project_pk=self.project.pk, issue_pk=self.issue.pk, pk=comment.pk),
+            reverse('projects:comment-get-update-destroy', kwargs={
+                'project_pk': self.project.pk, 'issue_pk': self.issue.pk, 'pk': comment.pk}))
+
+
+class AsyncReadTests(SoftDeskTestCase):
+    """
+    List and retrieve endpoints are served with the async ORM, under ASGI too.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 12)
+        self.issue = Issue.objects.filter(project=self.project).first()
+        self.comment = Comment.objects.create(description='Comment', issue=self.issue, author=self.author)
+        self.token = FilteredRefreshToken.for_user(self.author).access_token
+
+    async def aget(self, url):
+        return await AsyncClient().get(url, headers={'authorization': f'Bearer {self.token}'})
+
+    async def test_reads_through_asgi(self):
+        kwargs = {'project_pk': self.project.pk}
+        urls = {
+            reverse('projects:project-list'): 1,
+            reverse('projects:project-issues', kwargs=kwargs): 10,
+            reverse('projects:project-contributors', kwargs=kwargs): 10,
+            reverse('projects:comments-list', kwargs=kwargs): 1,
+        }
+        for url, size in urls.items():
+            response = await self.aget(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(len(response.json()['results']), size, url)
+
+        response = await self.aget(reverse('projects:project-detail', kwargs={'pk': self.project.pk}))
+        self.assertEqual(len(response.json()['issues']), 12)
+        response = await self.aget(
+            reverse('projects:project-issue-detail', kwargs={'project_pk': self.project.pk, 'pk': self.issue.pk}))
+        self.assertEqual(response.json()['id'], self.issue.pk)
+        response = await self.aget(reverse('projects:comment-get-update-destroy', kwargs={
+            'project_pk': self.project.pk, 'issue_pk': self.issue.pk, 'pk': self.comment.pk}))
+        self.assertEqual(response.json()['description'], 'Comment')
+
+    async def test_unknown_objects_are_not_found(self):
+        response = await self.aget(
+            reverse('projects:project-issue-detail', kwargs={'project_pk': self.project.pk, 'pk': 0}))
+        self.assertEqual(response.status_code, 404)
+        response = await self.aget(reverse('projects:project-detail', kwargs={'pk': 0}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_async_dispatch_under_asgi_only(self):
+        url = reverse('projects:project-list')
+        self.assertFalse(iscoroutinefunction(resolve(url).func))
+        self.assertTrue(iscoroutinefunction(resolve(url, urlconf=settings.ASYNC_URLCONF).func))
+
+        data = {'type': 'BACK-END', 'title': 'Created', 'description': 'Without an event loop'}
+        with mock.patch('sofdesk.views.async_to_sync', wraps=async_to_sync) as wrapper:
+            self.assertEqual(self.client.post(url, data, format='json').status_code, 201)
+            wrapper.assert_not_called()
+            self.assertEqual(self.client.get(url).status_code, 200)
+            wrapper.assert_called_once()
+
+            wrapper.reset_mock()
+            self.assertEqual(async_to_sync(self.aget)(url).status_code, 200)
+            wrapper.assert_not_called()
+
+    def test_page_number_pagination(self):
+        url = reverse('projects:project-contributors', kwargs={'project_pk': self.project.pk})
+        response = self.client.get(url, {'page': 2})
+        self.assertEqual(response.data['count'], 13)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['previous'])
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(self.client.get(url, {'page': 3}).status_code, 404)
+
+    def test_outsider_cannot_read(self):
+        self.client.force_authenticate(self.create_user('outsider'))
+        response = self.client.get(reverse('projects:project-detail', kwargs={'pk': self.project.pk}))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('projects:project-issues', kwargs={'project_pk': self.project.pk}))
+        self.assertEqual(response.status_code, 403)
+
+
+class ConditionalGetTests(SoftDeskTestCase):
+    """
+    Unchanged projects, issues and comments are answered with 304 Not Modified.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 3)
+        self.issue = Issue.objects.filter(project=self.project).first()
+        self.comment = Comment.objects.create(description='Comment', issue=self.issue, author=self.author)
+        kwargs = {'project_pk': self.project.pk}
+        self.urls = [
+            reverse('projects:project-list'),
+            reverse('projects:project-detail', kwargs={'pk': self.project.pk}),
+            reverse('projects:project-issues', kwargs=kwargs),
+            reverse('projects:project-issue-detail', kwargs={**kwargs, 'pk': self.issue.pk}),
+            reverse('projects:comments-list', kwargs=kwargs),
+        ]
+
+    def assertNotModified(self, url, **headers):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 304, url)
+        self.assertEqual(response.content, b'')
+        return response
+
+    def test_unchanged_resources(self):
+        for url in self.urls:
+            etag = self.client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as context:
+                self.assertNotModified(url, if_none_match=etag)
+            self.assertLessEqual(len(context), 1, url)
+
+    def test_if_modified_since(self):
+        for url in self.urls:
+            last_modified = self.client.get(url)['Last-Modified']
+            self.assertNotModified(url, if_modified_since=last_modified)
+
+    def test_changes_are_served(self):
+        changes = [
+            lambda: Issue.objects.filter(pk=self.issue.pk).update(status=Issue.IssueStatus.FINISHED),
+            lambda: Comment.objects.filter(pk=self.comment.pk).delete(),
+            lambda: Contributor.objects.create(user=self.create_user('newcomer'), project=self.project),
+            lambda: Project.objects.filter(pk=self.project.pk).update(title='Renamed'),
+        ]
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        for change in changes:
+            change()
+            for url in self.urls:
+                response = self.client.get(url, headers={'if_none_match': etags[url]})
+                self.assertEqual(response.status_code, 200, url)
+                etags[url] = response['ETag']
+
+    def test_renamed_user_is_served(self):
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        version = Project.objects.get(pk=self.project.pk).version
+        self.author.last_login = timezone.now()
+        self.author.save(update_fields=['last_login'])
+        self.assertEqual(Project.objects.get(pk=self.project.pk).version, version)
+
+        self.author.username = 'renamed'
+        self.author.save()
+        for url in self.urls:
+            response = self.client.get(url, headers={'if_none_match': etags[url]})
+            self.assertEqual(response.status_code, 200, url)
+            self.assertIn(b'"renamed"', response.content, url)
+
+    def test_stale_save_does_not_rewind_the_version(self):
+        project = Project.objects.get(pk=self.project.pk)
+        self.issue.save()
+        version = Project.objects.get(pk=self.project.pk).version
+        project.save()
+        self.assertGreater(Project.objects.get(pk=self.project.pk).version, version)
+
+    def test_etag_depends_on_the_query(self):
+        url = self.urls[2]
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url, {'status': 'TODO'})['ETag'])
+
+    def test_outsider_gets_no_validators(self):
+        etag = self.client.get(self.urls[1])['ETag']
+        self.client.force_authenticate(self.create_user('outsider'))
+        response = self.client.get(self.urls[1], headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 404)
+
+
+class ResponseCacheTests(SoftDeskTestCase):
+    """
+    Project responses are cached per user until a project they show changes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 2)
+        self.detail_url = reverse('projects:project-detail', kwargs={'pk': self.project.pk})
+        self.list_url = reverse('projects:project-list')
+
+    def assertCached(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        # Only the conditional GET validators are read from the database.
+        self.assertEqual(len(context), 1, [query['sql'] for query in context.captured_queries])
+        return response
+
+    def test_responses_are_cached(self):
+        for url in (self.detail_url, self.list_url):
+            expected = self.client.get(url).data
+            self.assertEqual(self.assertCached(url).data, expected)
+
+    def test_changes_invalidate(self):
+        user = Contributor.objects.filter(project=self.project).exclude(user=self.author).first().user
+        issue = Issue.objects.filter(project=self.project).first()
+        changes = [
+            lambda: Issue.objects.create(
+                tag=Issue.IssueTag.BUG, priority=Issue.IssuePriority.LOW, title='New', description='New',
+                project=self.project, author=self.author, assigned=self.author),
+            lambda: issue.delete(),
+            lambda: Contributor.objects.create(user=self.create_user('newcomer'), project=self.project),
+            lambda: setattr(user, 'username', 'renamed') or user.save(),
+            lambda: setattr(self.project, 'title', 'Renamed') or self.project.save(),
+        ]
+        for change in changes:
+            for url in (self.detail_url, self.list_url):
+                self.client.get(url)
+            change()
+            detail = self.client.get(self.detail_url).data
+            self.assertEqual(detail, ProjectSerializer(Project.objects.get(pk=self.project.pk)).data)
+
+    def test_new_project_appears_in_list(self):
+        self.client.get(self.list_url)
+        other = self.create_project(self.create_user('other'))
+        Contributor.objects.create(user=self.author, project=other)
+        ids = [project['id'] for project in self.client.get(self.list_url).data['results']]
+        self.assertIn(other.pk, ids)
+
+    def test_other_projects_do_not_invalidate(self):
+        self.client.get(self.detail_url)
+        other = self.create_user('other')
+        project = self.create_project(other)
+        Issue.objects.create(
+            tag=Issue.IssueTag.BUG, priority=Issue.IssuePriority.LOW, title='Other', description='Other',
+            project=project, author=other, assigned=other)
+        self.assertCached(self.detail_url)
+
+    def test_entries_are_per_user(self):
+        member = Contributor.objects.filter(project=self.project).exclude(user=self.author).first().user
+        self.client.get(self.list_url)
+        self.client.force_authenticate(member)
+        response = self.client.get(self.list_url)
+        self.assertEqual([project['id'] for project in response.data['results']], [self.project.pk])
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'memberships': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'memberships'},
+        'responses': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'response_cache'},
+    })
+    def test_database_backend(self):
+        call_command('createcachetable', verbosity=0)
+        expected = self.client.get(self.detail_url).data
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.client.get(self.detail_url).data, expected)
+        self.assertFalse(any('projects_issue' in query['sql'] for query in context.captured_queries))
+
+        Issue.objects.filter(project=self.project).first().delete()
+        self.assertEqual(len(self.client.get(self.detail_url).data['issues']), 1)
+
+    def test_bulk_operations_invalidate(self):
+        self.client.get(self.detail_url)
+        newcomer = self.create_user('newcomer')
+        self.client.post(reverse('projects:project-contributors', kwargs={'project_pk': self.project.pk}),
+                         {'users': [newcomer.pk]}, format='json')
+        self.assertEqual(len(self.client.get(self.detail_url).data['contributors']), 4)
+
+        self.client.post(reverse('projects:project-issues-import', kwargs={'project_pk': self.project.pk}),
+                         [{'tag': 'BUG', 'priority': 'LOW', 'title': 'Imported', 'description': 'Imported'}],
+                         format='json')
+        self.assertEqual(len(self.client.get(self.detail_url).data['issues']), 3)
+
+
+class ProjectStatisticsTests(SoftDeskTestCase):
+    """
+    Project statistics are counted with one GROUP BY query over the issues.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 4)
+        issues = list(Issue.objects.filter(project=self.project).order_by('id'))
+        Issue.objects.filter(pk__in=[issues[0].pk, issues[1].pk]).update(status=Issue.IssueStatus.FINISHED)
+        Issue.objects.filter(pk=issues[2].pk).update(priority=Issue.IssuePriority.HIGH, tag=Issue.IssueTag.TASK)
+        self.url = reverse('projects:project-stats', kwargs={'pk': self.project.pk})
+
+    def test_statistics(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        issue_queries = [query for query in context.captured_queries if 'FROM "projects_issue"' in query['sql']]
+        self.assertEqual(len(issue_queries), 1)
+
+        data = response.data['data']
+        self.assertEqual(data['issues'], 4)
+        self.assertEqual(data['status'], {'TODO': 2, 'INPROGRESS': 0, 'FINISHED': 2})
+        self.assertEqual(data['priority'], {'LOW': 3, 'MEDIUM': 0, 'HIGH': 1})
+        self.assertEqual(data['tag'], {'BUG': 3, 'TASK': 1, 'FEATURE': 0})
+        self.assertEqual(data['assignees'], [{'id': self.author.pk, 'username': 'author', 'issues': 4}])
+
+    def test_payload_is_smaller_than_detail(self):
+        detail = self.client.get(reverse('projects:project-detail', kwargs={'pk': self.project.pk}))
+        self.assertLess(len(self.client.get(self.url).content), len(detail.content))
+
+    def test_all_projects(self):
+        empty = self.create_project(self.author)
+        response = self.client.get(reverse('projects:project-all-stats'))
+        self.assertEqual([(stats['project'], stats['issues']) for stats in response.data['data']],
+                         [(empty.pk, 0), (self.project.pk, 4)])
+        self.assertEqual(response.data['data'][0]['assignees'], [])
+
+    def test_statistics_follow_changes(self):
+        self.client.get(self.url)
+        Issue.objects.filter(project=self.project).update(status=Issue.IssueStatus.INPROGRESS)
+        self.assertEqual(self.client.get(self.url).data['data']['status']['INPROGRESS'], 4)
+
+    def test_outsider_is_refused(self):
+        self.client.force_authenticate(self.create_user('outsider'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_unchanged_statistics(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, headers={'if_none_match': etag}).status_code, 304)
+
+
+class CounterTests(SoftDeskTestCase):
+    """
+    The issue, open issue, contributor and comment counters follow the rows they count.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 3)
+        self.issue = Issue.objects.filter(project=self.project).first()
+
+    def counters(self, project=None):
+        project = Project.objects.get(pk=(project or self.project).pk)
+        return project.issue_count, project.open_issue_count, project.contributor_count
+
+    def comment(self, issue):
+        return Comment.objects.create(description='Comment', issue=issue, author=self.author)
+
+    def test_create_and_delete(self):
+        self.assertEqual(self.counters(), (3, 3, 4))
+        comment = self.comment(self.issue)
+        self.comment(self.issue)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comment_count, 2)
+
+        comment.delete()
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comment_count, 1)
+        self.issue.delete()
+        Contributor.objects.filter(project=self.project, role=Contributor.ContributorRole.CONTRIBUTOR).first().delete()
+        self.assertEqual(self.counters(), (2, 2, 3))
+
+    def test_status_change(self):
+        self.issue.status = Issue.IssueStatus.FINISHED
+        self.issue.save()
+        self.issue.save()
+        self.assertEqual(self.counters(), (3, 2, 4))
+        self.issue.status = Issue.IssueStatus.INPROGRESS
+        self.issue.save()
+        self.assertEqual(self.counters(), (3, 3, 4))
+
+    def test_move_to_another_project(self):
+        other = self.create_project(self.author)
+        Contributor.objects.create(user=self.issue.author, project=other)
+        self.issue.project = other
+        self.issue.status = Issue.IssueStatus.FINISHED
+        self.issue.save()
+        self.assertEqual(self.counters(), (2, 2, 4))
+        self.assertEqual(self.counters(other), (1, 0, 2))
+
+    def test_cascade(self):
+        self.comment(self.issue)
+        self.issue.author.delete()
+        self.assertEqual(self.counters(), (2, 2, 3))
+        self.project.delete()
+        self.assertFalse(Issue.objects.exists())
+
+    def test_delete_users(self):
+        first, second = Issue.objects.filter(project=self.project)[:2]
+        first.assigned = second.author
+        first.save()
+        Comment.objects.create(description='Comment', issue=self.issue, author=second.author)
+        Comment.objects.create(description='Comment', issue=first, author=second.author)
+        other = Issue.objects.exclude(pk__in=[first.pk, second.pk]).get()
+        Comment.objects.create(description='Comment', issue=other, author=second.author)
+        self.comment(other)
+
+        User.objects.filter(pk__in=[first.author_id, second.author_id]).delete()
+        self.assertEqual(self.counters(), (1, 1, 2))
+        other.refresh_from_db()
+        self.assertEqual(other.comment_count, 1)
+        self.assertEqual(recount(), {'projects.Project': 0, 'projects.Issue': 0})
+
+    def test_serialized(self):
+        self.comment(self.issue)
+        data = self.client.get(reverse('projects:project-detail', kwargs={'pk': self.project.pk})).data
+        self.assertEqual((data['issue_count'], data['open_issue_count'], data['contributor_count']), (3, 3, 4))
+        issue = self.client.get(reverse(
+            'projects:project-issue-detail', kwargs={'project_pk': self.project.pk, 'pk': self.issue.pk}))
+        self.assertEqual(issue.data['comment_count'], 1)
+
+    def test_bulk_paths(self):
+        users = [self.create_user(f'member{index}') for index in range(3)]
+        self.client.post(reverse('projects:project-contributors', kwargs={'project_pk': self.project.pk}),
+                         {'users': [user.id for user in users]}, format='json')
+        rows = [{'tag': 'BUG', 'priority': 'LOW', 'title': 'Imported', 'description': 'Description'}] * 5
+        self.client.post(reverse('projects:project-issues-import', kwargs={'project_pk': self.project.pk}),
+                         rows, format='json')
+        self.assertEqual(self.counters(), (8, 8, 7))
+
+    def test_repair(self):
+        self.comment(self.issue)
+        Issue.objects.filter(project=self.project).update(status=Issue.IssueStatus.FINISHED)
+        Project.objects.filter(pk=self.project.pk).update(contributor_count=0)
+        Issue.objects.filter(pk=self.issue.pk).update(comment_count=5)
+        output = StringIO()
+        call_command('repair_counters', batch_size=1, stdout=output)
+
+        self.assertIn('Repaired 1 projects.Project rows.', output.getvalue())
+        self.assertIn('Repaired 1 projects.Issue rows.', output.getvalue())
+        self.assertEqual(self.counters(), (3, 0, 4))
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comment_count, 1)
+
+
+class SparseFieldsTests(SoftDeskTestCase):
+    """
+    Responses render the fields selected by `fields` and `expand`, and only
+    fetch the relations they render.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 3)
+        self.issue = Issue.objects.filter(project=self.project).first()
+        Comment.objects.create(description='Comment', issue=self.issue, author=self.author)
+        self.list_url = reverse('projects:project-list')
+
+    def test_fields(self):
+        with self.assertNumQueries(4):
+            # versions, memberships, count, projects page
+            response = self.client.get(self.list_url, {'fields': 'id,title'})
+        self.assertEqual(response.data['results'], [{'id': self.project.pk, 'title': 'Project'}])
+
+    def test_expand(self):
+        with self.assertNumQueries(5):
+            # versions, memberships, count, projects page, issues
+            response = self.client.get(self.list_url, {'expand': 'issues'})
+        project = response.data['results'][0]
+        self.assertNotIn('contributors', project)
+        self.assertIn('title', project)
+        self.assertNotIn('author_details', project['issues'][0])
+        self.assertIn('description', project['issues'][0])
+
+    def test_nested_fields(self):
+        response = self.client.get(self.list_url, {'fields': 'id,issues.title', 'expand': 'issues.author_details'})
+        self.assertEqual(response.data['results'][0]['issues'][0], {
+            'title': 'Issue', 'author_details': {'id': self.issue.author_id, 'username': self.issue.author.username}})
+        detail = self.client.get(reverse('projects:project-detail', kwargs={'pk': self.project.pk}),
+                                 {'fields': 'id,contributors.role'})
+        self.assertEqual(detail.data['contributors'][0], {'role': 'AUTHOR'})
+
+    def test_joins_follow_fields(self):
+        kwargs = {'project_pk': self.project.pk}
+        urls = {
+            reverse('projects:project-issues', kwargs=kwargs): 'id,title',
+            reverse('projects:comments-list', kwargs=kwargs): 'unique_id,description',
+            reverse('projects:project-contributors', kwargs=kwargs): 'id,role',
+        }
+        for url, fields in urls.items():
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, {'fields': fields})
+            self.assertEqual(set(response.data['results'][0]), set(fields.split(',')), url)
+            self.assertFalse([query for query in context.captured_queries
+                              if 'JOIN "users_user"' in query['sql']], url)
+
+    def test_default_renders_everything(self):
+        response = self.client.get(reverse('projects:comments-list', kwargs={'project_pk': self.project.pk}))
+        self.assertIn('issue_url', response.data['results'][0])
+        self.assertIn('author_details', response.data['results'][0])
+
+    def test_writes_are_not_pruned(self):
+        response = self.client.post(f'{self.list_url}?fields=id', {
+            'type': 'BACK-END', 'title': 'New', 'description': 'Description'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('title', response.data['data'])
+
+
+class ValuesSerializationTests(SoftDeskTestCase):
+    """
+    Lists rendered from QuerySet.values() are byte-identical to the DRF serializers.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 12)
+        self.issue = Issue.objects.filter(project=self.project).first()
+        Issue.objects.filter(pk=self.issue.pk).update(assigned=None, title='Login page')
+        for index in range(3):
+            Comment.objects.create(description=f'Comment {index}', issue=self.issue, author=self.author)
+
+    def assertSameContent(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, url)
+        with mock.patch.object(AsyncReadMixin, 'values_serialization', False):
+            expected = self.client.get(url, params)
+        self.assertEqual(response.content, expected.content, (url, params))
+        return response
+
+    def test_same_content(self):
+        kwargs = {'project_pk': self.project.pk}
+        issues = reverse('projects:project-issues', kwargs=kwargs)
+        comments = reverse('projects:comment-list-create', kwargs={**kwargs, 'issue_pk': self.issue.pk})
+        for url, params in (
+                (issues, None),
+                (issues, {'search': 'login'}),
+                (issues, {'fields': 'id,title', 'expand': 'assigned_details'}),
+                (reverse('projects:project-contributors', kwargs=kwargs), None),
+                (reverse('projects:project-contributors', kwargs=kwargs), {'page': 2}),
+                (reverse('projects:comments-list', kwargs=kwargs), None),
+                (comments, {'expand': 'issue_url'})):
+            self.assertSameContent(url, params)
+
+    def test_same_next_pages(self):
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        response = self.assertSameContent(url)
+        self.assertSameContent(response.data['next'])
+
+    def test_nested_null(self):
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        issue = self.assertSameContent(url).data['results'][0]
+        self.assertEqual((issue['id'], issue['assigned'], issue['assigned_details']), (self.issue.pk, None, None))
+
+    def test_rows_are_not_instances(self):
+        url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        with mock.patch.object(Issue, 'from_db', side_effect=AssertionError('instance built')):
+            self.assertEqual(self.client.get(url, {'fields': 'id'}).status_code, 200)
+
+
+class RequestTimingTests(SoftDeskTestCase):
+    """
+    Requests report their SQL queries and the time spent by stage in a
+    Server-Timing header, and slow ones are logged.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.grow(self.project, 3)
+        self.url = reverse('projects:project-issues', kwargs={'project_pk': self.project.pk})
+        self.token = FilteredRefreshToken.for_user(self.author).access_token
+
+    def metrics(self, response):
+        metrics = {}
+        for metric in response['Server-Timing'].split(', '):
+            name, *params = metric.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        metrics = self.metrics(response)
+        self.assertEqual(metrics['db']['desc'], f'"{len(context)} queries"')
+        self.assertEqual(list(metrics), ['db', 'serialization', 'permissions', 'total'])
+        self.assertGreater(float(metrics['serialization']['dur']), 0)
+        self.assertGreater(float(metrics['permissions']['dur']), 0)
+        self.assertGreaterEqual(float(metrics['total']['dur']), float(metrics['db']['dur']))
+
+    def test_server_timing_through_asgi(self):
+        async def get():
+            return await AsyncClient().get(self.url, headers={'authorization': f'Bearer {self.token}'})
+
+        with CaptureQueriesContext(connection) as context:
+            response = async_to_sync(get)()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.metrics(response)['db']['desc'], f'"{len(context)} queries"')
+
+    @override_settings(REQUEST_TIMING={'ENABLED': True, 'SLOW_REQUEST_QUERIES': 1})
+    def test_slow_request_log(self):
+        with self.assertLogs('sofdesk.timing', 'WARNING') as logs:
+            self.client.get(self.url)
+        entry = logs.records[0].timings
+        self.assertEqual((entry['method'], entry['path'], entry['status']), ('GET', self.url, 200))
+        self.assertEqual(entry['view'], 'projects:project-issues')
+        self.assertGreater(entry['queries'], 1)
+
+    @override_settings(REQUEST_TIMING={'ENABLED': True, 'SLOW_REQUEST_MS': 60000, 'SLOW_REQUEST_QUERIES': None})
+    def test_fast_request_is_not_logged(self):
+        with self.assertNoLogs('sofdesk.timing'):
+            self.client.get(self.url)
+
+    @override_settings(REQUEST_TIMING={'ENABLED': False})
+    def test_disabled(self):
+        self.assertNotIn('Server-Timing', self.client.get(self.url))
+
+
+class ConfigurationTests(TestCase):
+    """
+    Settings read from the environment, SQLite pragmas and configuration checks.
+    """
+
+    def test_environment(self):
+        env = Environment({'SOFTDESK_DEBUG': 'off', 'SOFTDESK_CONN_MAX_AGE': '60',
+                           'SOFTDESK_ALLOWED_HOSTS': 'api.softdesk.io, localhost,', 'SOFTDESK_BAD': 'maybe'})
+        self.assertIs(env.get_bool('DEBUG', True), False)
+        self.assertIs(env.get_bool('UNSET', True), True)
+        self.assertEqual(env.get_int('CONN_MAX_AGE', 0), 60)
+        self.assertEqual(env.get_list('ALLOWED_HOSTS', []), ['api.softdesk.io', 'localhost'])
+        with self.assertRaises(ImproperlyConfigured):
+            env.get_bool('BAD', False)
+        with self.assertRaises(ImproperlyConfigured):
+            env.get_int('BAD', 0)
+
+    def test_cache_settings(self):
+        self.assertEqual(cache_settings('file', 'responses', '/var/cache', TIMEOUT=300),
+                         {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                          'LOCATION': os.path.join('/var/cache', 'responses'), 'TIMEOUT': 300})
+        self.assertEqual(cache_settings('database', 'memberships')['LOCATION'], 'softdesk_cache_memberships')
+        redis = cache_settings('redis', 'memberships', 'redis://cache:6379', OPTIONS={'MAX_ENTRIES': 10})
+        self.assertEqual((redis['KEY_PREFIX'], redis['OPTIONS']), ('memberships', {}))
+        with self.assertRaises(ImproperlyConfigured):
+            cache_settings('memcached', 'default')
+
+    def test_pragmas(self):
+        with override_settings(SQLITE_PRAGMAS={'cache_size': -4096, 'busy_timeout': 1000}):
+            apply_pragmas(sender=type(connection), connection=connection)
+        try:
+            self.assertEqual(read_pragmas(connection, ['cache_size', 'busy_timeout']),
+                             {'cache_size': -4096, 'busy_timeout': 1000})
+        finally:
+            with override_settings(SQLITE_PRAGMAS={'cache_size': -2000, 'busy_timeout': 5000}):
+                apply_pragmas(sender=type(connection), connection=connection)
+        with override_settings(SQLITE_PRAGMAS={'cache_size': '1; DROP TABLE users_user'}):
+            with self.assertRaises(ImproperlyConfigured):
+                apply_pragmas(sender=type(connection), connection=connection)
+
+    def test_transaction_mode(self):
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+        other = connection.copy()
+        other.settings_dict['OPTIONS'] = {'transaction_mode': 'deferred'}
+        self.assertNotIn('transaction_mode', other.get_connection_params())
+        self.assertEqual(other.transaction_mode, 'DEFERRED')
+        other.settings_dict['OPTIONS'] = {'transaction_mode': 'LAZY'}
+        with self.assertRaises(ImproperlyConfigured):
+            other.get_connection_params()
+
+    def test_production_checks(self):
+        with override_settings(PROFILE='production', DEBUG=True, SECRET_KEY='django-insecure-key'):
+            ids = [message.id for message in check_profile(None)]
+        self.assertEqual(ids, ['sofdesk.W001', 'sofdesk.E002', 'sofdesk.W004', 'sofdesk.W005',
+                               'sofdesk.W005', 'sofdesk.W005'])
+
+        caches = {alias: cache_settings('database', alias) for alias in settings.CACHES}
+        with override_settings(PROFILE='production', DEBUG=False, SECRET_KEY='key', ALLOWED_HOSTS=['localhost'],
+                               CACHES=caches), mock.patch.dict(settings.DATABASES['default'], CONN_MAX_AGE=600):
+            self.assertEqual(check_profile(None), [])
+
+    def test_configuration_command(self):
+        output = StringIO()
+        call_command('configuration', stdout=output)
+        configuration, end = json.JSONDecoder().raw_decode(output.getvalue())
+        self.assertIn('System check identified no issues', output.getvalue()[end:])
+        self.assertEqual(configuration['profile'], 'development')
+        self.assertEqual(set(configuration['databases']['default']['pragmas']), set(DESCRIBED_PRAGMAS))
+        self.assertEqual(set(configuration['caches']), set(settings.CACHES))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BenchmarkSuiteTests(SoftDeskTestCase):
+    """
+    The synthetic dataset is consistent, and the route benchmark covers every
+    route without changing it.
+    """
+
+    def generate(self, *args):
+        output = StringIO()
+        call_command('generate_dataset', '--users=30', '--projects=4', '--max-contributors=12', '--issues=8',
+                     '--comments=3', '--prefix=test', *args, stdout=output)
+        return output.getvalue()
+
+    def dataset(self):
+        return (User.objects.count(), Project.objects.count(), Contributor.objects.count(),
+                Issue.objects.count(), Comment.objects.count())
+
+    def test_dataset(self):
+        before = self.dataset()
+        self.generate()
+        users, projects, contributors, issues, comments = (
+            after - previous for after, previous in zip(self.dataset(), before))
+        self.assertEqual((users, projects), (30, 4))
+        self.assertEqual(contributors, 12 + 6 + 4 + 3)
+        self.assertGreater(issues, 0)
+        self.assertGreater(comments, 0)
+        self.assertEqual(Project.objects.get(title='test project 0').contributor_count, 12)
+        self.assertEqual(User.objects.get(username='test-user-0').contributor_projects.get(
+            project__title='test project 0').role, Contributor.ContributorRole.AUTHOR)
+
+        self.assertEqual(recount(), {'projects.Project': 0, 'projects.Issue': 0})
+
+    def test_existing_dataset(self):
+        self.generate()
+        with self.assertRaises(CommandError):
+            self.generate()
+        self.generate('--clear', '--seed=2')
+        self.assertEqual(User.objects.filter(username__startswith='test-user-').count(), 30)
+
+    def test_benchmark_routes(self):
+        self.generate()
+        dataset = self.dataset()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            call_command('benchmark_routes', '--requests=2', '--username=test-user-0',
+                         '--password=benchmark-password', f'--output={path}', stdout=StringIO())
+            with open(path) as file:
+                results = json.load(file)
+            output = StringIO()
+            call_command('benchmark_routes', '--requests=1', '--username=test-user-0', '--routes=GET',
+                         '--password=benchmark-password', '--cold', f'--compare={path}', stdout=output)
+
+        self.assertEqual(self.dataset(), dataset)
+        self.assertEqual(len(results['routes']), 37)
+        for name, result in results['routes'].items():
+            self.assertEqual(result['requests'], 2)
+            if name.startswith('GET'):
+                self.assertEqual(result['statuses'], [200], name)
+        self.assertIn('GET projects:project-list: p50', output.getvalue())
+        self.assertIn('queries +', output.getvalue())
+
+
+class QueryBudgetTests(SoftDeskTestCase):
+    """
+    Query budget of every endpoint.
+
+    Each endpoint is requested on a small fixture, then on a fixture ten times
+    bigger: the number of queries must not grow, and must stay within the
+    budget pinned for the endpoint. Requests are sent with a JWT, on cold
+    caches and token blacklist filter, and writes are rolled back. Failures
+    print the queries of the request.
+
+    Django deletes the rows of a cascade by batches of 100, which the fixture
+    stays under: a deletion costs one more query per 100 rows of a model.
+    """
+    size = 3
+    factor = 10
+
+    budgets = [
+        # (method, view name, budget)
+        ('get', 'users:user-profile', 1),
+        ('post', 'users:register', 3),
+        ('post', 'users:login', 3),
+        ('patch', 'users:update-user-profile', 3),
+        ('post', 'users:logout', 7),
+        ('delete', 'users:delete-user-profile', 6),
+        ('get', 'projects:api-root', 1),
+        ('get', 'projects:project-list', 7),
+        ('post', 'projects:project-list', 9),
+        ('get', 'projects:project-detail', 6),
+        ('put', 'projects:project-detail', 8),
+        ('patch', 'projects:project-detail', 8),
+        ('delete', 'projects:project-detail', 6),
+        ('get', 'projects:project-export', 5),
+        ('post', 'projects:project-export', 6),
+        ('post', 'projects:project-recount', 6),
+        ('get', 'projects:project-stats', 4),
+        ('get', 'projects:project-all-stats', 4),
+        ('get', 'projects:project-contributors', 5),
+        ('post', 'projects:project-contributors', 10),
+        ('delete', 'projects:project-contributors', 9),
+        ('post', 'projects:project-contributor-detail', 7),
+        ('delete', 'projects:project-contributor-detail', 6),
+        ('get', 'projects:project-issues', 5),
+        ('post', 'projects:project-issues', 7),
+        ('post', 'projects:project-issues-import', 7),
+        ('get', 'projects:project-issue-detail', 5),
+        ('put', 'projects:project-issue-detail', 11),
+        ('patch', 'projects:project-issue-detail', 11),
+        ('delete', 'projects:project-issue-detail', 10),
+        ('get', 'projects:comments-list', 5),
+        ('get', 'projects:comment-list-create', 7),
+        ('post', 'projects:comment-list-create', 7),
+        ('get', 'projects:comment-get-update-destroy', 7),
+        ('put', 'projects:comment-get-update-destroy', 11),
+        ('patch', 'projects:comment-get-update-destroy', 11),
+        ('delete', 'projects:comment-get-update-destroy', 11),
+        ('get', 'jobs:job-detail', 2),
+        ('get', 'jobs:job-result', 2),
+        ('get', 'admin:projects_project_changelist', 6),
+        ('get', 'admin:projects_contributor_changelist', 5),
+        ('get', 'admin:projects_issue_changelist', 5),
+        ('get', 'admin:projects_comment_changelist', 5),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {FilteredRefreshToken.for_user(self.author).access_token}')
+        self.admin = APIClient()
+        self.admin.force_login(User.objects.create_superuser(
+            username='admin', password='password', email='admin@softdesk.io', date_of_birth=date(1990, 1, 1)))
+        self.outsiders = [self.create_user(f'outsider{index}').pk for index in range(3)]
+        self.issue = Issue.objects.create(
+            tag=Issue.IssueTag.BUG, priority=Issue.IssuePriority.LOW, title='Issue', description='Description',
+            project=self.project, author=self.author, assigned=self.author)
+        self.comment = Comment.objects.create(description='Comment', issue=self.issue, author=self.author)
+        self.populate(self.size)
+        self.contributor = Contributor.objects.filter(project=self.project).exclude(user=self.author).first()
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(JOB_QUEUE={**settings.JOB_QUEUE, 'RESULTS_DIR': directory}))
+        self.job, _ = enqueue('projects.export_project', {'project_id': self.project.pk}, user=self.author)
+        Job.objects.filter(pk=self.job.pk).update(status=Job.JobStatus.SUCCEEDED, result=export_project(self.job))
+
+    def populate(self, size):
+        """
+        Add `size` projects of the author and `size` contributors to the project,
+        each one authoring an issue which it comments.
+        """
+        for _ in range(size):
+            self.create_project(self.author)
+        self.grow(self.project, size)
+        Comment.objects.bulk_create(
+            Comment(description='Comment', issue=issue, author_id=issue.author_id)
+            for issue in Issue.objects.filter(project=self.project, comment_count=0))
+        recount()
+
+    def get_request(self, method, viewname):
+        """
+        Return the path and payload of a request to the endpoint.
+        """
+        project = {'project_pk': self.project.pk}
+        issue = {**project, 'pk': self.issue.pk}
+        comments = {**project, 'issue_pk': self.issue.pk}
+        issue_data = {'tag': 'BUG', 'priority': 'HIGH', 'title': 'Issue', 'description': 'Description',
+                      'assigned': self.author.pk, 'project': self.project.pk, 'author': self.author.pk}
+        comment_data = {'description': 'Comment', 'issue': self.issue.pk, 'author': self.author.pk}
+        project_data = {'type': 'BACK-END', 'title': 'Project', 'description': 'Description',
+                        'user_id': self.author.pk}
+        kwargs = {
+            'projects:project-detail': {'pk': self.project.pk},
+            'projects:project-export': {'pk': self.project.pk},
+            'projects:project-recount': {'pk': self.project.pk},
+            'jobs:job-detail': {'pk': self.job.pk},
+            'jobs:job-result': {'pk': self.job.pk},
+            'projects:project-stats': {'pk': self.project.pk},
+            'projects:project-contributors': project,
+            'projects:project-contributor-detail': {
+                **project, 'pk': self.outsiders[0] if method == 'post' else self.contributor.user_id},
+            'projects:project-issues': project,
+            'projects:project-issues-import': project,
+            'projects:project-issue-detail': issue,
+            'projects:comments-list': project,
+            'projects:comment-list-create': comments,
+            'projects:comment-get-update-destroy': {**comments, 'pk': self.comment.pk},
+        }.get(viewname)
+        data = {
+            'users:register': {'username': 'registered', 'password': 'password', 'email': 'registered@softdesk.io',
+                               'date_of_birth': '1990-01-01'},
+            'users:login': {'username': 'author', 'password': 'password'},
+            'users:update-user-profile': {'can_be_contacted': True},
+            'users:logout': {'token': str(FilteredRefreshToken.for_user(self.author))},
+            'projects:project-list': project_data,
+            'projects:project-detail': project_data,
+            'projects:project-contributors': {'users': self.outsiders if method == 'post'
+                                              else [self.contributor.user_id]},
+            'projects:project-issues': issue_data,
+            'projects:project-issues-import': [issue_data] * 5,
+            'projects:project-issue-detail': issue_data,
+            'projects:comment-list-create': comment_data,
+            'projects:comment-get-update-destroy': comment_data,
+        }.get(viewname) if method != 'get' else None
+        return reverse(viewname, kwargs=kwargs), data
+
+    def measure(self, method, viewname):
+        """
+        Send a request to the endpoint on cold caches, in a rolled back transaction.
+
+        Returns:
+        - tuple: The status code of the response and the queries it ran.
+        """
+        client = self.admin if viewname.startswith('admin:') else self.client
+        path, data = self.get_request(method, viewname)
+        for alias in settings.CACHES:
+            caches[alias].clear()
+        get_blacklist_filter().reset()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(client, method)(path, data, format='json')
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            transaction.set_rollback(True)
+        self.assertLess(response.status_code, 400, f'{method.upper()} {viewname}: {response.status_code}')
+        return response.status_code, context.captured_queries
+
+    def format_queries(self, queries):
+        return '\n'.join(f"{index}. {query['sql']}" for index, query in enumerate(queries, 1))
+
+    def test_query_budgets(self):
+        measures = {(method, viewname): self.measure(method, viewname) for method, viewname, _ in self.budgets}
+        self.populate(self.size * (self.factor - 1))
+
+        for method, viewname, budget in self.budgets:
+            with self.subTest(f'{method.upper()} {viewname}'):
+                status_code, small = measures[method, viewname]
+                status_code_large, large = self.measure(method, viewname)
+                self.assertEqual(status_code_large, status_code)
+                self.assertEqual(
+                    len(large), len(small),
+                    f'The queries grow with the data, from:\n{self.format_queries(small)}\n'
+                    f'to:\n{self.format_queries(large)}')
+                self.assertLessEqual(
+                    len(large), budget, f'Over the budget of {budget} queries:\n{self.format_queries(large)}')
@@ -12,14 +12,16 @@ urlpatterns = [
     path('', include(project_router.urls)),
 
     # Contributors URLs
-    path('projects/<int:project_pk>/contributors/', ContributorViewSet.as_view({'get': 'list'}),
-         name='project-contributors'),
+    path('projects/<int:project_pk>/contributors/', ContributorViewSet.as_view(
+        {'get': 'list', 'post': 'bulk_add', 'delete': 'bulk_remove'}), name='project-contributors'),
     path('projects/<int:project_pk>/contributors/<int:pk>/', ContributorViewSet.as_view(
         {'post': 'create', 'delete': 'destroy'}), name='project-contributor-detail'),
 
     # Issues URLs
     path('projects/<int:project_pk>/issues/', IssueViewSet.as_view({'get': 'list', 'post': 'create'}),
          name='project-issues'),
+    path('projects/<int:project_pk>/issues/import/', IssueViewSet.as_view({'post': 'bulk_import'}),
+         name='project-issues-import'),
     path('projects/<int:project_pk>/issues/<int:pk>/', IssueViewSet.as_view(
         {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='project-issue-detail'),
 
@@ -0,0 +1,2 @@
+from .triggers import ProjectVersionTriggers, project_versions
+from .validators import project_validators, user_projects_validators
@@ -0,0 +1,90 @@
+from django.db import connections
+
+
+class ProjectVersionTriggers:
+    """
+    SQLite triggers stamping a project whenever it, or one of its contributors,
+    issues or comments, is inserted, updated or deleted.
+
+    The stamp is the `version` counter of the project, incremented by one, and
+    its `updated_time`. Being triggers, they follow bulk inserts, queryset
+    updates and cascade deletes that bypass Model.save() and the signals.
+    The version never goes backwards: saving a project loaded before a change
+    to its issues writes a stale version, which the update trigger overrides.
+    Renaming a user stamps the projects rendering the username: those the user
+    contributes to, and those holding issues or comments of the user.
+
+    SQLite drops the triggers of a table when a migration rebuilds it: such
+    migrations must create them again, along with those of the search indexes.
+
+    Attributes:
+        table (str): The name of the project table.
+        children (dict): The trigger suffix and the SQL selecting the project ids,
+            by the name of each table whose rows belong to a project.
+        user_table (str): The name of the user table.
+        user_projects (str): The SQL selecting the ids of the projects rendering a user.
+
+    Methods:
+        is_available(using): Checks if the triggers are installed on the database.
+        create_sql(): Return the statements creating the triggers.
+        drop_sql(): Return the statements dropping the triggers.
+    """
+    table = 'projects_project'
+    children = {
+        'projects_contributor': '{row}.project_id',
+        'projects_issue': '{row}.project_id',
+        'projects_comment': 'SELECT project_id FROM projects_issue WHERE id = {row}.issue_id',
+    }
+    user_table = 'users_user'
+    user_projects = (
+        'SELECT project_id FROM projects_contributor WHERE user_id = {row}.id '
+        'UNION SELECT project_id FROM projects_issue WHERE author_id = {row}.id OR assigned_id = {row}.id '
+        'UNION SELECT projects_issue.project_id FROM projects_comment '
+        'JOIN projects_issue ON projects_issue.id = projects_comment.issue_id '
+        'WHERE projects_comment.author_id = {row}.id'
+    )
+
+    def is_available(self, using='default'):
+        return connections[using].vendor == 'sqlite'
+
+    def _stamp_sql(self, version, condition):
+        return (f"UPDATE {self.table} SET version = {version}, "
+                f"updated_time = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE {condition};")
+
+    def _trigger_names(self):
+        names = [f'{self.table}_version_au']
+        for table in self.children:
+            names += [f'{table}_version_ai', f'{table}_version_ad', f'{table}_version_au']
+        return names + [f'{self.user_table}_version_au']
+
+    def create_sql(self):
+        # Stamps made by the triggers of the children increment the version,
+        # they do not fire this trigger again.
+        statements = [
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_version_au AFTER UPDATE ON {self.table} '
+            f'WHEN NEW.version <= OLD.version BEGIN '
+            f'{self._stamp_sql("OLD.version + 1", "id = NEW.id")} END;',
+        ]
+        bump = 'version + 1'
+        for table, project in self.children.items():
+            new, old = project.format(row='NEW'), project.format(row='OLD')
+            statements += [
+                f'CREATE TRIGGER IF NOT EXISTS {table}_version_ai AFTER INSERT ON {table} BEGIN '
+                f'{self._stamp_sql(bump, f"id IN ({new})")} END;',
+                f'CREATE TRIGGER IF NOT EXISTS {table}_version_ad AFTER DELETE ON {table} BEGIN '
+                f'{self._stamp_sql(bump, f"id IN ({old})")} END;',
+                f'CREATE TRIGGER IF NOT EXISTS {table}_version_au AFTER UPDATE ON {table} BEGIN '
+                f'{self._stamp_sql(bump, f"id IN ({new}) OR id IN ({old})")} END;',
+            ]
+        projects = self.user_projects.format(row='NEW')
+        statements.append(
+            f'CREATE TRIGGER IF NOT EXISTS {self.user_table}_version_au AFTER UPDATE OF username '
+            f'ON {self.user_table} WHEN NEW.username IS NOT OLD.username BEGIN '
+            f'{self._stamp_sql(bump, f"id IN ({projects})")} END;')
+        return statements
+
+    def drop_sql(self):
+        return [f'DROP TRIGGER IF EXISTS {name};' for name in self._trigger_names()]
+
+
+project_versions = ProjectVersionTriggers()
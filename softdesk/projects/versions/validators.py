@@ -0,0 +1,38 @@
+from projects.models import Project, Contributor
+
+from .triggers import project_versions
+
+
+async def project_validators(project_id):
+    """
+    Return the version and the modification time of a project, which change
+    whenever the project or anything it holds changes.
+
+    Returns:
+        tuple: (version, updated_time), or None when the project does not exist
+        or its versions are not maintained by the database.
+    """
+    if not project_versions.is_available(Project.objects.db):
+        return None
+    return await Project.objects.filter(pk=project_id).values_list('version', 'updated_time').afirst()
+
+
+async def user_projects_validators(user):
+    """
+    Return the version and the modification time of the set of projects a user
+    contributes to, which change when one of them changes or when the user
+    joins or leaves a project.
+
+    Returns:
+        tuple: (version, updated_time), the version being a string listing the
+        version of each project, or None when versions are not maintained.
+    """
+    if not project_versions.is_available(Project.objects.db):
+        return None
+    rows = Contributor.objects.filter(user_id=user.pk).order_by('project_id').values_list(
+        'project_id', 'project__version', 'project__updated_time')
+    versions, updated_time = [], None
+    async for project_id, version, project_updated_time in rows:
+        versions.append(f'{project_id}:{version}')
+        updated_time = max(updated_time or project_updated_time, project_updated_time)
+    return ','.join(versions), updated_time
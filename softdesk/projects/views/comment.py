@@ -1,28 +1,37 @@
 from django.shortcuts import get_object_or_404
-from rest_framework import viewsets, filters, status
+from rest_framework import status
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from projects.paginations import BasePagination
+from projects.paginations import BaseCursorPagination
+from projects.views.mixins import AsyncModelViewSet, aget_object_or_404
+from sofdesk.serializers import select_rendered
 from projects.models import Project, Comment, Issue
 from projects.serializers import CommentSerializer
 from projects.permissions import CommentPermissions
 from projects.filters import CommentFilter
+from projects.versions import project_validators
+from projects.search import FullTextSearchFilter, comment_index
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(AsyncModelViewSet):
     """
     API endpoint for managing comments.
 
     This viewset allows creating, listing, updating, and deleting comments associated with projects and issues.
 
-    Pagination, filtering, and search are supported.
+    Pagination, filtering, and search are supported. Lists are paginated with a cursor
+    on the creation time of the comments, search results are ranked by relevance.
+    Comments are listed and retrieved with the async ORM, unchanged ones are answered
+    with 304 Not Modified.
 
     """
-    pagination_class = BasePagination
+    pagination_class = BaseCursorPagination
+    cursor_ordering = ('created_time',)
     serializer_class = CommentSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_class = CommentFilter
+    search_index = comment_index
     search_fields = ['unique_id', 'description']
     paginator_list_message = "Listing comments included in the {} project"
     permission_classes = [CommentPermissions]
@@ -37,17 +46,38 @@ class CommentViewSet(viewsets.ModelViewSet):
             Queryset: The queryset of comments.
 
         """
-        project_id = self.kwargs.get("project_pk")
-        issue_id = self.kwargs.get("issue_pk")
+        project = get_object_or_404(Project, pk=self.kwargs.get("project_pk"))
+        issue = None
+        if self.kwargs.get("issue_pk") is not None:
+            issue = get_object_or_404(Issue, pk=self.kwargs["issue_pk"])
+        return self.get_comments(project, issue)
 
-        project = get_object_or_404(Project, pk=project_id)
+    async def aget_queryset(self):
+        """
+        Get the queryset of comments, fetching the project and issue with the async ORM.
+        """
+        project = await aget_object_or_404(Project.objects.all(), pk=self.kwargs.get("project_pk"))
+        issue = None
+        if self.kwargs.get("issue_pk") is not None:
+            issue = await aget_object_or_404(Issue.objects.all(), pk=self.kwargs["issue_pk"])
+        return self.get_comments(project, issue)
 
-        queryset = Comment.objects.filter(
-            issue__project=project).order_by('author')
+    async def aget_validators(self):
+        """
+        Get the version of the project, which changes with any of its comments.
+        """
+        return await project_validators(self.kwargs["project_pk"])
+
+    def get_comments(self, project, issue=None):
+        """
+        Get the queryset of the comments of the project, or of one of its issues,
+        along with their authors when the serializer renders them for this request.
+        """
+        queryset = select_rendered(Comment.objects.filter(issue__project=project),
+                                   self.get_serializer().fields).order_by('author')
         self.paginator.message = self.paginator_list_message.format(project)
 
-        if issue_id is not None:
-            issue = get_object_or_404(Issue, pk=issue_id)
+        if issue is not None:
             self.paginator.message = "Listing comments included in the {} issue of {} project".format(
                 issue, project)
             queryset = queryset.filter(issue=issue)
@@ -1,21 +1,24 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import filters, status
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from projects.permissions import ContributorPermissions
 from projects.paginations import BasePagination
+from projects.views.mixins import AsyncModelViewSet, aget_object_or_404
+from sofdesk.serializers import select_rendered
 from projects.models import Contributor, Project
-from projects.serializers import ContributorSerializer
+from projects.serializers import ContributorSerializer, ContributorBulkSerializer
 from projects.filters import ContributorFilter
 
 
-class ContributorViewSet(viewsets.ModelViewSet):
+class ContributorViewSet(AsyncModelViewSet):
     """
     API endpoint for managing contributors.
 
-    This viewset allows creating, listing, updating, and deleting contributors associated with projects.
+    This viewset allows creating, listing, updating, and deleting contributors associated with projects,
+    one at a time or in bulk.
 
-    Pagination, filtering, and search are supported.
+    Pagination, filtering, and search are supported. Contributors are listed with the async ORM.
 
     """
     pagination_class = BasePagination
@@ -26,7 +29,9 @@ class ContributorViewSet(viewsets.ModelViewSet):
     search_fields = ['user__username', 'project__title']
 
     paginator_list_message = "Listing contributors for the project: {}"
-    lookup_field = 'id'
+    # POST and DELETE on contributors/<pk>/ both identify the contributor by the id of its user.
+    lookup_field = 'user_id'
+    lookup_url_kwarg = 'pk'
 
     def get_queryset(self):
         """
@@ -38,10 +43,24 @@ class ContributorViewSet(viewsets.ModelViewSet):
             Queryset: The queryset of contributors.
 
         """
-        project_id = self.kwargs.get("project_pk")
-        project = get_object_or_404(Project, pk=project_id)
+        project = get_object_or_404(Project, pk=self.kwargs.get("project_pk"))
+        return self.get_contributors(project)
+
+    async def aget_queryset(self):
+        """
+        Get the queryset of contributors, fetching the project with the async ORM.
+        """
+        project = await aget_object_or_404(Project.objects.all(), pk=self.kwargs.get("project_pk"))
+        return self.get_contributors(project)
+
+    def get_contributors(self, project):
+        """
+        Get the queryset of the contributors of the project, along with their users
+        when the serializer renders them for this request.
+        """
         self.paginator.message = self.paginator_list_message.format(project)
-        return Contributor.objects.filter(project_id=project_id).order_by('role')
+        return select_rendered(Contributor.objects.filter(project_id=project.pk),
+                               self.get_serializer().fields).order_by('role')
 
     def create(self, request, *args, **kwargs):
         """
@@ -93,3 +112,39 @@ class ContributorViewSet(viewsets.ModelViewSet):
         except Exception as e:
             error_message = f"An {type(e).__name__} occurred while deleting a contributor: {str(e)}"
             return Response({"message": error_message}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def bulk_add(self, request, *args, **kwargs):
+        """
+        Add many users to the contributors of the project in a single transaction.
+
+        Args:
+            request: The HTTP request, whose body holds the list of users by id or username.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response with the result of each user.
+
+        """
+        serializer = ContributorBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = serializer.add(self.kwargs["project_pk"])
+        return Response({'message': 'Contributors added.', 'data': results}, status=status.HTTP_200_OK)
+
+    def bulk_remove(self, request, *args, **kwargs):
+        """
+        Remove many users from the contributors of the project in a single transaction.
+
+        Args:
+            request: The HTTP request, whose body holds the list of users by id or username.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response with the result of each user.
+
+        """
+        serializer = ContributorBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = serializer.remove(self.kwargs["project_pk"])
+        return Response({'message': 'Contributors removed.', 'data': results}, status=status.HTTP_200_OK)
@@ -1,33 +1,43 @@
-from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
 
-from projects.paginations import BasePagination
+from projects.paginations import BaseCursorPagination
+from projects.views.mixins import AsyncModelViewSet, aget_object_or_404
+from sofdesk.serializers import select_rendered
 from projects.models import Project, Issue
-from projects.serializers import IssueSerializer
+from projects.serializers import IssueSerializer, IssueImportSerializer
+from projects.parsers import NDJSONParser
 from projects.permissions import IssuePermissions
 from projects.filters import IssueFilter
+from projects.versions import project_validators
+from projects.search import FullTextSearchFilter, issue_index
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(AsyncModelViewSet):
     """
     API endpoint for managing issues.
 
     This viewset allows creating, listing, updating, and deleting issues associated with projects.
 
-    Pagination, filtering, and search are supported.
+    Pagination, filtering, and search are supported. Lists are paginated with a cursor
+    on the issue id, search results are ranked by relevance. Issues are listed and
+    retrieved with the async ORM, unchanged ones are answered with 304 Not Modified.
 
     """
-    pagination_class = BasePagination
+    pagination_class = BaseCursorPagination
+    cursor_ordering = ('id',)
     serializer_class = IssueSerializer
     paginator_list_message = "Listing issues included in the {} project"
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_class = IssueFilter
+    search_index = issue_index
     search_fields = ['tag', 'status', 'priority', 'title',
                      'project__title', 'author__username', 'assigned__username']
     permission_classes = [IssuePermissions]
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [NDJSONParser]
 
     def get_queryset(self):
         """
@@ -39,10 +49,30 @@ class IssueViewSet(viewsets.ModelViewSet):
             Queryset: The queryset of issues.
 
         """
-        project_id = self.kwargs.get("project_pk")
-        project = get_object_or_404(Project, pk=project_id)
+        project = get_object_or_404(Project, pk=self.kwargs.get("project_pk"))
+        return self.get_issues(project)
+
+    async def aget_queryset(self):
+        """
+        Get the queryset of issues, fetching the project with the async ORM.
+        """
+        project = await aget_object_or_404(Project.objects.all(), pk=self.kwargs.get("project_pk"))
+        return self.get_issues(project)
+
+    async def aget_validators(self):
+        """
+        Get the version of the project, which changes with any of its issues.
+        """
+        return await project_validators(self.kwargs["project_pk"])
+
+    def get_issues(self, project):
+        """
+        Get the queryset of the issues of the project, along with the users the
+        serializer renders for this request.
+        """
         self.paginator.message = self.paginator_list_message.format(project)
-        return Issue.objects.filter(project_id=project_id).order_by('project')
+        return select_rendered(Issue.objects.filter(project_id=project.pk),
+                               self.get_serializer().fields).order_by('project')
 
     def create(self, request, *args, **kwargs):
         """
@@ -70,3 +100,26 @@ class IssueViewSet(viewsets.ModelViewSet):
         except Exception as e:
             error_message = f"An {type(e).__name__} occurred while creating the project: {str(e)}"
             return Response({"message": error_message}, status=status.HTTP_400_BAD_REQUEST)
+
+    def bulk_import(self, request, *args, **kwargs):
+        """
+        Import a batch of issues into the project.
+
+        The body is either a JSON array or an NDJSON stream of issues. Valid rows are
+        created even when other rows are rejected.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response with the result of each row.
+
+        """
+        serializer = IssueImportSerializer(data={'issues': request.data})
+        serializer.is_valid(raise_exception=True)
+        results = serializer.import_rows(self.kwargs["project_pk"], request.user.id)
+        created = sum(1 for result in results if 'id' in result)
+        return Response({'message': f'{created} issue(s) imported.', 'data': results},
+                        status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
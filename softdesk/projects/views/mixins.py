@@ -0,0 +1,207 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+from sofdesk.serializers import ValuesSerializerMixin
+from sofdesk.views import AsyncDispatchMixin, TimedPermissionsMixin
+from projects.paginations import afetch
+from projects.responses import get_response_cache
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    """
+    Like rest_framework.generics.get_object_or_404(), with the async ORM.
+    """
+    try:
+        return await queryset.aget(**kwargs)
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+
+
+class AsyncReadMixin:
+    """
+    List and retrieve objects with the async ORM.
+
+    Views build their querysets in `aget_queryset()`, which defaults to running
+    get_queryset() in a worker thread; views whose get_queryset() queries the
+    database override it with the async ORM. The fetched objects, and whatever
+    they reference, are serialized on the event loop: the querysets must
+    select or prefetch every relation the serializer follows.
+
+    Lists of serializers that can render values (see ValuesSerializerMixin) are
+    fetched with QuerySet.values() and rendered by the compiled representation,
+    without building model instances nor running the DRF fields, unless the
+    view sets `values_serialization` to False.
+
+    Methods:
+    - aget_queryset(): Return the queryset of the view.
+    - aget_object(): Return the object of the view, once its permissions are checked.
+    - apaginate_queryset(queryset): Return the objects of the requested page, or None.
+    - get_values_representation(): Return the compiled representation of the serializer, or None.
+    - list_values(queryset, representation): List the rows of the queryset with the representation.
+    - list(request): List the objects.
+    - retrieve(request): Retrieve an object.
+    """
+    values_serialization = True
+
+    async def aget_queryset(self):
+        return await sync_to_async(self.get_queryset)()
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(await self.aget_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = await aget_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    def get_values_representation(self):
+        serializer = self.get_serializer()
+        if not self.values_serialization or not isinstance(serializer, ValuesSerializerMixin):
+            return None
+        return serializer.values_representation()
+
+    async def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(await self.aget_queryset())
+        representation = self.get_values_representation()
+        if representation is not None:
+            return await self.list_values(queryset, representation)
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(await afetch(queryset), many=True)
+        return Response(serializer.data)
+
+    async def list_values(self, queryset, representation):
+        lookups = list(representation.lookups)
+        if self.paginator is not None:
+            lookups += self.paginator.get_position_fields(self.request, queryset, self)
+        queryset = queryset.values(*dict.fromkeys(lookups))
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(representation.represent(page))
+        return Response(representation.represent(await afetch(queryset)))
+
+    async def retrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional list and retrieve requests with 304 Not Modified.
+
+    Views return the version and the modification time of what they serve from
+    `aget_validators()`, which is called once the permissions are checked and
+    must be cheap: the ETag is derived from the version, the request URL and
+    the response format. When the `If-None-Match` or `If-Modified-Since` header
+    of the request matches, nothing is fetched nor serialized.
+
+    Methods:
+    - aget_validators(): Return (version, modification time), or None to skip the check.
+    - get_etag(version): Return the ETag of the response.
+    - conditional_response(handler, request): Return 304, or the response of the handler with its validators.
+    """
+
+    async def aget_validators(self):
+        return None
+
+    def get_etag(self, version):
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        key = f'{version}|{self.request.get_full_path()}|{getattr(renderer, "format", "")}'
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    async def conditional_response(self, handler, request, *args, **kwargs):
+        validators = await self.aget_validators()
+        if validators is None:
+            return await handler(request, *args, **kwargs)
+
+        version, updated_time = validators
+        etag = self.get_etag(version)
+        last_modified = int(updated_time.timestamp()) if updated_time else None
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    async def list(self, request, *args, **kwargs):
+        return await self.conditional_response(super().list, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+
+class CachedResponseMixin:
+    """
+    Serve list and retrieve responses from the response cache.
+
+    Entries are kept per user and URL. Views name the projects a response is
+    built from in `aget_cache_dependencies()`; the requesting user is always a
+    dependency, and is read first so that a change of the projects of the user
+    made meanwhile invalidates the entry. See projects.responses.
+
+    Methods:
+    - aget_cache_dependencies(): Return the ids of the projects the response depends on, or None to skip the cache.
+    - cached_response(handler, request): Return the cached response, or the response of the handler once cached.
+    """
+
+    async def aget_cache_dependencies(self):
+        return None
+
+    async def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_response_cache()
+        if cache is None or not request.user.is_authenticated:
+            return await handler(request, *args, **kwargs)
+
+        key = cache.make_key(request.user.pk, request.build_absolute_uri())
+        data = await cache.aget(key)
+        if data is not None:
+            return Response(data)
+
+        generations = await cache.aget_generations(cache.dependency_keys(users=[request.user.pk]))
+        projects = await self.aget_cache_dependencies()
+        if projects is None:
+            return await handler(request, *args, **kwargs)
+        generations.update(await cache.aget_generations(cache.dependency_keys(projects=projects)))
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            await cache.aset(key, response.data, generations)
+        return response
+
+    async def list(self, request, *args, **kwargs):
+        return await self.cached_response(super().list, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class AsyncModelViewSet(AsyncDispatchMixin, TimedPermissionsMixin, ConditionalGetMixin, CachedResponseMixin,
+                        AsyncReadMixin, viewsets.ModelViewSet):
+    """
+    ModelViewSet listing and retrieving objects with the async ORM, answering
+    conditional requests when the view defines validators, and caching the
+    responses when it defines cache dependencies. Permission checks are timed,
+    see sofdesk.timing.
+
+    Under WSGI the other actions run without an event loop, under ASGI in a
+    worker thread, see AsyncDispatchMixin.
+    """
@@ -1,22 +1,40 @@
-from rest_framework import viewsets, filters
+from rest_framework import filters
+from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Prefetch, prefetch_related_objects
+from asgiref.sync import sync_to_async
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 
-from projects.models import Project
+from projects.models import Project, Contributor, Issue
 from projects.serializers import ProjectSerializer
 from projects.permissions import ProjectPermissions
 from projects.paginations import BasePagination
 from projects.filters import ProjectFilter
+from projects.exports import ProjectExport
+from projects.statistics import ProjectStatistics
+from projects.memberships import get_resolver
+from projects.versions import project_validators, user_projects_validators
+from projects.views.mixins import AsyncModelViewSet
+from jobs.queue import enqueue
+from jobs.views import accepted_response
+from sofdesk.serializers import select_rendered
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(AsyncModelViewSet):
     """
     API endpoint for managing projects.
 
     This viewset allows creating, listing, updating, and deleting projects.
 
-    Pagination, filtering, and search are supported.
+    Pagination, filtering, and search are supported. Projects are listed and retrieved
+    with the async ORM, unchanged ones are answered with 304 Not Modified, and the
+    responses are cached per user until one of the projects they show changes.
+
+    Deletions, queued exports and counter rebuilds are handed to background jobs
+    (see projects.tasks) and answered with 202 Accepted and the job status URL.
 
     """
     pagination_class = BasePagination
@@ -31,7 +49,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         Get the queryset of projects.
 
-        The queryset is filtered based on the user.
+        The queryset is filtered based on the user. Nested issues and contributors,
+        along with the users they reference, are prefetched so that serializing a page
+        costs a fixed number of queries whatever the size of the projects. Only the
+        relations the serializer renders for this request are prefetched.
 
         Returns:
             Queryset: The queryset of projects.
@@ -39,7 +60,58 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         self.paginator.message = self.paginator_list_message.format(user)
-        return Project.objects.filter(contributed_project__user=user).order_by('-id')
+        fields = self.get_serializer().fields
+        prefetches = []
+        if 'issues' in fields:
+            prefetches.append(Prefetch('project_issues', queryset=select_rendered(
+                Issue.objects.all(), fields['issues'].child.fields)))
+        if 'contributors' in fields:
+            prefetches.append(Prefetch('contributed_project', queryset=select_rendered(
+                Contributor.objects.all(), fields['contributors'].child.fields)))
+        return Project.objects.filter(contributed_project__user=user).order_by('-id').prefetch_related(*prefetches)
+
+    async def aget_queryset(self):
+        """
+        Get the queryset of projects, which is built without querying the database.
+        """
+        return self.get_queryset()
+
+    async def aget_project_id(self):
+        """
+        Get the id of the requested project when the user contributes to it, None otherwise.
+        """
+        try:
+            project_id = int(self.kwargs['pk'])
+        except ValueError:
+            return None
+        if not await sync_to_async(get_resolver().is_contributor)(self.request.user, project_id):
+            return None
+        return project_id
+
+    async def aget_validators(self):
+        """
+        Get the version of the projects of the user, or of the requested project.
+
+        Outsiders get no validators: their request goes on to be refused.
+        """
+        if not self.detail:
+            return await user_projects_validators(self.request.user)
+        project_id = await self.aget_project_id()
+        if project_id is None:
+            return None
+        return await project_validators(project_id)
+
+    async def aget_cache_dependencies(self):
+        """
+        Get the ids of the projects the response is built from: every project of
+        the user, or the requested project. Responses to outsiders are not cached.
+        """
+        if not self.detail:
+            return await sync_to_async(get_resolver().project_ids)(self.request.user)
+        project_id = await self.aget_project_id()
+        if project_id is None:
+            return None
+        return [project_id]
 
     def create(self, request, *args, **kwargs):
         """
@@ -66,3 +138,160 @@ class ProjectViewSet(viewsets.ModelViewSet):
         except Exception as e:
             error_message = f"An {type(e).__name__} occurred while creating the project: {str(e)}"
             return Response({"message": error_message}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def update(self, request, *args, **kwargs):
+        """
+        Update a project.
+
+        The project is loaded with its nested issues and contributors prefetched,
+        which the update makes stale. They are prefetched again for the response,
+        since rendering them from the unprefetched relations costs queries per row.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response with the updated project.
+
+        """
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        instance._prefetched_objects_cache = {}
+        prefetch_related_objects([instance], *self.get_queryset()._prefetch_related_lookups)
+        return Response(serializer.data)
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Queue the deletion of a project, see projects.tasks.delete_project.
+
+        The project and everything it contains are deleted by a worker, in
+        batches: the project stays readable until then.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: 202 Accepted with the job deleting the project.
+
+        """
+        # The project is fetched on its own: get_object() would prefetch every issue.
+        project = get_object_or_404(Project, pk=self.kwargs['pk'])
+        self.check_object_permissions(request, project)
+
+        job, _ = enqueue('projects.delete_project', {'project_id': project.pk}, user=request.user,
+                         key=f'projects.delete_project:{project.pk}')
+        return accepted_response(request, job, 'Project deletion queued.')
+
+    @action(detail=True, methods=['get', 'post'])
+    def export(self, request, *args, **kwargs):
+        """
+        Stream every issue and comment of the project, or queue their export with POST.
+
+        The format is chosen with the `output` query parameter: `ndjson` (default) or `csv`.
+        A queued export is downloaded from the result URL of its job once written,
+        see projects.tasks.export_project.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            StreamingHttpResponse: The streamed export, or 202 Accepted with the job writing it.
+
+        """
+        export_format = request.query_params.get('output', 'ndjson')
+        if export_format not in ProjectExport.formats:
+            return Response({"message": f"Unknown export format '{export_format}'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # The project is fetched on its own: get_object() would prefetch every issue.
+        project = get_object_or_404(Project, pk=self.kwargs['pk'])
+        if request.method == 'POST':
+            # Queuing an export only reads the project, which contributors may do.
+            if not (request.user.is_authenticated and project.is_contributor(request.user)):
+                self.permission_denied(request)
+            key = f'projects.export_project:{project.pk}:{export_format}:{request.user.pk}'
+            job, _ = enqueue('projects.export_project', {'project_id': project.pk, 'format': export_format},
+                             user=request.user, key=key)
+            return accepted_response(request, job, 'Project export queued.')
+        self.check_object_permissions(request, project)
+
+        export = ProjectExport(project.pk)
+        response = StreamingHttpResponse(
+            export.lines(export_format), content_type=ProjectExport.formats[export_format])
+        response['Content-Disposition'] = f'attachment; filename="project-{project.pk}.{export_format}"'
+        return response
+
+    @action(detail=True, methods=['post'])
+    def recount(self, request, *args, **kwargs):
+        """
+        Queue the rebuild of the issue, contributor and comment counters of the project.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: 202 Accepted with the job recounting the project.
+
+        """
+        project = get_object_or_404(Project, pk=self.kwargs['pk'])
+        self.check_object_permissions(request, project)
+
+        job, _ = enqueue('projects.recount', {'project_id': project.pk}, user=request.user,
+                         key=f'projects.recount:{project.pk}')
+        return accepted_response(request, job, 'Project counters rebuild queued.')
+
+    @action(detail=True, methods=['get'])
+    async def stats(self, request, *args, **kwargs):
+        """
+        Count the issues of the project by status, priority, tag and assignee.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response with the statistics of the project.
+
+        """
+        async def respond(request, *args, **kwargs):
+            project_id = await self.aget_project_id()
+            if project_id is None:
+                raise Http404('No Project matches the given query.')
+            statistics = await ProjectStatistics([project_id]).acollect()
+            return Response({'message': 'Project statistics.', 'data': statistics[0]})
+
+        return await self.conditional_response(respond, request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'], url_path='stats', url_name='all-stats')
+    async def all_stats(self, request, *args, **kwargs):
+        """
+        Count the issues of every project of the user by status, priority, tag and assignee.
+
+        Args:
+            request: The HTTP request.
+            args: Additional arguments.
+            kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response with the statistics of each project.
+
+        """
+        async def respond(request, *args, **kwargs):
+            project_ids = await sync_to_async(get_resolver().project_ids)(request.user)
+            statistics = await ProjectStatistics(sorted(project_ids, reverse=True)).acollect()
+            return Response({'message': 'Projects statistics.', 'data': statistics})
+
+        return await self.conditional_response(respond, request, *args, **kwargs)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SofdeskConfig(AppConfig):
+    name = 'sofdesk'
+
+    def ready(self):
+        from . import database  # noqa: F401
+        from . import checks  # noqa: F401
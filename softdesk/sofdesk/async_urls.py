@@ -0,0 +1,8 @@
+"""
+The URLconf served under ASGI: the patterns of sofdesk.urls, with the views
+dispatching coroutine handlers on the event loop, see sofdesk.views.
+"""
+from sofdesk.urls import urlpatterns as sync_urlpatterns
+from sofdesk.views import async_urlpatterns
+
+urlpatterns = async_urlpatterns(sync_urlpatterns)
@@ -0,0 +1,32 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The SQLite backend of Django, with the transaction_mode option of Django 5.1.
+
+    OPTIONS['transaction_mode'] is DEFERRED, IMMEDIATE or EXCLUSIVE: the
+    transactions begin with BEGIN <transaction_mode> instead of a plain BEGIN.
+    Django 4.2 would pass the option on to sqlite3.connect(), which refuses it.
+    """
+
+    transaction_modes = frozenset(['DEFERRED', 'EXCLUSIVE', 'IMMEDIATE'])
+    transaction_mode = None
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        transaction_mode = params.pop('transaction_mode', None)
+        if transaction_mode is not None and transaction_mode.upper() not in self.transaction_modes:
+            allowed = ', '.join(sorted(self.transaction_modes))
+            raise ImproperlyConfigured(
+                f"settings.DATABASES['{self.alias}']['OPTIONS']['transaction_mode'] is {transaction_mode!r}: "
+                f"use one of {allowed}, or None.")
+        self.transaction_mode = transaction_mode.upper() if transaction_mode else None
+        return params
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,104 @@
+import json
+import sys
+from io import BytesIO
+
+
+def percentile(values, rank):
+    """
+    Return the percentile of a list of durations in seconds, in milliseconds.
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * rank / 100))] * 1000
+
+
+def change(current, previous):
+    """
+    Return the change of a number since a previous run, in percent.
+    """
+    return (current - previous) / previous * 100 if previous else 0
+
+
+def summarize(latencies, queries, sizes, statuses):
+    """
+    Return the latency percentiles, median query count and response size,
+    and the statuses of the requests sent to a route.
+    """
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries': sorted(queries)[len(queries) // 2],
+        'bytes': sorted(sizes)[len(sizes) // 2],
+        'statuses': sorted(set(statuses)),
+    }
+
+
+class ASGIClient:
+    """
+    Send requests straight to an ASGI application, as an ASGI server would.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def request(self, method, path, body=None, headers=()):
+        data = json.dumps(body).encode() if body is not None else b''
+        path, _, query_string = path.partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query_string.encode(), 'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+            'headers': [(b'host', b'localhost'), (b'content-type', b'application/json'),
+                        (b'content-length', str(len(data)).encode()),
+                        *((name.lower().encode(), value.encode()) for name, value in headers)],
+        }
+        messages = [{'type': 'http.request', 'body': data, 'more_body': False}]
+        status, chunks = None, []
+
+        async def receive():
+            return messages.pop() if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            else:
+                chunks.append(message.get('body', b''))
+
+        await self.application(scope, receive, send)
+        return status, b''.join(chunks)
+
+
+class WSGIClient:
+    """
+    Send requests straight to a WSGI application, as a WSGI server would.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    def request(self, method, path, body=None, headers=()):
+        data = json.dumps(body).encode() if body is not None else b''
+        path, _, query_string = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query_string,
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost', 'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(data)),
+            'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(data),
+            'wsgi.errors': sys.stderr, 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+            **{'HTTP_' + name.upper().replace('-', '_'): value for name, value in headers},
+        }
+        status = None
+
+        def start_response(response_status, response_headers, exc_info=None):
+            nonlocal status
+            status = int(response_status.split()[0])
+
+        response = self.application(environ, start_response)
+        try:
+            return status, b''.join(response)
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
@@ -0,0 +1,129 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register, run_checks
+from django.db import connections
+
+from sofdesk.database import get_pragmas, read_pragmas
+
+
+logger = logging.getLogger(__name__)
+
+# The pragmas reported by describe_configuration.
+DESCRIBED_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size', 'temp_store')
+
+# The numbers SQLite reports for the pragma values set by name.
+_named_values = {
+    'synchronous': {'off': '0', 'normal': '1', 'full': '2', 'extra': '3'},
+    'temp_store': {'default': '0', 'file': '1', 'memory': '2'},
+}
+
+
+def _normalize(name, value):
+    value = str(value).lower()
+    return _named_values.get(name, {}).get(value, value)
+
+
+@register('configuration')
+def check_profile(app_configs, **kwargs):
+    """
+    Check that the production profile runs with the settings it is meant for.
+    """
+    messages = []
+    if getattr(settings, 'PROFILE', None) != 'production':
+        return messages
+    if settings.DEBUG:
+        messages.append(Warning(
+            'DEBUG is on in the production profile.',
+            hint='Django keeps every query of a request in memory while DEBUG is on: unset SOFTDESK_DEBUG.',
+            id='sofdesk.W001'))
+    if settings.SECRET_KEY.startswith('django-insecure-'):
+        messages.append(Error(
+            'The production profile runs with the development SECRET_KEY.',
+            hint='Set SOFTDESK_SECRET_KEY.', id='sofdesk.E002'))
+    if not settings.ALLOWED_HOSTS and not settings.DEBUG:
+        messages.append(Warning(
+            'ALLOWED_HOSTS is empty: every request is refused.',
+            hint='Set SOFTDESK_ALLOWED_HOSTS.', id='sofdesk.W003'))
+    for alias, database in settings.DATABASES.items():
+        if not database.get('CONN_MAX_AGE'):
+            messages.append(Warning(
+                f'The connections to the {alias} database are closed after each request.',
+                hint='Set SOFTDESK_CONN_MAX_AGE to the seconds they are kept open.', id='sofdesk.W004'))
+    for alias, cache in settings.CACHES.items():
+        if cache['BACKEND'].endswith('.LocMemCache'):
+            messages.append(Warning(
+                f'The {alias} cache is local to each process: '
+                'the entries invalidated by one worker process stay in the others.',
+                hint='Set SOFTDESK_CACHE to file, database or redis.', id='sofdesk.W005'))
+    return messages
+
+
+@register('configuration', Tags.database)
+def check_pragmas(app_configs, databases=None, **kwargs):
+    """
+    Check that the SQLite databases run with the pragmas of settings.SQLITE_PRAGMAS,
+    which SQLite may refuse, e.g. the WAL journal on a network filesystem.
+    """
+    messages = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+            continue
+        pragmas = get_pragmas()
+        effective = read_pragmas(connection, [name for name, _ in pragmas])
+        for name, value in pragmas:
+            if _normalize(name, effective[name]) != _normalize(name, value):
+                messages.append(Warning(
+                    f'PRAGMA {name} of the {alias} database is {effective[name]}, not {value}.',
+                    id='sofdesk.W006'))
+    return messages
+
+
+def describe_configuration():
+    """
+    Return the effective configuration: profile, databases with the pragmas
+    in effect on their connections, cache backends and request timing.
+    """
+    databases = {}
+    for alias, database in settings.DATABASES.items():
+        connection = connections[alias]
+        databases[alias] = {
+            'engine': database['ENGINE'],
+            'name': str(database['NAME']),
+            'conn_max_age': database.get('CONN_MAX_AGE', 0),
+        }
+        if connection.vendor == 'sqlite':
+            databases[alias]['pragmas'] = read_pragmas(connection, DESCRIBED_PRAGMAS)
+    return {
+        'profile': getattr(settings, 'PROFILE', None),
+        'debug': settings.DEBUG,
+        'allowed_hosts': settings.ALLOWED_HOSTS,
+        'databases': databases,
+        'caches': {alias: {'backend': cache['BACKEND'], 'location': cache.get('LOCATION', '')}
+                   for alias, cache in settings.CACHES.items()},
+        'request_timing': getattr(settings, 'REQUEST_TIMING', {}).get('ENABLED', False),
+    }
+
+
+def report_configuration():
+    """
+    Log the effective configuration and the problems the configuration checks
+    find, once the server has loaded the apps (see sofdesk/wsgi.py).
+
+    The connections opened to read the pragmas are closed, so that worker
+    processes forked afterwards do not share them.
+
+    Returns:
+    - tuple: The configuration and the messages of the checks.
+    """
+    try:
+        configuration = describe_configuration()
+        messages = run_checks(tags=['configuration'], databases=list(settings.DATABASES))
+    finally:
+        connections.close_all()
+    logger.info('Configuration %s', json.dumps(configuration, default=str))
+    for message in messages:
+        logger.log(logging.ERROR if message.is_serious() else logging.WARNING, '%s', message)
+    return configuration, messages
@@ -0,0 +1,56 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+_pragma_name = re.compile(r'^[a-z_]+$')
+_pragma_value = re.compile(r'^-?\w+$')
+
+
+def get_pragmas():
+    """
+    Return the PRAGMA statements of settings.SQLITE_PRAGMAS as (name, value) pairs.
+    """
+    pragmas = list(getattr(settings, 'SQLITE_PRAGMAS', {}).items())
+    for name, value in pragmas:
+        if not _pragma_name.match(name) or not _pragma_value.match(str(value)):
+            raise ImproperlyConfigured(f'Invalid SQLite pragma {name} = {value!r}.')
+    return pragmas
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    Run the PRAGMA statements of settings.SQLITE_PRAGMAS on each new SQLite connection.
+
+    They are run on the raw connection, so that they are neither logged nor
+    counted as queries of the request opening the connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = get_pragmas()
+    if pragmas:
+        cursor = connection.connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+
+def read_pragmas(connection, names):
+    """
+    Return the values in effect on the connection of the given pragmas.
+    """
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            if not _pragma_name.match(name):
+                raise ImproperlyConfigured(f'Invalid SQLite pragma {name}.')
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
@@ -0,0 +1,91 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'database': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+
+
+class Environment:
+    """
+    Typed access to the SOFTDESK_* environment variables the settings are read from.
+
+    Methods:
+    - get(name, default): The raw value of SOFTDESK_<name>, or the default when unset.
+    - get_bool(name, default): A boolean: 1/true/yes/on or 0/false/no/off.
+    - get_int(name, default): An integer.
+    - get_list(name, default): A comma-separated list.
+
+    Malformed values raise ImproperlyConfigured.
+    """
+    prefix = 'SOFTDESK_'
+    true_values = ('1', 'true', 'yes', 'on')
+    false_values = ('0', 'false', 'no', 'off', '')
+
+    def __init__(self, environ=None):
+        self.environ = os.environ if environ is None else environ
+
+    def get(self, name, default=None):
+        return self.environ.get(self.prefix + name, default)
+
+    def get_bool(self, name, default):
+        value = self.get(name)
+        if value is None:
+            return default
+        if value.strip().lower() in self.true_values:
+            return True
+        if value.strip().lower() in self.false_values:
+            return False
+        raise ImproperlyConfigured(f'{self.prefix}{name} must be a boolean, not {value!r}.')
+
+    def get_int(self, name, default):
+        value = self.get(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ImproperlyConfigured(f'{self.prefix}{name} must be an integer, not {value!r}.') from None
+
+    def get_list(self, name, default):
+        value = self.get(name)
+        if value is None:
+            return default
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def cache_settings(backend, alias, location=None, **options):
+    """
+    Return the CACHES entry of an alias stored in the given backend.
+
+    Args:
+    - backend (str): One of CACHE_BACKENDS.
+    - alias (str): The cache alias, which separates the entries of the aliases
+      sharing a backend: its locmem name, directory, table or key prefix.
+    - location (str): The directory of the file backend, or the URL of the
+      Redis server. Unused by the other backends.
+    - options: Other keys of the entry, e.g. TIMEOUT.
+
+    Returns:
+    - dict: The entry of the CACHES setting.
+    """
+    if backend not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"Unknown cache backend {backend!r}, expected one of {', '.join(CACHE_BACKENDS)}.")
+    if backend == 'locmem':
+        location = alias
+    elif backend == 'file':
+        location = os.path.join(location, alias)
+    elif backend == 'database':
+        location = f'softdesk_cache_{alias}'
+    elif backend == 'redis':
+        # Redis evicts entries itself, and would pass MAX_ENTRIES on to its client.
+        options['OPTIONS'] = {key: value for key, value in options.get('OPTIONS', {}).items()
+                              if key != 'MAX_ENTRIES'}
+        options.setdefault('KEY_PREFIX', alias)
+    return {'BACKEND': CACHE_BACKENDS[backend], 'LOCATION': location, **options}
@@ -0,0 +1,19 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from sofdesk.checks import describe_configuration
+
+
+class Command(BaseCommand):
+    """
+    Print the effective configuration, then run the configuration checks,
+    which fail the command on errors.
+    """
+    help = 'Report the effective configuration and check it.'
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(describe_configuration(), indent=2, default=str))
+        self.check(tags=['configuration'], databases=list(settings.DATABASES), display_num_errors=True)
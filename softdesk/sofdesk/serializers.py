@@ -0,0 +1,208 @@
+from operator import itemgetter
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from sofdesk.timing import timed
+
+
+def parse_selection(value):
+    """
+    Parse a comma-separated list of dotted field names into a tree.
+
+    Example: 'id,issues.title' gives {'id': {}, 'issues': {'title': {}}}, and
+    None (parameter missing) gives None.
+    """
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def related_sources(fields):
+    """
+    Return the sources of the nested serializers among the fields, i.e. the
+    relations to join or prefetch to render them.
+    """
+    return [field.source for field in fields.values() if isinstance(field, serializers.BaseSerializer)]
+
+
+def select_rendered(queryset, fields):
+    """
+    Join the relations rendered by the nested serializers among the fields.
+
+    Unlike select_related() without arguments, no relation is joined when none is rendered.
+    """
+    sources = related_sources(fields)
+    return queryset.select_related(*sources) if sources else queryset
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer counting the time spent rendering its data in the timings
+    of the request, see sofdesk.timing. Serializers set it as the
+    `Meta.list_serializer_class` along with TimedSerializerMixin.
+    """
+
+    @property
+    def data(self):
+        with timed('serialization'):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Count the time spent rendering the data of the serializer in the timings
+    of the request, see sofdesk.timing.
+    """
+
+    @property
+    def data(self):
+        with timed('serialization'):
+            return super().data
+
+
+class SparseFieldsMixin:
+    """
+    Render only the fields selected by the `fields` and `expand` query parameters
+    of read requests.
+
+    `?fields=id,title` keeps the listed fields. The costly fields, named in
+    `Meta.expandable_fields` (nested serializers, computed URLs), are kept when
+    neither parameter is given, and otherwise only when listed in `fields` or
+    `expand`. Dotted names select the fields of nested serializers:
+    `?fields=id,issues.title&expand=issues.author_details`.
+
+    Write-only fields are always kept, and write requests are not affected.
+
+    Attributes:
+    - field_selection: The (fields, expand) trees of a nested serializer, set by its parent.
+
+    Methods:
+    - get_selection(): Return the (fields, expand) trees applying to the serializer.
+    """
+
+    def get_selection(self):
+        if hasattr(self, 'field_selection'):
+            return self.field_selection
+        root = self.root
+        if self is not root and getattr(root, 'child', None) is not self:
+            return None, None
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return None, None
+        params = getattr(request, 'query_params', request.GET)
+        return parse_selection(params.get('fields')), parse_selection(params.get('expand'))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, expanded = self.get_selection()
+        if selected is None and expanded is None:
+            return fields
+
+        expandable = getattr(self.Meta, 'expandable_fields', ())
+        kept = {}
+        for name, field in fields.items():
+            if name in expandable:
+                keep = name in (selected or ()) or name in (expanded or ())
+            else:
+                keep = selected is None or name in selected or field.write_only
+            if not keep:
+                continue
+            kept[name] = field
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, SparseFieldsMixin):
+                nested.field_selection = (
+                    (selected.get(name) or None) if selected is not None else None,
+                    expanded.get(name) if expanded is not None else None,
+                )
+        return kept
+
+
+# Fields whose to_representation() returns the value read from the database unchanged.
+PLAIN_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField, serializers.ReadOnlyField,
+)
+
+
+class ValuesRepresentation:
+    """
+    Read-only representation compiled from the fields a serializer renders,
+    turning the rows of QuerySet.values() into the same dicts as the serializer.
+
+    Each field is compiled once into a getter reading its column from a row:
+    plain fields are read as is, other fields go through their to_representation(),
+    nested serializers are compiled in turn on the columns of their relation.
+    Fields reading several attributes of the object, such as links, define
+    `values_attributes` and `represent_values(values)`.
+
+    Args:
+    - serializer: The serializer, whose `fields` tell what is rendered.
+    - prefix (str): The lookup of the relation the serializer renders, e.g. 'author__'.
+
+    Attributes:
+    - lookups (list): The columns to pass to QuerySet.values().
+
+    Methods:
+    - to_representation(row): Return the representation of a row.
+    - represent(rows): Return the representations of the rows.
+    """
+
+    def __init__(self, serializer, prefix=''):
+        self.lookups = []
+        self.getters = []
+        for name, field in serializer.fields.items():
+            if not field.write_only:
+                self.getters.append((name, self.compile(field, prefix)))
+
+    def add_lookup(self, lookup):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return lookup
+
+    def compile(self, field, prefix):
+        if isinstance(field, serializers.BaseSerializer):
+            if getattr(field, 'many', False) or field.source == '*' or '.' in field.source:
+                raise TypeError(f'{type(field).__name__} cannot be rendered from values: {field.field_name}')
+            nested = ValuesRepresentation(field, prefix=f'{prefix}{field.source}__')
+            for lookup in nested.lookups:
+                self.add_lookup(lookup)
+            key = self.add_lookup(f'{prefix}{field.source}')
+            return lambda row: None if row[key] is None else nested.to_representation(row)
+
+        if hasattr(field, 'values_attributes'):
+            keys = {attribute: self.add_lookup(f'{prefix}{attribute}') for attribute in field.values_attributes}
+            return lambda row: field.represent_values({attribute: row[key] for attribute, key in keys.items()})
+
+        if field.source == '*' or '.' in field.source:
+            raise TypeError(f'{type(field).__name__} cannot be rendered from values: {field.field_name}')
+        key = self.add_lookup(f'{prefix}{field.source}')
+        if isinstance(field, PLAIN_FIELDS) and not getattr(field, 'pk_field', None):
+            return itemgetter(key)
+        represent = field.to_representation
+        return lambda row: None if row[key] is None else represent(row[key])
+
+    def to_representation(self, row):
+        return {name: get(row) for name, get in self.getters}
+
+    def represent(self, rows):
+        with timed('serialization'):
+            return [{name: get(row) for name, get in self.getters} for row in rows]
+
+
+class ValuesSerializerMixin:
+    """
+    Serializers that can render the rows of QuerySet.values(), see ValuesRepresentation.
+
+    Methods:
+    - values_representation(): Return the representation compiled from the rendered fields.
+    """
+
+    def values_representation(self):
+        return ValuesRepresentation(self)
@@ -12,20 +12,40 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+from sofdesk.environment import Environment, cache_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Settings marked SOFTDESK_<NAME> below are read from the environment variable of
+# that name, see sofdesk.environment.
+env = Environment()
+
+# SOFTDESK_PROFILE: 'development' (default) or 'production'. The production profile
+# turns DEBUG off, keeps database connections open, tunes SQLite and shares the
+# caches between worker processes. `manage.py configuration` reports the effective
+# configuration, which servers also log when they start, see sofdesk.checks.
+PROFILE = env.get('PROFILE', 'development')
+if PROFILE not in ('development', 'production'):
+    raise ImproperlyConfigured(f"SOFTDESK_PROFILE must be 'development' or 'production', not {PROFILE!r}.")
+PRODUCTION = PROFILE == 'production'
 
-# Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-c@o4@q&x6usae*z&5&rz@min(n6$=l_i&uef0^e1gjvcizbek#'
+# SOFTDESK_SECRET_KEY
+SECRET_KEY = env.get('SECRET_KEY', 'django-insecure-c@o4@q&x6usae*z&5&rz@min(n6$=l_i&uef0^e1gjvcizbek#')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# SOFTDESK_DEBUG: on in development. DEBUG keeps every query in connection.queries.
+DEBUG = env.get_bool('DEBUG', not PRODUCTION)
 
-ALLOWED_HOSTS = []
+# SOFTDESK_ALLOWED_HOSTS: comma-separated.
+ALLOWED_HOSTS = env.get_list('ALLOWED_HOSTS', [])
 
 
 # Application definition
@@ -41,21 +61,29 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     'rest_framework_simplejwt.token_blacklist',
     'users',
-    'projects'
+    'projects',
+    'jobs',
+    'sofdesk',
 ]
 
 MIDDLEWARE = [
+    'sofdesk.timing.TimingMiddleware',
+    'sofdesk.views.AsyncViewsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'projects.memberships.MembershipMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'sofdesk.urls'
 
+# The URLconf of the requests served under ASGI, see sofdesk.views.AsyncViewsMiddleware.
+ASYNC_URLCONF = 'sofdesk.async_urls'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -87,7 +115,7 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 5,
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
 
 }
@@ -97,16 +125,140 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# In-memory filter of blacklisted refresh tokens, see users.tokens.BlacklistFilter.
+# Tokens blacklisted by another process are read every REFRESH_INTERVAL seconds,
+# and the filter is reloaded whole every REBUILD_INTERVAL seconds.
+TOKEN_BLACKLIST_FILTER = {
+    'CAPACITY': 100000,
+    'ERROR_RATE': 0.001,
+    'REFRESH_INTERVAL': 5,
+    'REBUILD_INTERVAL': 60,
+}
+
+# Seconds between two purges of the expired tokens by the workers of
+# `manage.py run_jobs`, see users.tasks.purge_tokens; None to disable.
+TOKEN_PURGE_INTERVAL = 3600
+TOKEN_PURGE_BATCH_SIZE = 1000
+
+# Threads hashing passwords for login and registration, see users.hashing.
+# Requests beyond MAX_PENDING waiting hashings are answered with a 503.
+PASSWORD_HASHING_EXECUTOR = {
+    'MAX_WORKERS': 2,
+    'MAX_PENDING': 32,
+}
+
+# Background jobs run by `manage.py run_jobs`, see jobs.queue: project and user
+# deletions, project exports and counter rebuilds. A job is leased for
+# LEASE_SECONDS, renewed while it runs, and run again once the lease of a worker
+# that stopped expires. Failing jobs are retried after RETRY_DELAY seconds,
+# doubled at each attempt, until MAX_ATTEMPTS. Finished jobs and the files they
+# wrote in RESULTS_DIR are purged after RETENTION_DAYS.
+# SOFTDESK_JOB_RESULTS_DIR: the directory of the files written by the jobs.
+JOB_QUEUE = {
+    'CONCURRENCY': 2,
+    'LEASE_SECONDS': 300,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY': 30,
+    'RESULTS_DIR': env.get('JOB_RESULTS_DIR', str(BASE_DIR / 'job_results')),
+    'RETENTION_DAYS': 7,
+}
+
+# SQL queries and time spent per request, see sofdesk.timing. The timings are sent
+# in a Server-Timing header, and requests over either threshold (None to disable it)
+# are logged by the `sofdesk.timing` logger. Disabled, the middleware is not loaded.
+# SOFTDESK_REQUEST_TIMING: on with DEBUG.
+REQUEST_TIMING = {
+    'ENABLED': env.get_bool('REQUEST_TIMING', DEBUG),
+    'SERVER_TIMING_HEADER': True,
+    'SLOW_REQUEST_MS': 500,
+    'SLOW_REQUEST_QUERIES': 50,
+}
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# SOFTDESK_DATABASE: the path of the SQLite database.
+# SOFTDESK_CONN_MAX_AGE: the seconds a connection is kept open across requests,
+# 0 to close it after each request. 600 in production.
+# The transactions begin with BEGIN IMMEDIATE, taking the write lock first: in WAL
+# mode, a transaction reading before it writes, e.g. a deletion collecting the rows
+# it cascades to, fails at once with "database is locked" when another connection
+# commits in between, instead of waiting busy_timeout for the lock. Django < 5.1
+# needs sofdesk.backends.sqlite3 for the transaction_mode option.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': 'django.db.backends.sqlite3' if django.VERSION >= (5, 1) else 'sofdesk.backends.sqlite3',
+        'NAME': env.get('DATABASE', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': env.get_int('CONN_MAX_AGE', 600 if PRODUCTION else 0),
+        'CONN_HEALTH_CHECKS': PRODUCTION,
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
 }
 
+# PRAGMA statements run on each new SQLite connection, see sofdesk.database. In
+# production: write-ahead logging, so that reads do not wait for writes, fsync at
+# checkpoints only, waiting 5s for locks, 256MB of memory-mapped I/O and a 64MB
+# page cache per connection.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 268435456,
+    'cache_size': -65536,
+    'temp_store': 'MEMORY',
+} if PRODUCTION else {}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# SOFTDESK_CACHE: the backend of every cache, one of locmem (in development), file
+# (in production), database (after `createcachetable`) or redis (with redis-py
+# installed). Caches local to a process, locmem, do not see the invalidations of
+# the other worker processes.
+# SOFTDESK_CACHE_LOCATION: the directory of the file caches, or the Redis URL.
+CACHE_BACKEND = env.get('CACHE', 'file' if PRODUCTION else 'locmem')
+CACHE_LOCATION = env.get('CACHE_LOCATION', str(BASE_DIR / 'cache'))
+
+CACHES = {
+    'default': cache_settings(CACHE_BACKEND, 'default', CACHE_LOCATION),
+    # Memberships (user, project) -> role, evicted least recently used first.
+    'memberships': cache_settings(
+        CACHE_BACKEND, 'memberships', CACHE_LOCATION, TIMEOUT=300, OPTIONS={'MAX_ENTRIES': 10000}),
+    # Serialized project responses, see projects.responses.
+    'responses': cache_settings(
+        CACHE_BACKEND, 'responses', CACHE_LOCATION, TIMEOUT=300, OPTIONS={'MAX_ENTRIES': 10000}),
+}
+
+# Alias of the cache holding memberships across requests, None to disable it.
+MEMBERSHIP_CACHE = 'memberships'
+
+# Alias of the cache holding the project list and detail responses, None to disable it.
+RESPONSE_CACHE = 'responses'
+
+# Alias of the cache holding the users resolved from JWT access tokens.
+AUTH_USER_CACHE = 'default'
+AUTH_USER_CACHE_TIMEOUT = 300
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+
+# SOFTDESK_LOG_LEVEL: the level of the `sofdesk` loggers: the configuration
+# reported at startup, slow requests; and of the `jobs` loggers: the jobs run.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'sofdesk': {'handlers': ['console'], 'level': env.get('LOG_LEVEL', 'INFO')},
+        'jobs': {'handlers': ['console'], 'level': env.get('LOG_LEVEL', 'INFO')},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
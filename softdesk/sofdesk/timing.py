@@ -0,0 +1,184 @@
+import logging
+import time
+from contextlib import ExitStack, nullcontext
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+_current_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """
+    The SQL queries and the time spent in each stage of a request.
+
+    Stages may overlap: the queries run while checking permissions count in
+    both `db` and `permissions`.
+
+    Attributes:
+    - queries (int): The number of SQL queries.
+    - durations (dict): The seconds spent by stage: db, serialization, permissions.
+
+    Methods:
+    - add(stage, seconds): Count time spent in a stage.
+    - server_timing(total): Return the value of the Server-Timing header.
+    - as_dict(total): Return the timings in milliseconds, for the logs.
+    """
+    stages = ('db', 'serialization', 'permissions')
+
+    def __init__(self):
+        self.queries = 0
+        self.durations = dict.fromkeys(self.stages, 0.0)
+
+    def add(self, stage, seconds):
+        self.durations[stage] += seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Execute wrapper (see connection.execute_wrapper) counting the queries.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.durations['db'] += time.perf_counter() - start
+            self.queries += 1
+
+    def server_timing(self, total):
+        metrics = [f'db;dur={self.durations["db"] * 1000:.2f};desc="{self.queries} queries"']
+        metrics += [f'{stage};dur={self.durations[stage] * 1000:.2f}' for stage in self.stages[1:]]
+        metrics.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(metrics)
+
+    def as_dict(self, total):
+        timings = {f'{stage}_ms': round(seconds * 1000, 2) for stage, seconds in self.durations.items()}
+        return {'queries': self.queries, 'total_ms': round(total * 1000, 2), **timings}
+
+
+class StageTimer:
+    """
+    Context manager counting the time spent in its block in a stage of the timings.
+    """
+    __slots__ = ('timings', 'stage', 'start')
+
+    def __init__(self, timings, stage):
+        self.timings = timings
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.stage, time.perf_counter() - self.start)
+
+
+_untimed = nullcontext()
+
+
+def timed(stage):
+    """
+    Return a context manager counting the time spent in its block in a stage
+    of the current request, or a shared no-op one when no request is timed.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return _untimed
+    return StageTimer(timings, stage)
+
+
+class TimingMiddleware:
+    """
+    Time the SQL queries, serialization and permission checks of each request.
+
+    The timings are sent in a Server-Timing header, and requests exceeding the
+    thresholds of the REQUEST_TIMING setting are logged as warnings of the
+    `sofdesk.timing` logger, with the timings in the `timings` extra. The
+    middleware removes itself when REQUEST_TIMING['ENABLED'] is false, leaving
+    the stage hooks (see timed) a context variable lookup to do.
+
+    Queries are counted with an execute wrapper installed on the connections
+    of the thread running the database calls of the request: the thread
+    handling it under WSGI, and under ASGI the thread the synchronous code and
+    the async ORM of the request are run in (see sync_to_async), where the
+    middleware installs and removes the wrapper.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = getattr(settings, 'REQUEST_TIMING', {})
+        if not options.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = options.get('SERVER_TIMING_HEADER', True)
+        self.slow_ms = options.get('SLOW_REQUEST_MS')
+        self.slow_queries = options.get('SLOW_REQUEST_QUERIES')
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with self.count_queries(timings):
+                response = self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            stack = await sync_to_async(self.count_queries)(timings)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current_timings.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    def count_queries(self, timings):
+        """
+        Install the execute wrapper of the timings on the connections of the
+        current thread, and return the ExitStack removing it.
+        """
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings))
+        return stack
+
+    def finish(self, request, response, timings, total):
+        if self.header:
+            response['Server-Timing'] = timings.server_timing(total)
+        if self.is_slow(timings, total):
+            self.log(request, response, timings, total)
+        return response
+
+    def is_slow(self, timings, total):
+        return ((self.slow_ms is not None and total * 1000 >= self.slow_ms)
+                or (self.slow_queries is not None and timings.queries >= self.slow_queries))
+
+    def log(self, request, response, timings, total):
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            **timings.as_dict(total),
+        }
+        logger.warning('Slow request %s', ' '.join(f'{key}={value}' for key, value in entry.items()),
+                       extra={'timings': entry})
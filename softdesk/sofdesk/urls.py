@@ -5,4 +5,5 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(('users.urls', 'users'), namespace='users')),
     path('api/', include(('projects.urls', 'projects'), namespace='projects')),
+    path('api/', include(('jobs.urls', 'jobs'), namespace='jobs')),
 ]
@@ -0,0 +1,153 @@
+import asyncio
+from functools import update_wrapper
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import URLPattern, URLResolver
+from rest_framework.views import APIView
+
+from sofdesk.timing import timed
+
+
+class AsyncDispatchMixin:
+    """
+    Dispatch requests to handlers that may be coroutines, on the event loop under ASGI only.
+
+    as_view() returns a synchronous view, served under WSGI: coroutine handlers,
+    e.g. the list and retrieve actions of AsyncModelViewSet, are run with
+    async_to_sync(), the other handlers, writes included, run as in APIView
+    without an event loop. Its `async_view` counterpart is served under ASGI,
+    see AsyncViewsMiddleware: authentication, permission and throttling checks
+    run in a worker thread since they may query the database, coroutine
+    handlers are awaited on the event loop, so that they release it while
+    waiting on the database, and the other handlers run in a worker thread.
+
+    Methods:
+    - as_view(**initkwargs): Return the synchronous view, with the coroutine one as `async_view`.
+    - dispatch(request, *args, **kwargs): Like APIView.dispatch, running coroutine handlers with async_to_sync().
+    - adispatch(request, *args, **kwargs): Like APIView.dispatch, awaiting the handler.
+    """
+    async_dispatch = False
+    # The view returned by as_view() is synchronous whatever its handlers are.
+    view_is_async = False
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        dispatching = super().as_view(*args, async_dispatch=True, **initkwargs)
+
+        # csrf_exempt() hides that the view is a coroutine function.
+        async def async_view(request, *args, **kwargs):
+            return await dispatching(request, *args, **kwargs)
+
+        view.async_view = update_wrapper(async_view, dispatching)
+        return view
+
+    def initialize_dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        return request
+
+    def get_handler(self, request):
+        if request.method.lower() in self.http_method_names:
+            return getattr(self, request.method.lower(), self.http_method_not_allowed)
+        return self.http_method_not_allowed
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.async_dispatch:
+            return self.adispatch(request, *args, **kwargs)
+        request = self.initialize_dispatch(request, *args, **kwargs)
+
+        try:
+            self.initial(request, *args, **kwargs)
+            handler = self.get_handler(request)
+            if asyncio.iscoroutinefunction(handler):
+                handler = async_to_sync(handler)
+            response = handler(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def adispatch(self, request, *args, **kwargs):
+        request = self.initialize_dispatch(request, *args, **kwargs)
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.get_handler(request)
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_urlpatterns(patterns):
+    """
+    Return a copy of URL patterns serving the `async_view` of the views that
+    have one, see AsyncDispatchMixin.
+    """
+    copies = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            copies.append(URLResolver(pattern.pattern, async_urlpatterns(pattern.url_patterns),
+                                      pattern.default_kwargs, pattern.app_name, pattern.namespace))
+        else:
+            callback = getattr(pattern.callback, 'async_view', pattern.callback)
+            copies.append(URLPattern(pattern.pattern, callback, pattern.default_args, pattern.name))
+    return copies
+
+
+class AsyncViewsMiddleware:
+    """
+    Resolve the requests handled on the event loop, under ASGI, with the URLconf
+    of settings.ASYNC_URLCONF, which serves the coroutine views of
+    AsyncDispatchMixin. The middleware removes itself under WSGI, where the
+    views of settings.ROOT_URLCONF are served.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not iscoroutinefunction(get_response):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.urlconf = settings.ASYNC_URLCONF
+        markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        request.urlconf = self.urlconf
+        return await self.get_response(request)
+
+
+class TimedPermissionsMixin:
+    """
+    Count the time spent checking permissions in the timings of the request,
+    see sofdesk.timing.
+    """
+
+    def check_permissions(self, request):
+        with timed('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timed('permissions'):
+            super().check_object_permissions(request, obj)
+
+
+class AsyncAPIView(AsyncDispatchMixin, TimedPermissionsMixin, APIView):
+    """
+    APIView whose handlers may be coroutines, see AsyncDispatchMixin.
+    """
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sofdesk.settings')
 
 application = get_wsgi_application()
+
+# Imported once the apps are loaded.
+from sofdesk.checks import report_configuration  # noqa: E402
+
+report_configuration()
@@ -0,0 +1 @@
+from .jwt import CachedJWTAuthentication, forget_user
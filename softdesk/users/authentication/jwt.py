@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+
+def get_user_cache():
+    return caches[getattr(settings, 'AUTH_USER_CACHE', 'default')]
+
+
+def make_user_key(user_id):
+    """
+    Return the cache key of a user, built from the claim and the field the
+    tokens identify users with.
+    """
+    return f'auth-user-fields:{api_settings.USER_ID_CLAIM}:{api_settings.USER_ID_FIELD}:{user_id}'
+
+
+def forget_user(user_id):
+    """
+    Drop a user from the authentication cache.
+    """
+    get_user_cache().delete(make_user_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication resolving users from a cache instead of the database.
+
+    Access tokens are validated without any query; the user they identify is
+    looked up in the cache named by settings.AUTH_USER_CACHE and only loaded
+    from the database on a miss. Entries expire after
+    settings.AUTH_USER_CACHE_TIMEOUT seconds and are dropped whenever the user
+    is saved or deleted (see signals.py).
+
+    The cache holds the field values of the user but the password hash, which
+    the users built from it leave deferred: reading it loads it from the
+    database, and saving them does not overwrite it.
+
+    Methods:
+        get_user(validated_token): Return the user identified by the token.
+    """
+    excluded_fields = ('password',)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        cache = get_user_cache()
+        key = make_user_key(user_id)
+        fields = cache.get(key)
+        if fields is None:
+            user = super().get_user(validated_token)
+            cache.set(key, self.dump_user(user), getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300))
+            return user
+        user = self.load_user(fields)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def dump_user(self, user):
+        return {field.attname: getattr(user, field.attname) for field in self.user_model._meta.concrete_fields
+                if field.attname not in self.excluded_fields}
+
+    def load_user(self, fields):
+        return self.user_model.from_db(router.db_for_read(self.user_model), list(fields), list(fields.values()))
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from users.models import User
+from .jwt import forget_user
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_saved_user(sender, instance, **kwargs):
+    """
+    Drop a user from the authentication cache when it is updated or deleted.
+    """
+    forget_user(instance.pk)
@@ -0,0 +1 @@
+from .executor import PasswordHashingExecutor, HashingBusy, get_hashing_executor
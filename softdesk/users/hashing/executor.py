@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import hashers
+from django.contrib.auth.signals import user_login_failed
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from users.models import User
+
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many authentications in progress, retry shortly.'
+    default_code = 'hashing_busy'
+
+
+class PasswordHashingExecutor:
+    """
+    A bounded pool of threads running the password hashers.
+
+    Hashing a password takes tens of milliseconds of CPU. Running it here keeps
+    the event loop, and the threads serving the other requests, available:
+    at most `max_workers` passwords are hashed at once, and at most
+    `max_pending` hashings may be queued; beyond that, HashingBusy (503) is
+    raised instead of letting a login storm pile up.
+
+    Methods:
+    - run(func, *args): Await func(*args) on the pool.
+    - make_password(password): Return the hash of a password.
+    - authenticate(request, username, password): Return the user matching the credentials, or None.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32):
+        self.max_pending = max_pending
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hashing')
+        self.lock = threading.Lock()
+        self.pending = 0
+
+    async def run(self, func, *args):
+        with self.lock:
+            if self.pending >= self.max_pending:
+                raise HashingBusy()
+            self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+    async def make_password(self, password):
+        return await self.run(hashers.make_password, password)
+
+    async def authenticate(self, request=None, **credentials):
+        """
+        Like django.contrib.auth.authenticate() with the ModelBackend: unknown
+        users are hashed for as long as known ones, inactive users are refused,
+        hashes of outdated hashers are upgraded and failures send the
+        user_login_failed signal. Other authentication backends are run by
+        authenticate() itself, off the event loop but not on the pool.
+        """
+        if list(settings.AUTHENTICATION_BACKENDS) != [MODEL_BACKEND]:
+            return await sync_to_async(auth.authenticate)(request, **credentials)
+        username = credentials.get(User.USERNAME_FIELD)
+        password = credentials.get('password')
+        user = await User._default_manager.filter(**{User.USERNAME_FIELD: username}).afirst()
+        if user is None:
+            await self.make_password(password)
+        else:
+            encoded = user.password
+            # The setter hashes the password again on the pool when its hasher is outdated.
+            if await self.run(hashers.check_password, password, encoded, user.set_password) and user.is_active:
+                if user.password != encoded:
+                    await User._default_manager.filter(pk=user.pk).aupdate(password=user.password)
+                user.backend = MODEL_BACKEND
+                return user
+        await sync_to_async(user_login_failed.send)(
+            sender=auth.__name__, credentials=self.clean_credentials(credentials), request=request)
+        return None
+
+    @staticmethod
+    def clean_credentials(credentials):
+        """
+        Mask the password of the credentials sent with user_login_failed.
+        """
+        return {key: '********************' if key == 'password' else value for key, value in credentials.items()}
+
+
+_executor = None
+
+
+def get_hashing_executor():
+    """
+    Return the process-wide executor configured by settings.PASSWORD_HASHING_EXECUTOR.
+    """
+    global _executor
+    if _executor is None:
+        options = getattr(settings, 'PASSWORD_HASHING_EXECUTOR', {})
+        _executor = PasswordHashingExecutor(
+            max_workers=options.get('MAX_WORKERS', 2),
+            max_pending=options.get('MAX_PENDING', 32),
+        )
+    return _executor
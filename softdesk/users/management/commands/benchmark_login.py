@@ -0,0 +1,78 @@
+import asyncio
+import json
+import statistics
+import time
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from sofdesk.benchmark import ASGIClient, percentile
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Measure the login throughput, and the latency of the profile endpoint
+    served meanwhile, through the ASGI handler.
+    """
+    help = 'Benchmark concurrent logins and the latency of concurrent profile requests.'
+
+    username = 'benchmark-login'
+    password = 'benchmark-password'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=100, help='The number of logins.')
+        parser.add_argument('--concurrency', type=int, default=20, help='The number of concurrent logins.')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=self.username).first() or User.objects.create_user(
+            username=self.username, password=self.password, email='benchmark@softdesk.io',
+            date_of_birth=date(1990, 1, 1))
+        try:
+            asyncio.run(self.run(options['logins'], options['concurrency']))
+        finally:
+            user.delete()
+
+    async def run(self, logins, concurrency):
+        client = ASGIClient(get_asgi_application())
+        credentials = {'username': self.username, 'password': self.password}
+        status, body = await client.request('POST', reverse('users:login'), credentials)
+        authorization = ('authorization', f"Bearer {json.loads(body)['data']['tokens']['access']}")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        statuses = []
+
+        async def login():
+            async with semaphore:
+                status, body = await client.request('POST', reverse('users:login'), credentials)
+                statuses.append(status)
+
+        latencies = []
+        done = asyncio.Event()
+
+        async def profile():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.request('GET', reverse('users:user-profile'), headers=[authorization])
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        reader = asyncio.create_task(profile())
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await reader
+
+        await sync_to_async(self.report)(logins, statuses, elapsed, latencies)
+
+    def report(self, logins, statuses, elapsed, latencies):
+        self.stdout.write(f'Logins: {logins} in {elapsed:.2f}s ({logins / elapsed:.1f}/s), '
+                          f'{statuses.count(200)} succeeded, {statuses.count(503)} refused as busy')
+        if latencies:
+            self.stdout.write(
+                f'Profile: {len(latencies)} requests, '
+                f'p50 {percentile(latencies, 50):.1f}ms, p95 {percentile(latencies, 95):.1f}ms, '
+                f'p99 {percentile(latencies, 99):.1f}ms, mean {statistics.mean(latencies) * 1000:.1f}ms')
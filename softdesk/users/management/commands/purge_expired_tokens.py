@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from users.tokens import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    """
+    Delete expired outstanding and blacklisted tokens in bounded batches.
+    """
+    help = 'Delete expired JWT outstanding and blacklisted tokens in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='The number of tokens deleted per transaction.')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(options['batch_size'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired tokens.'))
@@ -2,7 +2,8 @@ from datetime import date
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tokens import FilteredRefreshToken
 
 
 class User(AbstractUser):
@@ -43,7 +44,7 @@ class User(AbstractUser):
         Returns:
         A dictionary containing 'refresh' and 'access' tokens.
         """
-        refresh = RefreshToken.for_user(self)
+        refresh = FilteredRefreshToken.for_user(self)
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token)
@@ -1 +1 @@
-from .user import UserSerializer, UserListSerializer, LoginSerializer, LogoutSerializer
+from .user import UserSerializer, UserListSerializer, CredentialsSerializer, LoginSerializer, LogoutSerializer
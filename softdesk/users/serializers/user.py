@@ -1,13 +1,14 @@
 from django.contrib.auth import authenticate
-from tokenize import TokenError
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework.exceptions import AuthenticationFailed
 
+from sofdesk.serializers import SparseFieldsMixin, ValuesSerializerMixin, TimedListSerializer, TimedSerializerMixin
 from users.models import User
+from users.tokens import FilteredRefreshToken
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the User model.
 
@@ -24,6 +25,7 @@ class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'username', 'email', 'date_of_birth',
                   'can_be_contacted', 'can_share_data', 'password', 'date_joined']
         ordering = ['-id']
@@ -39,10 +41,20 @@ class UserSerializer(serializers.ModelSerializer):
         Returns:
         A new User instance.
         """
-        return User.objects.create_user(**validated_data)
+        password_hash = validated_data.pop('password_hash', None)
+        if password_hash is None:
+            return User.objects.create_user(**validated_data)
 
+        # The password was hashed off the request thread, see RegisterAPIView.
+        validated_data.pop('password', None)
+        validated_data['username'] = User.normalize_username(validated_data['username'])
+        validated_data['email'] = User.objects.normalize_email(validated_data.get('email'))
+        user = User(password=password_hash, **validated_data)
+        user.save()
+        return user
 
-class UserListSerializer(serializers.ModelSerializer):
+
+class UserListSerializer(SparseFieldsMixin, ValuesSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing User objects.
 
@@ -52,10 +64,24 @@ class UserListSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = User
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'username']
 
 
-class LoginSerializer(serializers.Serializer):
+class CredentialsSerializer(serializers.Serializer):
+    """
+    Serializer for login credentials, checked by the caller.
+
+    Fields:
+    - username: The user's username.
+    - password: The user's password (write-only).
+    """
+
+    username = serializers.CharField()
+    password = serializers.CharField(write_only=True)
+
+
+class LoginSerializer(CredentialsSerializer):
     """
     Serializer for user login.
 
@@ -65,26 +91,20 @@ class LoginSerializer(serializers.Serializer):
 
     Methods:
     - validate(): Validate user credentials and generate JWT tokens.
+    - get_login_data(user): Generate JWT tokens for an authenticated user.
     """
 
-    username = serializers.CharField()
-    password = serializers.CharField(write_only=True)
-
-    def validate(self, data):
+    def get_login_data(self, user):
         """
-        Validate user credentials and generate JWT tokens.
+        Generate JWT tokens for an authenticated user.
 
         Args:
-        - data: Data containing username and password.
+        - user: The authenticated user.
 
         Returns:
         Dictionary with user ID, username, and JWT tokens.
         """
-        user = authenticate(**data)
-        if user is None:
-            raise AuthenticationFailed('Invalid credentials.')
-
-        refresh_token = RefreshToken.for_user(user)
+        refresh_token = FilteredRefreshToken.for_user(user)
         tokens = {
             'refresh': str(refresh_token),
             'access': str(refresh_token.access_token),
@@ -96,6 +116,21 @@ class LoginSerializer(serializers.Serializer):
             'tokens': tokens,
         }
 
+    def validate(self, data):
+        """
+        Validate user credentials and generate JWT tokens.
+
+        Args:
+        - data: Data containing username and password.
+
+        Returns:
+        Dictionary with user ID, username, and JWT tokens.
+        """
+        user = authenticate(**data)
+        if user is None:
+            raise AuthenticationFailed('Invalid credentials.')
+        return self.get_login_data(user)
+
 
 class LogoutSerializer(serializers.Serializer):
     """
@@ -132,7 +167,7 @@ class LogoutSerializer(serializers.Serializer):
         serializers.ValidationError: If the token is invalid or expired.
         """
         try:
-            RefreshToken(self.token).blacklist()
+            FilteredRefreshToken(self.token).blacklist()
         except TokenError:
             raise serializers.ValidationError(
                 {'token_error': 'Token is invalid or expired.'})
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import transaction
+
+from jobs.queue import register
+from users.models import User
+from users.tokens import purge_expired_tokens
+
+
+@register('users.delete_user', concurrency=1)
+def delete_user(job):
+    """
+    Delete a user deactivated by UserViewSet.delete, with their contributions,
+    issues and comments deleted in cascade.
+
+    A user reactivated since the deletion was queued is kept.
+
+    Returns:
+        dict: The number of deleted rows, by model label.
+    """
+    with transaction.atomic():
+        return User.objects.filter(pk=job.payload['user_id'], is_active=False).delete()[1]
+
+
+def token_purge_interval():
+    return getattr(settings, 'TOKEN_PURGE_INTERVAL', None)
+
+
+@register('users.purge_tokens', concurrency=1, every=token_purge_interval)
+def purge_tokens(job):
+    """
+    Delete the expired outstanding and blacklisted tokens, every
+    settings.TOKEN_PURGE_INTERVAL seconds, see jobs.queue.schedule_periodic.
+
+    Returns:
+        dict: The number of deleted outstanding tokens.
+    """
+    return {'deleted': purge_expired_tokens(getattr(settings, 'TOKEN_PURGE_BATCH_SIZE', 1000))}
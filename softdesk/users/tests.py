@@ -1,3 +1,265 @@
-from django.test import TestCase
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from jobs.models import Job
+from jobs.queue import Worker, claim, schedule_periodic
+from users.authentication.jwt import get_user_cache, make_user_key
+from users.hashing import get_hashing_executor
+from users.models import User
+from users.tokens import BlacklistFilter, BloomFilter, FilteredRefreshToken, get_blacklist_filter, purge_expired_tokens
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class CachedAuthenticationTests(TestCase):
+    """
+    Authenticated requests resolve their user from the cache.
+    """
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(
+            username='user', password='password', email='user@softdesk.io', date_of_birth=date(1990, 1, 1))
+        self.client = APIClient()
+        response = self.client.post(reverse('users:login'), {'username': 'user', 'password': 'password'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['data']['tokens']['access']}")
+        self.url = reverse('users:user-profile')
+
+    def test_profile_costs_no_query_once_cached(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['username'], 'user')
+
+    def test_profile_server_timing(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertTrue(response['Server-Timing'].startswith('db;dur=0.00;desc="0 queries", serialization;dur='))
+
+    def test_profile_fields(self):
+        response = self.client.get(self.url, {'fields': 'id,username'})
+        self.assertEqual(response.data, {'id': self.user.pk, 'username': 'user'})
+
+    def test_update_invalidates(self):
+        self.client.get(self.url)
+        self.client.patch(reverse('users:update-user-profile'), {'email': 'new@softdesk.io'})
+        self.assertEqual(self.client.get(self.url).data['email'], 'new@softdesk.io')
+
+    def test_password_is_not_cached(self):
+        self.client.get(self.url)
+        fields = get_user_cache().get(make_user_key(self.user.pk))
+        self.assertEqual(fields['username'], 'user')
+        self.assertNotIn('password', fields)
+
+        # The users built from the cache keep their password when saved.
+        self.client.patch(reverse('users:update-user-profile'), {'email': 'new@softdesk.io'})
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'new@softdesk.io')
+        self.assertTrue(self.user.check_password('password'))
+
+    def test_inactive_user_is_refused(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deleted_user_is_refused(self):
+        self.client.get(self.url)
+        self.client.delete(reverse('users:delete-user-profile'))
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TokenMaintenanceTests(TestCase):
+    """
+    Expired tokens are purged in batches and blacklist checks go through the filter.
+    """
+
+    def setUp(self):
+        get_blacklist_filter().reset()
+        self.user = User.objects.create_user(
+            username='user', password='password', email='user@softdesk.io', date_of_birth=date(1990, 1, 1))
+
+    def test_blacklist_check_skips_database_for_unknown_tokens(self):
+        FilteredRefreshToken.for_user(self.user).blacklist()
+        token = str(FilteredRefreshToken.for_user(self.user))
+        FilteredRefreshToken(token)  # loads the filter
+
+        with self.assertNumQueries(0):
+            FilteredRefreshToken(token)
+
+    def test_late_commit_is_seen_at_the_next_rebuild(self):
+        tokens = [OutstandingToken.objects.create(
+            user=self.user, jti=f'jti{index}', token='', expires_at=timezone.now() + timedelta(days=1))
+            for index in range(3)]
+        blacklist = BlacklistFilter(refresh_interval=0, rebuild_interval=60)
+        BlacklistedToken.objects.create(id=10, token=tokens[0])
+        self.assertTrue(blacklist.might_contain('jti0'))
+
+        # Inserted before the row 10 was read, committed after.
+        BlacklistedToken.objects.create(id=5, token=tokens[1])
+        BlacklistedToken.objects.create(id=11, token=tokens[2])
+        self.assertTrue(blacklist.might_contain('jti2'))
+        self.assertFalse(blacklist.might_contain('jti1'))
+
+        with mock.patch('users.tokens.blacklist.time.monotonic', return_value=time.monotonic() + 60):
+            self.assertTrue(blacklist.might_contain('jti1'))
+
+    def test_blacklisted_token_is_refused(self):
+        token = str(FilteredRefreshToken.for_user(self.user))
+        FilteredRefreshToken(token).blacklist()
+        with self.assertRaises(TokenError):
+            FilteredRefreshToken(token)
+
+    def test_logout_twice(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        token = str(FilteredRefreshToken.for_user(self.user))
+        self.assertEqual(client.post(reverse('users:logout'), {'token': token}).status_code, 204)
+        self.assertEqual(client.post(reverse('users:logout'), {'token': token}).status_code, 400)
+
+    def test_purge_expired_tokens(self):
+        now = timezone.now()
+        for index in range(25):
+            token = OutstandingToken.objects.create(
+                user=self.user, jti=f'expired{index}', token='', expires_at=now - timedelta(days=1))
+            BlacklistedToken.objects.create(token=token)
+        OutstandingToken.objects.create(user=self.user, jti='valid', token='', expires_at=now + timedelta(days=1))
+
+        self.assertEqual(purge_expired_tokens(batch_size=10), 25)
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['valid'])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_purge_command(self):
+        OutstandingToken.objects.create(
+            user=self.user, jti='expired', token='', expires_at=timezone.now() - timedelta(days=1))
+        output = StringIO()
+        call_command('purge_expired_tokens', '--batch-size', '5', stdout=output)
+        self.assertIn('Deleted 1 expired tokens.', output.getvalue())
+
+    @override_settings(TOKEN_PURGE_INTERVAL=60)
+    def test_purge_job(self):
+        OutstandingToken.objects.create(
+            user=self.user, jti='expired', token='', expires_at=timezone.now() - timedelta(days=1))
+        # However many workers schedule it, a single purge is queued, a minute from now.
+        self.assertEqual(schedule_periodic(), 1)
+        self.assertEqual(schedule_periodic(), 0)
+        job = Job.objects.get(kind='users.purge_tokens')
+        self.assertAlmostEqual((job.run_after - timezone.now()).total_seconds(), 60, delta=2)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        [claimed] = claim(1)
+        with self.assertLogs('jobs', 'INFO'):
+            Worker(concurrency=1).execute(claimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (Job.JobStatus.SUCCEEDED, {'deleted': 1}))
+        self.assertFalse(OutstandingToken.objects.exists())
+
+    @override_settings(TOKEN_PURGE_INTERVAL=None)
+    def test_purge_job_disabled(self):
+        self.assertEqual(schedule_periodic(), 0)
+
+
+class BloomFilterTests(TestCase):
+
+    def test_no_false_negative(self):
+        bloom = BloomFilter(1000, 0.01)
+        values = [f'jti-{index}' for index in range(1000)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+        false_positives = sum(f'other-{index}' in bloom for index in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AsyncLoginTests(TestCase):
+    """
+    Login and registration hash passwords on the hashing executor.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user', password='password', email='user@softdesk.io', date_of_birth=date(1990, 1, 1))
+
+    def test_login(self):
+        response = self.client.post(reverse('users:login'), {'username': 'user', 'password': 'password'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['username'], 'user')
+        self.assertIn('access', response.data['data']['tokens'])
+
+    def test_login_refuses_invalid_credentials(self):
+        for username, password in (('user', 'wrong'), ('unknown', 'password')):
+            response = self.client.post(reverse('users:login'), {'username': username, 'password': password})
+            self.assertEqual(response.status_code, 401)
+
+    def test_login_refuses_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(reverse('users:login'), {'username': 'user', 'password': 'password'})
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.MD5PasswordHasher', 'django.contrib.auth.hashers.UnsaltedMD5PasswordHasher'])
+    def test_login_upgrades_outdated_hash(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password('password', hasher='unsalted_md5'))
+        response = self.client.post(reverse('users:login'), {'username': 'user', 'password': 'password'})
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('md5$'))
+        self.assertTrue(self.user.check_password('password'))
+
+    def test_login_failure_is_signalled(self):
+        failures = []
+
+        def receiver(credentials, **kwargs):
+            failures.append(credentials)
+
+        user_login_failed.connect(receiver)
+        self.addCleanup(user_login_failed.disconnect, receiver)
+        for username, password in (('user', 'wrong'), ('unknown', 'password')):
+            self.client.post(reverse('users:login'), {'username': username, 'password': password})
+        self.assertEqual([credentials['username'] for credentials in failures], ['user', 'unknown'])
+        self.assertNotIn('password', {credentials['password'] for credentials in failures})
+
+    @override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.AllowAllUsersModelBackend'])
+    def test_login_with_other_backends(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(reverse('users:login'), {'username': 'user', 'password': 'password'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_login_requires_credentials(self):
+        response = self.client.post(reverse('users:login'), {'username': 'user'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_register_hashes_password(self):
+        response = self.client.post(reverse('users:register'), {
+            'username': 'new', 'password': 'secret', 'email': 'New@SOFTDESK.IO', 'date_of_birth': '1990-01-01'})
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username='new')
+        self.assertTrue(user.check_password('secret'))
+        self.assertEqual(user.email, 'New@softdesk.io')
+
+    def test_busy_executor_answers_503(self):
+        executor = get_hashing_executor()
+        pending = executor.pending
+        executor.pending = executor.max_pending
+        try:
+            response = self.client.post(reverse('users:login'), {'username': 'user', 'password': 'password'})
+        finally:
+            executor.pending = pending
+        self.assertEqual(response.status_code, 503)
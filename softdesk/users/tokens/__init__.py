@@ -0,0 +1,2 @@
+from .blacklist import BloomFilter, BlacklistFilter, FilteredRefreshToken, get_blacklist_filter
+from .purge import purge_expired_tokens
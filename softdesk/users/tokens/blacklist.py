@@ -0,0 +1,154 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter over strings.
+
+    `value in filter` is False for every value that was never added, and True
+    for added values plus a fraction `error_rate` of the others.
+
+    Attributes:
+    - capacity (int): The number of values the filter is sized for.
+    - count (int): The number of values added so far.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(1, capacity)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return ((first + index * second) % self.size for index in range(self.hashes))
+
+    def add(self, value):
+        for position in self.positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(value))
+
+
+class BlacklistFilter:
+    """
+    In-memory membership filter of the blacklisted token JTIs.
+
+    The filter is loaded from BlacklistedToken once, then refreshed
+    incrementally by reading only the rows whose id is above the last one
+    read, at most every `refresh_interval` seconds. Tokens blacklisted by this
+    process are added immediately; tokens blacklisted by another process are
+    usually seen after at most `refresh_interval` seconds (0 refreshes on
+    every check).
+
+    Ids are allocated when rows are inserted, not when they are committed: a
+    row committed after one with a higher id was read is skipped by the
+    incremental refreshes. The filter is therefore rebuilt from the whole
+    table every `rebuild_interval` seconds, which bounds the delay of such
+    rows. When more tokens than `capacity` are blacklisted, the filter is
+    rebuilt twice as large.
+
+    Methods:
+    - might_contain(jti): False when the token is certainly not blacklisted.
+    - add(jti): Record a token blacklisted by this process.
+    - reset(): Drop the filter, to be reloaded on the next check.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001, refresh_interval=5, rebuild_interval=60):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.bloom = None
+        self.last_id = 0
+        self.refreshed_at = None
+        self.rebuilt_at = None
+
+    def load(self, bloom, last_id):
+        """
+        Add the JTIs blacklisted after `last_id` to the filter and return the last id read.
+        """
+        rows = BlacklistedToken.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'token__jti')
+        for last_id, jti in rows.iterator():
+            bloom.add(jti)
+        return last_id
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.refreshed_at is not None and now - self.refreshed_at < self.refresh_interval:
+            return
+        with self.lock:
+            rebuilt_at = self.rebuilt_at
+            if self.bloom is None or now - rebuilt_at >= self.rebuild_interval:
+                # The current filter serves the other threads until the new one replaces it.
+                bloom, rebuilt_at = BloomFilter(self.capacity, self.error_rate), now
+                last_id = self.load(bloom, 0)
+            else:
+                bloom = self.bloom
+                last_id = self.load(bloom, self.last_id)
+            if bloom.count > bloom.capacity:
+                self.capacity = bloom.count * 2
+                bloom = BloomFilter(self.capacity, self.error_rate)
+                last_id = self.load(bloom, 0)
+            self.bloom, self.last_id, self.refreshed_at, self.rebuilt_at = bloom, last_id, now, rebuilt_at
+
+    def add(self, jti):
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def might_contain(self, jti):
+        self.refresh()
+        bloom = self.bloom
+        return bloom is None or jti in bloom
+
+
+_blacklist_filter = None
+
+
+def get_blacklist_filter():
+    """
+    Return the process-wide blacklist filter configured by settings.TOKEN_BLACKLIST_FILTER.
+    """
+    global _blacklist_filter
+    if _blacklist_filter is None:
+        options = getattr(settings, 'TOKEN_BLACKLIST_FILTER', {})
+        _blacklist_filter = BlacklistFilter(
+            capacity=options.get('CAPACITY', 100000),
+            error_rate=options.get('ERROR_RATE', 0.001),
+            refresh_interval=options.get('REFRESH_INTERVAL', 5),
+            rebuild_interval=options.get('REBUILD_INTERVAL', 60),
+        )
+    return _blacklist_filter
+
+
+class FilteredRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check only queries the database when the
+    blacklist filter reports a possible match.
+    """
+
+    def check_blacklist(self):
+        if get_blacklist_filter().might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        get_blacklist_filter().add(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -0,0 +1,44 @@
+import time
+
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from .blacklist import get_blacklist_filter
+
+
+def purge_expired_tokens(batch_size=1000, pause=0.0, now=None):
+    """
+    Delete expired outstanding tokens, and their blacklist entries, in batches.
+
+    Each batch is deleted in its own short transaction so that the write lock
+    is released between batches. Expired tokens are the oldest ones, so they
+    are found at the start of the primary key.
+
+    Args:
+    - batch_size (int): The number of tokens deleted per transaction.
+    - pause (float): Seconds to sleep between batches.
+    - now (datetime): The expiry reference, defaults to the current time.
+
+    Returns:
+    - int: The number of deleted outstanding tokens.
+    """
+    now = now or aware_utcnow()
+    deleted = 0
+    while True:
+        ids = list(OutstandingToken.objects.filter(
+            expires_at__lte=now).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    if deleted:
+        # Purged JTIs may stay set in the filter: reload it at its next check.
+        get_blacklist_filter().reset()
+    return deleted
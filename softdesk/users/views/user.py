@@ -1,37 +1,39 @@
+from asgiref.sync import sync_to_async
 from rest_framework import permissions, status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import generics
-from rest_framework.generics import get_object_or_404
 
-from users.serializers import LoginSerializer, LogoutSerializer, UserSerializer
-from users.models import User
+from jobs.queue import enqueue
+from sofdesk.views import AsyncAPIView, TimedPermissionsMixin
+from users.hashing import get_hashing_executor
+from users.serializers import CredentialsSerializer, LoginSerializer, LogoutSerializer, UserSerializer
 
 
-class UserViewSet(APIView):
+class UserViewSet(TimedPermissionsMixin, APIView):
     """
     A view set for managing user profiles.
 
     - GET: Retrieve the authenticated user's profile.
     - PATCH: Update the authenticated user's profile.
-    - DELETE: Delete the authenticated user's profile.
+    - DELETE: Deactivate the authenticated user and queue the deletion of their profile.
     """
     serializer_class = UserSerializer
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_connected_user(self):
         """
-        Get the currently authenticated user.
+        Get the currently authenticated user, as already resolved by the authentication.
         """
-        user = self.request.user
-        return get_object_or_404(User, pk=user.pk)
+        return self.request.user
 
     def get(self, request, *args, **kwargs):
         """
         Retrieve the profile of the authenticated user.
         """
         user = self.get_connected_user()
-        serializer = self.serializer_class(user)
+        serializer = self.serializer_class(user, context={'request': request})
         return Response(serializer.data)
 
     def patch(self, request, *args, **kwargs):
@@ -50,54 +52,69 @@ class UserViewSet(APIView):
     def delete(self, request, *args, **kwargs):
         """
         Delete the profile of the authenticated user.
+
+        The user is deactivated, which refuses their tokens at once, and deleted
+        with their contributions, issues and comments by a worker, see
+        users.tasks.delete_user. The response is 202 Accepted, without the status
+        URL of the job: the deactivated user could not authenticate to read it.
         """
         user = self.get_connected_user()
-        user.delete()
-        return Response({"message": "User deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        enqueue('users.delete_user', {'user_id': user.pk}, user=user, key=f'users.delete_user:{user.pk}')
+        return Response({'message': 'User deletion queued.'}, status=status.HTTP_202_ACCEPTED)
 
 
-class RegisterAPIView(APIView):
+class RegisterAPIView(AsyncAPIView):
     """
     A view for user registration.
 
+    The password is hashed by the password hashing executor, off the event loop.
+
     - POST: Register a new user.
     """
     serializer_class = UserSerializer
     permission_classes = (permissions.AllowAny,)
 
-    def post(self, request):
+    async def post(self, request):
         """
         Register a new user.
         """
         serializer = self.serializer_class(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
+        if await sync_to_async(serializer.is_valid)():
+            password_hash = await get_hashing_executor().make_password(serializer.validated_data['password'])
+            await sync_to_async(serializer.save)(password_hash=password_hash)
             data = serializer.data
             return Response({'message': 'User registration successful', 'data': data}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LoginAPIView(APIView):
+class LoginAPIView(AsyncAPIView):
     """
     A view for user login.
 
+    The password is checked by the password hashing executor, off the event loop.
+
     - POST: Authenticate and log in a user.
     """
     serializer_class = LoginSerializer
     permission_classes = (permissions.AllowAny,)
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         """
         Authenticate and log in a user.
         """
-        serializer = self.serializer_class(data=request.data)
+        serializer = CredentialsSerializer(data=request.data)
         if serializer.is_valid():
-            data = serializer.validated_data
+            user = await get_hashing_executor().authenticate(request, **serializer.validated_data)
+            if user is None:
+                raise AuthenticationFailed('Invalid credentials.')
+            data = await sync_to_async(self.serializer_class().get_login_data)(user)
             return Response({'message': 'Login successfully', 'data': data}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class LogoutAPIView(generics.GenericAPIView):
+class LogoutAPIView(TimedPermissionsMixin, generics.GenericAPIView):
     """
     A view for user logout.
 